@@ -1,41 +1,131 @@
 # app/__init__.py
+import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from flask_migrate import Migrate
+from app.database import RoutingSession, init_database
 
-# Inicializar extensões
-db = SQLAlchemy()
+# Inicializar extensões (sessão roteia leituras de views @read_only)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
+migrate = Migrate()
 
-def create_app():
-    """Factory function para criar a aplicação Flask"""
+def create_app(config_class=None):
+    """Factory function para criar a aplicação Flask
+    
+    Args:
+        config_class: Classe/objeto de configuração (padrão: app.config.Config)
+    """
     app = Flask(__name__)
-
-    # Configurações básicas
-    app.config['SECRET_KEY'] = 'dev-secret-key-change-in-production'
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///coinctrl.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-    # Inicializar extensões
-    db.init_app(app)
+    
+    # Configurações (importadas aqui para respeitar o .env carregado antes)
+    if config_class is None:
+        from app.config import Config as config_class
+    app.config.from_object(config_class)
+    
+    # IP real do cliente atrás do proxy (rate limit de login por IP, URLs https)
+    proxies = app.config.get('PROXY_FIX_X_FOR', 0)
+    if proxies:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
+    
+    # Cache de bytecode dos templates em disco: workers novos não recompilam
+    if app.config.get('JINJA_BYTECODE_CACHE_DIR') is None:
+        app.config['JINJA_BYTECODE_CACHE_DIR'] = os.path.join(app.instance_path, 'jinja_cache')
+    if app.config['JINJA_BYTECODE_CACHE_DIR']:
+        from jinja2 import FileSystemBytecodeCache
+        os.makedirs(app.config['JINJA_BYTECODE_CACHE_DIR'], exist_ok=True)
+        app.jinja_options = {
+            **app.jinja_options,
+            'bytecode_cache': FileSystemBytecodeCache(app.config['JINJA_BYTECODE_CACHE_DIR'])
+        }
+    
+    # Inicializar extensões (engines com pool/PRAGMAs e engine de leitura)
+    init_database(app, db)
+    migrate.init_app(app, db)
     login_manager.init_app(app)
-
+    
     # Configurar Flask-Login
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Faça login para acessar esta página.'
-
+    
+    # Cache de usuários do Flask-Login
+    from app.auth.cache import user_cache, load_cached_user
+    app.config.setdefault('USER_CACHE_SIZE', 1024)
+    app.config.setdefault('USER_CACHE_TTL', 60)  # segundos
+    user_cache.init_app(app)
+    
+    # Pool limitado para hashing de senhas
+    from app.auth.hashing import password_hasher
+    app.config.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+    app.config.setdefault('PASSWORD_HASH_WORKERS', 2)
+    app.config.setdefault('PASSWORD_HASH_MAX_INFLIGHT', None)  # metade das CPUs; 0 = hashing inline
+    app.config.setdefault('PASSWORD_HASH_QUEUE_TIMEOUT', 0.05)  # segundos
+    app.config.setdefault('PASSWORD_HASH_SLOTS_DIR', None)  # instance/hash_slots (entre workers)
+    password_hasher.init_app(app)
+    
+    # Rate limit de login (em memória ou 'sqlite:///caminho' compartilhado)
+    from app.auth.ratelimit import login_rate_limiter
+    app.config.setdefault('LOGIN_RATE_LIMIT_EMAIL', 5)
+    app.config.setdefault('LOGIN_RATE_LIMIT_IP', 20)
+    app.config.setdefault('LOGIN_RATE_LIMIT_WINDOW', 900)  # segundos
+    app.config.setdefault('LOGIN_LOCKOUT_SECONDS', 1800)
+    app.config.setdefault('LOGIN_RATE_LIMIT_STORAGE', 'memory')
+    login_rate_limiter.init_app(app)
+    
+    # OAuth Google: credenciais e certificados em cache
+    from app.auth.google import google_credentials, google_certs, GOOGLE_CERTS_URL
+    app.config.setdefault('GOOGLE_CREDENTIALS_FILE', 'google_credentials.json')
+    app.config.setdefault('GOOGLE_CERTS_URL', GOOGLE_CERTS_URL)
+    google_credentials.init_app(app)
+    google_certs.init_app(app)
+    if app.debug or app.config.get('OAUTHLIB_INSECURE_TRANSPORT'):
+        # Callback do OAuth em http:// (apenas desenvolvimento local)
+        os.environ.setdefault('OAUTHLIB_INSECURE_TRANSPORT', '1')
+    
+    # Instrumentação: Server-Timing e histogramas por endpoint em /metrics
+    from app.metrics import request_metrics
+    request_metrics.init_app(app)
+    
+    # Log de consultas lentas com EXPLAIN (0 desativa)
+    from app.slow_queries import slow_query_log
+    app.config.setdefault('SLOW_QUERY_MS', 100)
+    app.config.setdefault('SLOW_QUERY_LOG', None)  # padrão: instance/slow_queries.log
+    app.config.setdefault('SLOW_QUERY_LOG_MAX_BYTES', 5 * 1024 * 1024)
+    app.config.setdefault('SLOW_QUERY_LOG_BACKUPS', 3)
+    app.config.setdefault('SLOW_QUERY_EXPLAIN', True)
+    slow_query_log.init_app(app)
+    
+    # Cache de fragmentos de template ('memory', 'sqlite:///caminho' ou '' para desativar)
+    from app.fragments import fragment_cache
+    app.config.setdefault('FRAGMENT_CACHE', 'memory')
+    app.config.setdefault('FRAGMENT_CACHE_MAX_BYTES', 8 * 1024 * 1024)
+    app.config.setdefault('FRAGMENT_CACHE_TTL', 3600)  # segundos
+    fragment_cache.init_app(app)
+    
+    # Orçamentos: fração do orçamento a partir da qual a despesa gera aviso
+    app.config.setdefault('BUDGET_WARNING_THRESHOLD', 0.8)
+    
+    # ETags por versão dos dados: muda a cada release (igual em todos os hosts)
+    from app.financial.conditional import etag_salt
+    app.config.setdefault('ETAG_SALT', etag_salt(app))
+    
     @login_manager.user_loader
     def load_user(user_id):
-        from app.models import User
-        return User.query.get(int(user_id))
-
+        return load_cached_user(int(user_id))
+    
     # Registrar blueprints
     from app.main import main_bp
     from app.auth import auth_bp
     from app.financial import financial_bp
-
+    
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(financial_bp, url_prefix='/financial')
-
-    return app
\ No newline at end of file
+    
+    # Recursos por processo descartados após fork (gunicorn --preload)
+    from app.workers import register_app
+    register_app(app)
+    
+    return app
@@ -0,0 +1,136 @@
+# app/auth/cache.py
+"""Cache em processo dos usuários carregados pelo Flask-Login.
+
+Guarda um snapshot das colunas de cada usuário (não o objeto ORM) com
+limite de tamanho (LRU) e tempo de vida (TTL). Na leitura, o snapshot é
+anexado à sessão com ``merge(load=False)``, sem nenhuma consulta ao banco.
+Qualquer UPDATE/DELETE em ``users`` feito pelo ORM invalida a entrada,
+tanto no flush quanto após o commit.
+"""
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+
+class UserCache:
+    """Cache LRU com TTL de snapshots de usuários, com contadores de acerto"""
+    
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._listening = False
+    
+    def init_app(self, app):
+        """Configurar a partir de USER_CACHE_SIZE / USER_CACHE_TTL e registrar eventos"""
+        self.maxsize = app.config.get('USER_CACHE_SIZE', self.maxsize)
+        self.ttl = app.config.get('USER_CACHE_TTL', self.ttl)
+        self.enabled = self.maxsize > 0 and self.ttl > 0
+        app.extensions['user_cache'] = self
+        self._listen()
+    
+    def _listen(self):
+        if self._listening:
+            return
+        from app import db
+        from app.models import User
+        
+        def changed(mapper, connection, target):
+            self.invalidate(target.id)
+            db.session.info.setdefault('changed_user_ids', set()).add(target.id)
+        
+        def committed(session):
+            for user_id in session.info.pop('changed_user_ids', ()):
+                self.invalidate(user_id)
+        
+        event.listen(User, 'after_update', changed)
+        event.listen(User, 'after_delete', changed)
+        event.listen(db.session, 'after_commit', committed)
+        self._listening = True
+    
+    def get(self, user_id):
+        """Snapshot do usuário, ou None se ausente/expirado"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, user_id, snapshot):
+        """Guardar snapshot, descartando o menos usado se passar do limite"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id):
+        """Remover o usuário do cache"""
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+    
+    def clear(self):
+        """Esvaziar o cache e zerar os contadores"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+    
+    def after_fork(self):
+        """Lock novo no worker (o do processo pai pode ter sido copiado travado)"""
+        self._lock = threading.Lock()
+    
+    def stats(self):
+        """Contadores de acerto/erro e tamanho atual"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0
+            }
+
+
+user_cache = UserCache()
+
+
+def snapshot_user(user):
+    """Copiar as colunas do usuário para um dicionário"""
+    return {column.key: getattr(user, column.key) for column in user.__table__.columns}
+
+
+def load_cached_user(user_id):
+    """Carregar usuário pelo cache (sem consulta) ou pelo banco, em caso de falta"""
+    from app import db
+    from app.models import User
+    
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+    
+    user = db.session.get(User, user_id)
+    if user is not None:
+        user_cache.set(user_id, snapshot_user(user))
+    return user
@@ -0,0 +1,186 @@
+# app/auth/google.py
+"""Credenciais OAuth e verificação de ID tokens do Google com cache.
+
+``google_credentials`` lê o ``google_credentials.json`` uma única vez por
+processo. ``google_certs`` guarda os certificados públicos usados para
+assinar os ID tokens pelo tempo indicado em ``Cache-Control: max-age``,
+baixando-os por uma ``requests.Session`` reaproveitada (pool de conexões).
+Assim o callback do OAuth não baixa certificados a cada login.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+GOOGLE_CERTS_URL = 'https://www.googleapis.com/oauth2/v1/certs'
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+DEFAULT_CERTS_MAX_AGE = 3600  # segundos, quando a resposta não traz max-age
+MIN_REFRESH_INTERVAL = 60  # segundos entre downloads forçados (rotação de chave)
+
+
+class GoogleCredentials:
+    """Configuração do cliente OAuth (google_credentials.json), carregada uma vez"""
+    
+    def __init__(self, filename='google_credentials.json'):
+        self.filename = filename
+        self._config = None
+        self._lock = threading.Lock()
+    
+    def init_app(self, app):
+        """Configurar a partir de GOOGLE_CREDENTIALS_FILE"""
+        self.filename = app.config.get('GOOGLE_CREDENTIALS_FILE', self.filename)
+        self.reset()
+        app.extensions['google_credentials'] = self
+    
+    def _candidate_paths(self):
+        if os.path.isabs(self.filename):
+            return [self.filename]
+        return [self.filename, os.path.join(os.getcwd(), self.filename)]
+    
+    def get(self):
+        """Configuração do cliente, ou None se o arquivo não existir"""
+        if self._config is not None:
+            return self._config
+        
+        with self._lock:
+            if self._config is None:
+                for path in self._candidate_paths():
+                    if os.path.exists(path):
+                        with open(path, 'r') as f:
+                            self._config = json.load(f)
+                        print(f"✅ Credenciais Google encontradas em: {path}")
+                        break
+            return self._config
+    
+    @property
+    def client_id(self):
+        config = self.get()
+        return config['web']['client_id'] if config else None
+    
+    @property
+    def client_secret(self):
+        config = self.get()
+        return config['web']['client_secret'] if config else None
+    
+    def reset(self):
+        """Descartar a configuração carregada"""
+        with self._lock:
+            self._config = None
+
+
+def parse_max_age(cache_control):
+    """Extrair max-age (segundos) do cabeçalho Cache-Control, ou None"""
+    match = re.search(r'max-age=(\d+)', cache_control or '')
+    return int(match.group(1)) if match else None
+
+
+class CertCache:
+    """Certificados de assinatura do Google com validade pelo Cache-Control"""
+    
+    def __init__(self, url=GOOGLE_CERTS_URL, timeout=5):
+        self.url = url
+        self.timeout = timeout
+        self.fetches = 0
+        self._certs = None
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._session = None
+        self._lock = threading.Lock()
+    
+    def init_app(self, app):
+        """Configurar a partir de GOOGLE_CERTS_URL / GOOGLE_CERTS_TIMEOUT"""
+        self.url = app.config.get('GOOGLE_CERTS_URL', self.url)
+        self.timeout = app.config.get('GOOGLE_CERTS_TIMEOUT', self.timeout)
+        self.reset()
+        app.extensions['google_certs'] = self
+    
+    @property
+    def session(self):
+        # Sessão criada sob demanda: conexões reaproveitadas entre downloads
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+    
+    def _fetch(self):
+        response = self.session.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        max_age = parse_max_age(response.headers.get('Cache-Control'))
+        now = time.monotonic()
+        self._certs = response.json()
+        self._expires_at = now + (DEFAULT_CERTS_MAX_AGE if max_age is None else max_age)
+        self._last_fetch = now
+        self.fetches += 1
+    
+    def get(self, force=False):
+        """Certificados {kid: PEM}, baixados só quando expirados
+        
+        Args:
+            force: Baixar de novo (ex.: kid desconhecido), limitado a um
+                download por MIN_REFRESH_INTERVAL
+        
+        Raises:
+            requests.RequestException: Se o download falhar e não houver cópia anterior
+        """
+        now = time.monotonic()
+        if self._certs is not None and now < self._expires_at and not force:
+            return self._certs
+        
+        with self._lock:
+            now = time.monotonic()
+            stale = self._certs is None or now >= self._expires_at
+            can_force = force and now - self._last_fetch >= MIN_REFRESH_INTERVAL
+            if stale or can_force:
+                try:
+                    self._fetch()
+                except Exception:
+                    # Certificados expirados ainda servem se o Google estiver fora
+                    if self._certs is None:
+                        raise
+            return self._certs
+    
+    def after_fork(self):
+        """Não reaproveitar no worker as conexões e o lock do processo pai"""
+        self._session = None
+        self._lock = threading.Lock()
+    
+    def reset(self):
+        """Descartar certificados em cache"""
+        with self._lock:
+            self._certs = None
+            self._expires_at = 0.0
+            self._last_fetch = 0.0
+
+
+google_credentials = GoogleCredentials()
+google_certs = CertCache()
+
+
+def verify_id_token(token, audience, clock_skew_in_seconds=0):
+    """Verificar ID token do Google com os certificados em cache
+    
+    Equivalente a ``id_token.verify_oauth2_token``, sem baixar os
+    certificados a cada chamada.
+    
+    Returns:
+        dict: Claims do token
+    
+    Raises:
+        ValueError: Se assinatura, audiência, validade ou emissor forem inválidos
+    """
+    from google.auth import jwt
+    
+    try:
+        claims = jwt.decode(token, certs=google_certs.get(), audience=audience,
+                            clock_skew_in_seconds=clock_skew_in_seconds)
+    except ValueError as error:
+        # Chave nova (rotação): baixar certificados de novo e tentar uma vez
+        if 'Certificate for key id' not in str(error):
+            raise
+        claims = jwt.decode(token, certs=google_certs.get(force=True), audience=audience,
+                            clock_skew_in_seconds=clock_skew_in_seconds)
+    
+    if claims.get('iss') not in GOOGLE_ISSUERS:
+        raise ValueError(f"Emissor inválido: {claims.get('iss')}")
+    return claims
@@ -0,0 +1,213 @@
+# app/auth/hashing.py
+"""Serviço de hashing de senhas com pool limitado e controle de admissão.
+
+O PBKDF2 é executado em um pool de threads (o hashlib libera o GIL durante
+o cálculo). No máximo ``PASSWORD_HASH_MAX_INFLIGHT`` hashes podem estar em
+andamento ao mesmo tempo; acima disso a requisição recebe ``HashingBusy``
+em vez de ocupar mais CPU, e a rota responde 503 na hora. Com
+``PASSWORD_HASH_MAX_INFLIGHT = 0`` o hashing volta a ser feito inline.
+
+O limite vale para a máquina inteira: cada vaga é um arquivo em
+``PASSWORD_HASH_SLOTS_DIR`` travado com ``flock``, compartilhado por todos
+os workers do gunicorn. Com workers sync cada processo tem no máximo um
+hash em andamento, então um limite por processo nunca seria atingido.
+Sem ``fcntl`` (Windows) ou com ``PASSWORD_HASH_SLOTS_DIR = ''`` o limite é
+por processo.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class HashingBusy(Exception):
+    """Limite de hashes simultâneos atingido"""
+
+
+def normalize_method(method):
+    """Explicitar as iterações do método (ex.: 'pbkdf2:sha256' -> 'pbkdf2:sha256:600000')"""
+    parts = method.split(':')
+    if parts[0] == 'pbkdf2' and len(parts) == 2:
+        parts.append(str(DEFAULT_PBKDF2_ITERATIONS))
+    return ':'.join(parts)
+
+
+def default_max_inflight():
+    """Metade das CPUs (ao menos uma): o restante fica para as demais rotas"""
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+class ThreadSlots:
+    """Vagas por processo (semáforo)"""
+    
+    def __init__(self, count):
+        self._semaphore = threading.BoundedSemaphore(count)
+    
+    def acquire(self, timeout):
+        """Ocupar uma vaga; retorna um token ou None se esgotou o tempo"""
+        return True if self._semaphore.acquire(timeout=timeout) else None
+    
+    def release(self, token):
+        self._semaphore.release()
+
+
+class FileSlots:
+    """Vagas compartilhadas entre os processos da máquina (um arquivo travado por vaga)
+    
+    O ``flock`` é liberado pelo sistema se o processo morrer, então uma vaga
+    nunca fica presa por um worker encerrado no meio de um hash.
+    """
+    
+    POLL_INTERVAL = 0.005  # segundos entre tentativas enquanto espera uma vaga
+    
+    def __init__(self, directory, count):
+        os.makedirs(directory, exist_ok=True)
+        self.paths = [os.path.join(directory, f'slot-{index}.lock') for index in range(count)]
+    
+    def _try_lock(self, path):
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+    
+    def acquire(self, timeout):
+        """Ocupar uma vaga livre; retorna o descritor travado ou None se esgotou o tempo"""
+        deadline = time.monotonic() + timeout
+        while True:
+            for path in self.paths:
+                fd = self._try_lock(path)
+                if fd is not None:
+                    return fd
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.POLL_INTERVAL)
+    
+    def release(self, fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+class PasswordHasher:
+    """Hash/verificação de senhas com pool de threads e limite de concorrência"""
+    
+    def __init__(self, method='pbkdf2:sha256', salt_length=16, workers=2,
+                 max_inflight=None, queue_timeout=0.05, slots_dir=''):
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self.slots_dir = slots_dir
+        self.configure(method, salt_length, workers,
+                       default_max_inflight() if max_inflight is None else max_inflight, queue_timeout)
+    
+    def init_app(self, app):
+        """Configurar a partir de PASSWORD_HASH_* e registrar em app.extensions"""
+        slots_dir = app.config.get('PASSWORD_HASH_SLOTS_DIR')
+        if slots_dir is None:
+            slots_dir = os.path.join(app.instance_path, 'hash_slots')
+        max_inflight = app.config.get('PASSWORD_HASH_MAX_INFLIGHT')
+        self.configure(
+            method=app.config.get('PASSWORD_HASH_METHOD', self.method),
+            salt_length=app.config.get('PASSWORD_HASH_SALT_LENGTH', self.salt_length),
+            workers=app.config.get('PASSWORD_HASH_WORKERS', self.workers),
+            max_inflight=default_max_inflight() if max_inflight is None else max_inflight,
+            queue_timeout=app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', self.queue_timeout),
+            slots_dir=slots_dir
+        )
+        app.extensions['password_hasher'] = self
+    
+    def configure(self, method=None, salt_length=None, workers=None,
+                  max_inflight=None, queue_timeout=None, slots_dir=None):
+        """Alterar parâmetros; o pool é recriado sob demanda"""
+        if method is not None:
+            self.method = normalize_method(method)
+        if salt_length is not None:
+            self.salt_length = salt_length
+        if workers is not None:
+            self.workers = max(1, workers)
+        if max_inflight is not None:
+            self.max_inflight = max(0, max_inflight)
+        if slots_dir is not None:
+            self.slots_dir = slots_dir
+        if max_inflight is not None or slots_dir is not None:
+            self._slots = self._create_slots()
+        if queue_timeout is not None:
+            self.queue_timeout = queue_timeout
+        self.rejected = 0
+        self.shutdown()
+    
+    def shutdown(self):
+        """Encerrar o pool atual (ex.: após fork ou reconfiguração)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+    
+    def after_fork(self):
+        """Descartar pool e locks herdados do processo pai (gunicorn --preload)"""
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = self._create_slots()
+    
+    def _create_slots(self):
+        # Vagas entre processos (arquivos em slots_dir) ou, sem diretório/fcntl, por processo
+        if self.max_inflight and self.slots_dir and fcntl is not None:
+            return FileSlots(self.slots_dir, self.max_inflight)
+        return ThreadSlots(self.max_inflight or 1)
+    
+    def _get_executor(self):
+        # Criado sob demanda para não atravessar o fork dos workers do gunicorn
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix='password-hash'
+                )
+            return self._executor
+    
+    def _run(self, func, *args):
+        if not self.max_inflight:
+            return func(*args)
+        
+        token = self._slots.acquire(self.queue_timeout)
+        if token is None:
+            self.rejected += 1
+            raise HashingBusy()
+        try:
+            return self._get_executor().submit(func, *args).result()
+        finally:
+            self._slots.release(token)
+    
+    def hash(self, password):
+        """Gerar hash da senha com o método configurado
+        
+        Raises:
+            HashingBusy: Se o limite de hashes simultâneos foi atingido
+        """
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+    
+    def verify(self, password_hash, password):
+        """Verificar senha contra o hash
+        
+        Raises:
+            HashingBusy: Se o limite de hashes simultâneos foi atingido
+        """
+        return self._run(check_password_hash, password_hash, password)
+    
+    def needs_rehash(self, password_hash):
+        """Verificar se o hash foi gerado com parâmetros diferentes dos atuais"""
+        if not password_hash or '$' not in password_hash:
+            return False
+        method, salt, _ = password_hash.split('$', 2)
+        return normalize_method(method) != self.method or len(salt) != self.salt_length
+
+
+password_hasher = PasswordHasher()
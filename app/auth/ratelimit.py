@@ -0,0 +1,220 @@
+# app/auth/ratelimit.py
+"""Limitador de tentativas de login em janela deslizante.
+
+As falhas são contadas por email e por IP dentro de uma janela de tempo,
+em memória do processo (padrão) ou em um backend compartilhado em SQLite
+para deployments com vários workers. Enquanto a chave está acima do
+limite, o login é recusado antes de qualquer consulta, hashing ou escrita
+no banco. Só quando o limite do email é cruzado o ``locked_until`` do
+usuário é persistido (uma escrita por bloqueio, não por tentativa).
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class MemoryBackend:
+    """Janelas deslizantes em memória do processo, com número limitado de chaves"""
+    
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _prune(self, key, now, window):
+        hits = self._windows.get(key)
+        if hits is None:
+            return None
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if not hits:
+            del self._windows[key]
+            return None
+        return hits
+    
+    def hit(self, key, now, window, limit):
+        """Registrar uma falha; retorna (falhas na janela, mais antiga)"""
+        with self._lock:
+            hits = self._prune(key, now, window)
+            if hits is None:
+                # Guarda no máximo ``limit`` marcas: basta saber se o limite foi atingido
+                hits = self._windows[key] = deque(maxlen=limit)
+            hits.append(now)
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+            return len(hits), hits[0]
+    
+    def peek(self, key, now, window):
+        """Falhas na janela e a mais antiga, sem registrar"""
+        with self._lock:
+            hits = self._prune(key, now, window)
+            if hits is None:
+                return 0, None
+            return len(hits), hits[0]
+    
+    def reset(self, key):
+        """Apagar a janela da chave"""
+        with self._lock:
+            self._windows.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+    
+    def after_fork(self):
+        self._lock = threading.Lock()
+
+
+class SQLiteBackend:
+    """Janelas deslizantes em um arquivo SQLite compartilhado entre workers"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS login_failures ('
+                'key TEXT NOT NULL, ts REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS ix_login_failures_key_ts '
+                'ON login_failures (key, ts)'
+            )
+    
+    def _connect(self):
+        # Uma conexão por thread (e por processo, já que é criada sob demanda)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    def hit(self, key, now, window, limit):
+        """Registrar uma falha; retorna (falhas na janela, mais antiga)"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM login_failures WHERE key = ? AND ts <= ?', (key, now - window))
+            conn.execute('INSERT INTO login_failures (key, ts) VALUES (?, ?)', (key, now))
+            count, oldest = conn.execute(
+                'SELECT count(*), min(ts) FROM login_failures WHERE key = ?', (key,)
+            ).fetchone()
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return count, oldest
+    
+    def peek(self, key, now, window):
+        """Falhas na janela e a mais antiga, sem registrar"""
+        count, oldest = self._connect().execute(
+            'SELECT count(*), min(ts) FROM login_failures WHERE key = ? AND ts > ?',
+            (key, now - window)
+        ).fetchone()
+        return count, oldest
+    
+    def reset(self, key):
+        """Apagar a janela da chave"""
+        self._connect().execute('DELETE FROM login_failures WHERE key = ?', (key,))
+    
+    def clear(self):
+        self._connect().execute('DELETE FROM login_failures')
+    
+    def after_fork(self):
+        # A conexão herdada não é fechada aqui: ela ainda pertence ao processo pai
+        self._local = threading.local()
+
+
+def create_backend(url, max_keys=100000):
+    """Criar backend a partir de LOGIN_RATE_LIMIT_STORAGE ('memory' ou 'sqlite:///caminho')"""
+    if not url or url == 'memory':
+        return MemoryBackend(max_keys)
+    if url.startswith('sqlite:///'):
+        return SQLiteBackend(url[len('sqlite:///'):])
+    raise ValueError(f'Backend de rate limit desconhecido: {url}')
+
+
+class LoginRateLimiter:
+    """Limite de falhas de login por email e por IP em janela deslizante"""
+    
+    def __init__(self, email_limit=5, ip_limit=20, window=900, lockout=1800, backend=None):
+        self.email_limit = email_limit
+        self.ip_limit = ip_limit
+        self.window = window
+        self.lockout = lockout
+        self.enabled = True
+        self.rejected = 0
+        self.backend = backend or MemoryBackend()
+    
+    def init_app(self, app):
+        """Configurar a partir de LOGIN_RATE_LIMIT_* e registrar em app.extensions"""
+        self.email_limit = app.config.get('LOGIN_RATE_LIMIT_EMAIL', self.email_limit)
+        self.ip_limit = app.config.get('LOGIN_RATE_LIMIT_IP', self.ip_limit)
+        self.window = app.config.get('LOGIN_RATE_LIMIT_WINDOW', self.window)
+        self.lockout = app.config.get('LOGIN_LOCKOUT_SECONDS', self.lockout)
+        self.enabled = app.config.get('LOGIN_RATE_LIMIT_ENABLED', True)
+        self.backend = create_backend(
+            app.config.get('LOGIN_RATE_LIMIT_STORAGE', 'memory'),
+            app.config.get('LOGIN_RATE_LIMIT_MAX_KEYS', 100000)
+        )
+        app.extensions['login_rate_limiter'] = self
+    
+    @staticmethod
+    def _keys(email, ip):
+        return (f'email:{email}', ip and f'ip:{ip}')
+    
+    def _retry_after(self, oldest, now):
+        return max(1, int(oldest + self.window - now + 0.999))
+    
+    def check(self, email, ip):
+        """Segundos até nova tentativa se email ou IP estão no limite; senão None"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        email_key, ip_key = self._keys(email, ip)
+        
+        retry_after = None
+        for key, limit in ((email_key, self.email_limit), (ip_key, self.ip_limit)):
+            if not key or not limit:
+                continue
+            count, oldest = self.backend.peek(key, now, self.window)
+            if count >= limit:
+                retry_after = max(retry_after or 0, self._retry_after(oldest, now))
+        
+        if retry_after is not None:
+            self.rejected += 1
+        return retry_after
+    
+    def register_failure(self, email, ip):
+        """Registrar falha de login
+        
+        Returns:
+            bool: True se esta falha fez o email cruzar o limite
+        """
+        if not self.enabled:
+            return False
+        now = time.time()
+        email_key, ip_key = self._keys(email, ip)
+        
+        if ip_key and self.ip_limit:
+            self.backend.hit(ip_key, now, self.window, self.ip_limit)
+        if not self.email_limit:
+            return False
+        count, _ = self.backend.hit(email_key, now, self.window, self.email_limit)
+        return count == self.email_limit
+    
+    def reset(self, email):
+        """Limpar falhas do email após login bem-sucedido"""
+        if self.enabled:
+            self.backend.reset(self._keys(email, None)[0])
+
+
+login_rate_limiter = LoginRateLimiter()
@@ -1,25 +1,36 @@
 # app/auth/routes.py - VERSÃO COMPLETA E FUNCIONAL
-from flask import Blueprint, render_template, request, flash, redirect, url_for, session
+from flask import render_template, request, flash, redirect, url_for, session, make_response, current_app
 from flask_login import login_user, logout_user, login_required, current_user
-from datetime import timedelta
+from datetime import datetime, timedelta
 import re
-import os
-import json
 from app.auth import auth_bp
-
-# PERMITIR HTTP PARA DESENVOLVIMENTO LOCAL
-os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
-
 from app import db
 from app.models import User
-
-auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
+from app.auth.hashing import HashingBusy
+from app.auth.ratelimit import login_rate_limiter
+from app.auth.usernames import add_with_unique_username
+from app.auth.google import google_credentials, verify_id_token
 
 def validate_email(email):
     """Validar formato de email"""
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(pattern, email) is not None
 
+def hashing_busy_response(template):
+    """Resposta 503 quando o pool de hashing de senhas está saturado"""
+    flash('Muitas tentativas simultâneas. Tente novamente em instantes.', 'error')
+    response = make_response(render_template(template), 503)
+    response.headers['Retry-After'] = str(current_app.config.get('PASSWORD_HASH_RETRY_AFTER', 1))
+    return response
+
+def too_many_attempts_response(retry_after):
+    """Resposta 429 para email/IP com tentativas demais"""
+    minutes = max(1, (retry_after + 59) // 60)
+    flash(f'Muitas tentativas de login. Tente novamente em {minutes} minuto(s).', 'error')
+    response = make_response(render_template('login.html'), 429)
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
 @auth_bp.route('/register', methods=['GET', 'POST'])
 def register():
     """Página de cadastro de usuário"""
@@ -81,29 +92,24 @@ def register():
         
         # Tentar criar o usuário
         try:
-            # Gerar username único
-            username = email.split('@')[0]
-            counter = 1
-            original_username = username
-            
-            while User.query.filter_by(username=username).first():
-                username = f"{original_username}{counter}"
-                counter += 1
-            
             user = User(
                 email=email,
                 first_name=first_name,
                 last_name=last_name,
-                username=username,
                 auth_provider='local'
             )
             user.set_password(password)
             
-            db.session.add(user)
+            # Username único (uma consulta; repete em caso de cadastro concorrente)
+            add_with_unique_username(user, email)
             db.session.commit()
             
             flash('Cadastro realizado com sucesso!', 'success')
             return redirect(url_for('auth.login'))
+        
+        except HashingBusy:
+            db.session.rollback()
+            return hashing_busy_response('register.html')
             
         except Exception as e:
             db.session.rollback()
@@ -128,13 +134,41 @@ def login():
             flash('Email e senha são obrigatórios.', 'error')
             return render_template('login.html')
         
+        # Recusar rajadas antes de consultar o banco ou calcular hash
+        client_ip = request.remote_addr
+        retry_after = login_rate_limiter.check(email, client_ip)
+        if retry_after is not None:
+            return too_many_attempts_response(retry_after)
+        
         user = User.query.filter_by(email=email).first()
         
         if not user:
+            login_rate_limiter.register_failure(email, client_ip)
             flash('Email ou senha incorretos.', 'error')
             return render_template('login.html')
         
-        if user.check_password(password):
+        if user.is_locked():
+            retry_after = int((user.locked_until - datetime.utcnow()).total_seconds()) + 1
+            return too_many_attempts_response(retry_after)
+        
+        try:
+            password_ok = user.check_password(password)
+        except HashingBusy:
+            return hashing_busy_response('login.html')
+        
+        if password_ok:
+            login_rate_limiter.reset(email)
+            if user.locked_until or user.login_attempts:
+                user.reset_login_attempts()
+            
+            # Atualizar hash gerado com parâmetros antigos (a senha em claro só existe aqui)
+            if user.password_needs_rehash():
+                try:
+                    user.set_password(password)
+                    db.session.commit()
+                except HashingBusy:
+                    db.session.rollback()
+            
             login_user(user, remember=remember_me, duration=timedelta(hours=24))
             flash(f'Bem-vindo, {user.first_name}!', 'success')
             
@@ -143,6 +177,9 @@ def login():
                 return redirect(next_page)
             return redirect(url_for('main.dashboard'))
         else:
+            # Só persiste o bloqueio quando o limite é cruzado
+            if login_rate_limiter.register_failure(email, client_ip):
+                user.lock_account(login_rate_limiter.lockout, login_rate_limiter.email_limit)
             flash('Email ou senha incorretos.', 'error')
             return render_template('login.html')
     
@@ -162,20 +199,8 @@ def logout():
 def google_login():
     """Iniciar login com Google"""
     try:
-        # Carregar credenciais Google
-        credential_paths = [
-            'google_credentials.json',
-            './google_credentials.json',
-            os.path.join(os.getcwd(), 'google_credentials.json')
-        ]
-        
-        google_config = None
-        for path in credential_paths:
-            if os.path.exists(path):
-                with open(path, 'r') as f:
-                    google_config = json.load(f)
-                print(f"✅ Credenciais Google encontradas em: {path}")
-                break
+        # Credenciais Google (lidas do disco uma vez por processo)
+        google_config = google_credentials.get()
         
         if not google_config:
             flash('Credenciais Google não encontradas.', 'error')
@@ -184,9 +209,6 @@ def google_login():
         # Importar bibliotecas Google
         from google_auth_oauthlib.flow import Flow
         
-        client_id = google_config['web']['client_id']
-        client_secret = google_config['web']['client_secret']
-        
         flow = Flow.from_client_config(
             google_config,
             scopes=[
@@ -220,16 +242,16 @@ def google_callback():
     """Callback do OAuth Google"""
     try:
         from google_auth_oauthlib.flow import Flow
-        from google.oauth2 import id_token
-        from google.auth.transport import requests as google_requests
         
         if 'state' not in session:
             flash('Estado de sessão inválido.', 'error')
             return redirect(url_for('auth.login'))
         
-        # Carregar credenciais
-        with open('google_credentials.json', 'r') as f:
-            google_config = json.load(f)
+        # Credenciais em cache
+        google_config = google_credentials.get()
+        if not google_config:
+            flash('Credenciais Google não encontradas.', 'error')
+            return redirect(url_for('auth.login'))
         
         client_id = google_config['web']['client_id']
         
@@ -248,12 +270,8 @@ def google_callback():
         flow.fetch_token(authorization_response=request.url)
         credentials = flow.credentials
         
-        # Verificar token ID
-        id_info = id_token.verify_oauth2_token(
-            credentials._id_token,
-            google_requests.Request(),
-            client_id
-        )
+        # Verificar token ID (certificados em cache pelo Cache-Control)
+        id_info = verify_id_token(credentials._id_token, client_id)
         
         user_email = id_info.get('email')
         user_name = id_info.get('name', '').split()[0] if id_info.get('name') else 'Usuário'
@@ -277,24 +295,15 @@ def google_callback():
             flash(f'Bem-vindo de volta, {user.first_name}!', 'success')
         else:
             # Criar novo usuário
-            username = user_email.split('@')[0]
-            counter = 1
-            original_username = username
-            
-            while User.query.filter_by(username=username).first():
-                username = f"{original_username}{counter}"
-                counter += 1
-            
             new_user = User(
                 email=user_email,
                 first_name=user_name,
-                username=username,
                 auth_provider='google',
                 google_id=google_id,
                 profile_picture=user_picture
             )
             
-            db.session.add(new_user)
+            add_with_unique_username(new_user, user_email)
             db.session.commit()
             login_user(new_user)
             flash(f'Conta criada com sucesso! Bem-vindo, {user_name}!', 'success')
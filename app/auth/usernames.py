@@ -0,0 +1,88 @@
+# app/auth/usernames.py
+"""Alocação de usernames únicos.
+
+O próximo sufixo livre é descoberto com uma única consulta agregada: uma
+varredura por faixa no índice único de ``users.username`` restrita à base
+e aos nomes base + dígito (``joao``, ``joao0`` até ``joao9…``), com o maior
+sufixo numérico calculado no próprio banco. Em cadastros concorrentes, a
+violação da restrição UNIQUE é tratada com um SAVEPOINT e nova tentativa.
+"""
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import User
+
+USERNAME_MAX_LENGTH = User.__table__.c.username.type.length
+SUFFIX_ROOM = 6  # dígitos reservados para o sufixo numérico
+MAX_ATTEMPTS = 5
+
+
+def username_base(email):
+    """Base do username a partir do email (parte local, limitada ao tamanho da coluna)"""
+    base = email.split('@')[0].strip() or 'usuario'
+    return base[:USERNAME_MAX_LENGTH - SUFFIX_ROOM]
+
+
+def digits_only(expression):
+    """Condição SQL: ``expression`` contém apenas dígitos (e ao menos um)"""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        return db.and_(expression != '', db.not_(expression.op('GLOB')('*[^0-9]*')))
+    if dialect == 'postgresql':
+        return expression.op('~')('^[0-9]+$')
+    return expression.op('REGEXP')('^[0-9]+$')
+
+
+def next_username(base):
+    """Username livre para a base: ``base`` ou ``base`` + (maior sufixo + 1)
+    
+    Uma única consulta, que devolve uma linha (a base existe? maior sufixo)
+    em vez de todos os usernames com o prefixo.
+    """
+    suffix = db.func.substr(User.username, len(base) + 1)
+    base_count, max_suffix = db.session.execute(
+        db.select(
+            db.func.count(db.case((User.username == base, 1))),
+            db.func.max(db.case((User.username != base, db.cast(suffix, db.Integer))))
+        )
+        .where(db.or_(
+            User.username == base,
+            # '0'..'9' seguidos de ':' na ordem dos caracteres: faixa base0 até base9…
+            db.and_(User.username >= base + '0', User.username < base + ':', digits_only(suffix))
+        ))
+    ).one()
+    
+    if not base_count:
+        return base
+    return f'{base}{(max_suffix or 0) + 1}'
+
+
+def is_username_conflict(error):
+    """Verificar se o IntegrityError veio da restrição UNIQUE de username"""
+    return 'username' in str(getattr(error, 'orig', error))
+
+
+def add_with_unique_username(user, email, attempts=MAX_ATTEMPTS):
+    """Adicionar usuário à sessão com username único, resistente a concorrência
+    
+    Args:
+        user: User ainda não adicionado à sessão
+        email: Email de onde vem a base do username
+        attempts: Número máximo de tentativas em caso de colisão
+    
+    Returns:
+        User: O próprio usuário, já com INSERT feito (falta o commit)
+    
+    Raises:
+        IntegrityError: Se a colisão persistir ou vier de outra restrição
+    """
+    base = username_base(email)
+    for attempt in range(attempts):
+        user.username = next_username(base)
+        try:
+            with db.session.begin_nested():
+                db.session.add(user)
+            return user
+        except IntegrityError as error:
+            # Outro cadastro levou o mesmo username entre a consulta e o INSERT
+            if not is_username_conflict(error) or attempt == attempts - 1:
+                raise
@@ -1,5 +1,4 @@
 import os
-import json
 from datetime import timedelta
 
 class Config:
@@ -7,28 +6,102 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///coinctrl.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    # Pool de conexões (bancos servidor: PostgreSQL, MySQL)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # segundos
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '1') == '1'
+    
+    # PRAGMAs aplicados a cada conexão SQLite (SQLITE_PRAGMAS=0 desativa)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),  # ms
+        'cache_size': -int(os.environ.get('SQLITE_CACHE_KB', 20000)),  # KiB
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 268435456)),
+    } if os.environ.get('SQLITE_PRAGMAS', '1') == '1' else {}
+    
+    # Engine de leitura para views @read_only: réplica, ou SQLite somente leitura em WAL
+    READ_DATABASE_URL = os.environ.get('READ_DATABASE_URL')
+    SQLITE_READ_POOL = os.environ.get('SQLITE_READ_POOL', '1') == '1'
+    READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS', 5))
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
     
     # Configurações de segurança
     MAX_LOGIN_ATTEMPTS = 5
     LOCKOUT_DURATION = 30  # minutos
     
-    # OAuth Google
+    # Cache de usuários do Flask-Login (0 desativa)
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))  # segundos
+    
+    # Hashing de senhas
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    # Hashes simultâneos na máquina inteira (padrão: metade das CPUs; 0 = inline)
+    PASSWORD_HASH_MAX_INFLIGHT = (int(os.environ['PASSWORD_HASH_MAX_INFLIGHT'])
+                                  if os.environ.get('PASSWORD_HASH_MAX_INFLIGHT') else None)
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get('PASSWORD_HASH_QUEUE_TIMEOUT', 0.05))
+    # Vagas compartilhadas entre os workers ('' = limite por processo; padrão: instance/hash_slots)
+    PASSWORD_HASH_SLOTS_DIR = os.environ.get('PASSWORD_HASH_SLOTS_DIR')
+    
+    # Proxies reversos confiáveis à frente da aplicação (padrão: o roteador da plataforma
+    # do Procfile). O IP e o esquema do cliente vêm do X-Forwarded-For/-Proto; 0 ignora os
+    # cabeçalhos (servidor exposto direto, onde o cliente poderia forjá-los)
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 1))
+    
+    # Rate limit de login
+    LOGIN_RATE_LIMIT_EMAIL = int(os.environ.get('LOGIN_RATE_LIMIT_EMAIL', 5))
+    LOGIN_RATE_LIMIT_IP = int(os.environ.get('LOGIN_RATE_LIMIT_IP', 20))
+    LOGIN_RATE_LIMIT_WINDOW = int(os.environ.get('LOGIN_RATE_LIMIT_WINDOW', 900))  # segundos
+    LOGIN_LOCKOUT_SECONDS = int(os.environ.get('LOGIN_LOCKOUT_SECONDS', 1800))
+    LOGIN_RATE_LIMIT_STORAGE = os.environ.get('LOGIN_RATE_LIMIT_STORAGE', 'memory')
+    
+    # Métricas por requisição: /metrics (Prometheus) só existe com METRICS_TOKEN definido
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    METRICS_PATH = os.environ.get('METRICS_PATH', '/metrics')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Authorization: Bearer <token>
+    # Cabeçalho Server-Timing: sempre no modo debug; fora dele, só com SERVER_TIMING=1
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', '0') == '1'
+    
+    # Consultas lentas: linha JSON com SQL normalizado e EXPLAIN (SLOW_QUERY_MS=0 desativa)
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+    SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG')  # padrão: instance/slow_queries.log
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.environ.get('SLOW_QUERY_LOG_MAX_BYTES', 5 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUPS = int(os.environ.get('SLOW_QUERY_LOG_BACKUPS', 3))
+    SLOW_QUERY_EXPLAIN = os.environ.get('SLOW_QUERY_EXPLAIN', '1') == '1'
+    
+    # Cache de fragmentos dos dashboards ('memory', 'sqlite:///caminho' compartilhado ou '' desativa)
+    FRAGMENT_CACHE = os.environ.get('FRAGMENT_CACHE', 'memory')
+    FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('FRAGMENT_CACHE_MAX_BYTES', 8 * 1024 * 1024))
+    FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL', 3600))  # segundos
+    
+    # Release em produção (ex.: hash do commit), igual em todos os hosts do deploy. Entra no
+    # ETag e na chave do cache de fragmentos; sem ele vale o hash do conteúdo do código
+    APP_RELEASE = os.environ.get('APP_RELEASE')
+    
+    # Orçamentos: aviso ao salvar despesa a partir desta fração do orçamento (0 desativa)
+    BUDGET_WARNING_THRESHOLD = float(os.environ.get('BUDGET_WARNING_THRESHOLD', 0.8))
+    
+    # Templates: bytecode compilado em disco ('' desativa; padrão: instance/jinja_cache)
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')
+    
+    # OAuth Google (credenciais lidas sob demanda, uma vez por processo)
+    GOOGLE_CREDENTIALS_FILE = os.environ.get('GOOGLE_CREDENTIALS_FILE', 'google_credentials.json')
+    GOOGLE_CERTS_URL = os.environ.get('GOOGLE_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs')
+    # HTTP sem TLS no callback do OAuth: só em desenvolvimento (também ativo com FLASK_DEBUG)
+    OAUTHLIB_INSECURE_TRANSPORT = os.environ.get('OAUTHLIB_INSECURE_TRANSPORT') == '1'
+    
     @staticmethod
     def load_google_credentials():
-        """Carregar credenciais do Google OAuth"""
+        """Carregar credenciais do Google OAuth (client_id, client_secret)"""
+        from app.auth.google import google_credentials
         try:
-            with open('google_credentials.json', 'r') as f:
-                google_config = json.load(f)
-                return (
-                    google_config['web']['client_id'],
-                    google_config['web']['client_secret']
-                )
-        except FileNotFoundError:
-            print("⚠️ Arquivo google_credentials.json não encontrado.")
-            return None, None
+            if not google_credentials.get():
+                print("⚠️ Arquivo google_credentials.json não encontrado.")
+                return None, None
+            return google_credentials.client_id, google_credentials.client_secret
         except Exception as e:
             print(f"❌ Erro ao carregar credenciais Google: {e}")
             return None, None
-    
-    GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET = load_google_credentials()
\ No newline at end of file
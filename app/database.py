@@ -0,0 +1,180 @@
+# app/database.py
+"""Configuração dos engines do banco de dados.
+
+Para bancos servidor (PostgreSQL, MySQL) define o pool de conexões
+(tamanho, overflow, reciclagem e pre-ping). Para SQLite aplica os PRAGMAs
+de ``SQLITE_PRAGMAS`` em cada nova conexão: WAL permite leituras
+simultâneas a uma escrita, ``synchronous=NORMAL`` evita um fsync por
+commit, ``busy_timeout`` espera pelo lock em vez de falhar com
+"database is locked", e ``cache_size``/``mmap_size`` reduzem leituras.
+
+Views marcadas com ``@read_only`` leem de um engine separado: uma réplica
+(``READ_DATABASE_URL``) ou, em SQLite, um pool de conexões somente leitura
+sobre o mesmo arquivo em WAL. Escritas sempre vão para o primário, e
+depois de uma escrita o usuário lê do primário por
+``READ_YOUR_WRITES_SECONDS`` (ex.: a página aberta após o redirect).
+"""
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context, request, session as http_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+# Chave na sessão HTTP: até quando ler do primário (read-your-writes)
+PRIMARY_UNTIL_KEY = '_db_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms
+    'cache_size': -20000,  # negativo = KiB (20 MB por conexão)
+    'mmap_size': 268435456,  # 256 MB
+}
+
+
+def is_sqlite(uri):
+    """Verificar se a URI aponta para SQLite"""
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+
+def engine_options(config):
+    """Opções de create_engine a partir da configuração
+    
+    Opções explícitas em SQLALCHEMY_ENGINE_OPTIONS têm precedência.
+    """
+    options = {}
+    uri = config.get('SQLALCHEMY_DATABASE_URI') or 'sqlite://'
+    if not is_sqlite(uri):
+        options.update(
+            pool_size=config.get('DB_POOL_SIZE', 5),
+            max_overflow=config.get('DB_MAX_OVERFLOW', 10),
+            pool_recycle=config.get('DB_POOL_RECYCLE', 1800),
+            pool_timeout=config.get('DB_POOL_TIMEOUT', 30),
+            pool_pre_ping=config.get('DB_POOL_PRE_PING', True),
+        )
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """Executar os PRAGMAs em cada nova conexão do engine"""
+    if not pragmas:
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
+def read_engine_url(config, primary_url):
+    """URL do engine de leitura, ou None para ler do primário
+    
+    Usa READ_DATABASE_URL se definida; em SQLite com arquivo, abre o mesmo
+    arquivo em modo somente leitura (``mode=ro``).
+    """
+    url = config.get('READ_DATABASE_URL')
+    if url:
+        return url
+    if (primary_url.get_backend_name() != 'sqlite' or not config.get('SQLITE_READ_POOL', True)
+            or primary_url.database in (None, '', ':memory:')
+            or primary_url.query.get('uri')):
+        return None
+    return f'sqlite:///file:{primary_url.database}?mode=ro&uri=true'
+
+
+def create_read_engine(app, primary):
+    """Criar o engine de leitura (réplica ou SQLite somente leitura)"""
+    url = read_engine_url(app.config, primary.url)
+    if url is None:
+        return None
+    
+    options = dict(app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+    engine = create_engine(url, **options)
+    if engine.dialect.name == 'sqlite':
+        # journal_mode/synchronous são do arquivo (definidos pelo primário)
+        pragmas = {
+            name: value
+            for name, value in app.config.get('SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS).items()
+            if name not in ('journal_mode', 'synchronous')
+        }
+        pragmas['query_only'] = 1
+        apply_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def read_only(view):
+    """Marcar view como somente leitura: consultas vão para o engine de leitura
+    
+    Vale apenas para GET/HEAD/OPTIONS e fora da janela de read-your-writes.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method in SAFE_METHODS:
+            g.db_read_only = http_session.get(PRIMARY_UNTIL_KEY, 0) < time.time()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Sessão que envia leituras de views ``@read_only`` ao engine de leitura"""
+    
+    def _use_read_engine(self, clause):
+        if not has_request_context() or not g.get('db_read_only'):
+            return False
+        # Flush, DML ou leitura após escrita na mesma sessão: primário
+        if self._flushing or self.info.get('wrote'):
+            return False
+        return not getattr(clause, 'is_dml', False)
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._use_read_engine(clause):
+            engine = current_app.extensions.get('db_read_engine')
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_flush(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_dml(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _pin_primary(session):
+    # Depois de uma escrita, ler do primário por alguns segundos (réplica pode atrasar)
+    if session.info.pop('wrote', False) and has_request_context():
+        window = current_app.config.get('READ_YOUR_WRITES_SECONDS', 5)
+        if window:
+            http_session[PRIMARY_UNTIL_KEY] = time.time() + window
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _clear_writes(session):
+    session.info.pop('wrote', None)
+
+
+def init_database(app, db):
+    """Inicializar o Flask-SQLAlchemy com as opções de engine da aplicação"""
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    db.init_app(app)
+    
+    pragmas = app.config.get('SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                apply_sqlite_pragmas(engine, pragmas)
+        
+        read_engine = create_read_engine(app, db.engine)
+        if read_engine is not None:
+            app.extensions['db_read_engine'] = read_engine
@@ -2,4 +2,5 @@ from flask import Blueprint
 
 financial_bp = Blueprint('financial', __name__, url_prefix='/financial')
 
-from app.financial.routes import *
\ No newline at end of file
+from app.financial.routes import *
+from app.financial.commands import *
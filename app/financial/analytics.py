@@ -0,0 +1,203 @@
+# app/financial/analytics.py
+"""Indicadores de fluxo de caixa calculados com NumPy.
+
+As colunas (id, data, valor, tipo, categoria) do usuário são lidas em uma
+única consulta direto para arrays, e todas as métricas são calculadas de
+forma vetorizada, sem percorrer objetos Transaction em Python.
+"""
+from datetime import date
+from typing import NamedTuple
+import numpy as np
+from app import db
+from app.models import Transaction, TransactionType
+
+
+class CashFlowArrays(NamedTuple):
+    """Colunas das transações de um usuário, ordenadas por data"""
+    ids: np.ndarray          # int64
+    dates: np.ndarray        # datetime64[D]
+    amounts: np.ndarray      # float64, sempre positivo
+    is_expense: np.ndarray   # bool
+    category_ids: np.ndarray # int64
+
+
+def arrays_from_columns(ids, dates, amounts, is_expense, category_ids):
+    """Montar os arrays a partir de sequências de colunas"""
+    return CashFlowArrays(
+        ids=np.asarray(ids, dtype=np.int64),
+        dates=np.asarray(dates, dtype='datetime64[D]'),
+        amounts=np.asarray(amounts, dtype=np.float64),
+        is_expense=np.asarray(is_expense, dtype=bool),
+        category_ids=np.asarray(category_ids, dtype=np.int64),
+    )
+
+
+def load_arrays(user_id):
+    """Carregar as transações do usuário em arrays com uma única consulta"""
+    # Data como texto ISO e valor como float: evita criar date/Decimal por linha
+    rows = db.session.execute(
+        db.select(
+            Transaction.id,
+            db.type_coerce(Transaction.transaction_date, db.String),
+            db.cast(Transaction.amount, db.Float),
+            db.case((Transaction.transaction_type == TransactionType.DESPESA, 1), else_=0),
+            Transaction.category_id
+        )
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.transaction_date)
+    ).all()
+    
+    if not rows:
+        return arrays_from_columns([], [], [], [], [])
+    return arrays_from_columns(*zip(*rows))
+
+
+def monthly_series(arrays):
+    """Receitas e despesas por mês, com meses sem movimento preenchidos com zero"""
+    if not len(arrays.dates):
+        empty = np.array([], dtype=np.float64)
+        return np.array([], dtype='datetime64[M]'), empty, empty
+    
+    months = arrays.dates.astype('datetime64[M]')
+    first = months.min()
+    index = (months - first).astype(np.int64)
+    size = int(index.max()) + 1
+    
+    receitas = np.bincount(index, weights=np.where(arrays.is_expense, 0.0, arrays.amounts), minlength=size)
+    despesas = np.bincount(index, weights=np.where(arrays.is_expense, arrays.amounts, 0.0), minlength=size)
+    return first + np.arange(size), receitas, despesas
+
+
+def rolling_mean(values, window):
+    """Média móvel simples; os primeiros (window - 1) pontos usam a janela disponível"""
+    if not len(values):
+        return values
+    cumulative = np.cumsum(np.insert(values, 0, 0.0))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+def month_over_month(values):
+    """Variação absoluta e percentual em relação ao mês anterior"""
+    if len(values) < 2:
+        return np.array([]), np.array([])
+    delta = np.diff(values)
+    previous = values[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent = np.where(previous != 0, delta / previous * 100, np.nan)
+    return delta, percent
+
+
+def category_share(arrays):
+    """Participação de cada categoria no total de despesas"""
+    expenses = arrays.is_expense
+    if not expenses.any():
+        return []
+    
+    categories, inverse = np.unique(arrays.category_ids[expenses], return_inverse=True)
+    totals = np.bincount(inverse, weights=arrays.amounts[expenses])
+    order = np.argsort(totals)[::-1]
+    total = totals.sum()
+    return [
+        {
+            'category_id': int(categories[i]),
+            'total': round(float(totals[i]), 2),
+            'share': round(float(totals[i] / total * 100), 2)
+        }
+        for i in order
+    ]
+
+
+def burn_rate(arrays, today, days=90):
+    """Gasto médio diário nos últimos N dias e saldo/fôlego resultante"""
+    start = np.datetime64(today, 'D') - np.timedelta64(days, 'D')
+    recent = (arrays.dates > start) & arrays.is_expense
+    daily = float(arrays.amounts[recent].sum()) / days
+    
+    balance = float(
+        arrays.amounts[~arrays.is_expense].sum() - arrays.amounts[arrays.is_expense].sum()
+    )
+    return {
+        'days': days,
+        'daily': round(daily, 2),
+        'monthly': round(daily * 30, 2),
+        'balance': round(balance, 2),
+        'runway_days': int(balance / daily) if daily > 0 and balance > 0 else None
+    }
+
+
+def expense_outliers(arrays, limit=10, threshold=3.5):
+    """Maiores despesas atípicas pelo z-score modificado (mediana/MAD)"""
+    expenses = np.flatnonzero(arrays.is_expense)
+    if len(expenses) < 3:
+        return []
+    
+    values = arrays.amounts[expenses]
+    median = np.median(values)
+    mad = np.median(np.abs(values - median))
+    if mad == 0:
+        return []
+    
+    scores = 0.6745 * (values - median) / mad
+    flagged = np.flatnonzero(scores > threshold)
+    top = flagged[np.argsort(values[flagged])[::-1][:limit]]
+    return [
+        {
+            'id': int(arrays.ids[expenses[i]]),
+            'transaction_date': str(arrays.dates[expenses[i]]),
+            'amount': round(float(values[i]), 2),
+            'category_id': int(arrays.category_ids[expenses[i]]),
+            'score': round(float(scores[i]), 2)
+        }
+        for i in top
+    ]
+
+
+def compute_insights(arrays, window=3, months=12, burn_days=90, today=None):
+    """Calcular todos os indicadores a partir dos arrays
+    
+    Args:
+        arrays (CashFlowArrays): Colunas das transações
+        window (int): Janela da média móvel, em meses
+        months (int): Quantidade de meses retornados na série mensal
+        burn_days (int): Janela do gasto médio diário, em dias
+        today (date): Data de referência (padrão: hoje)
+        
+    Returns:
+        dict: Série mensal, participação por categoria, burn rate e outliers
+    """
+    today = today or date.today()
+    periods, receitas, despesas = monthly_series(arrays)
+    saldo = receitas - despesas
+    avg_despesas = rolling_mean(despesas, window)
+    avg_saldo = rolling_mean(saldo, window)
+    delta, delta_percent = month_over_month(despesas)
+    delta = np.insert(delta, 0, np.nan) if len(despesas) else delta
+    delta_percent = np.insert(delta_percent, 0, np.nan) if len(despesas) else delta_percent
+    
+    def number(value):
+        return None if np.isnan(value) else round(float(value), 2)
+    
+    series = [
+        {
+            'period': str(periods[i]),
+            'receitas': round(float(receitas[i]), 2),
+            'despesas': round(float(despesas[i]), 2),
+            'saldo': round(float(saldo[i]), 2),
+            'despesas_media_movel': round(float(avg_despesas[i]), 2),
+            'saldo_media_movel': round(float(avg_saldo[i]), 2),
+            'despesas_variacao': number(delta[i]),
+            'despesas_variacao_percentual': number(delta_percent[i])
+        }
+        for i in range(max(len(periods) - months, 0), len(periods))
+    ]
+    
+    return {
+        'transaction_count': int(len(arrays.ids)),
+        'window': window,
+        'monthly': series,
+        'category_share': category_share(arrays),
+        'burn_rate': burn_rate(arrays, today, burn_days),
+        'outliers': expense_outliers(arrays)
+    }
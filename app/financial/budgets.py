@@ -0,0 +1,114 @@
+# app/financial/budgets.py
+"""Orçamentos mensais por categoria de despesa.
+
+O gasto de cada orçamento (``Budget.spent``) é atualizado pelo ledger na
+mesma transação de cada escrita, então tanto o aviso de orçamento
+estourado após salvar uma despesa quanto a API de status leem apenas
+contadores: uma consulta por índice, independente do tamanho do histórico.
+"""
+from datetime import datetime
+from decimal import Decimal
+from flask import current_app
+from app import db
+from app.models import Budget, Category, MonthlyRollup, TransactionType
+from app.financial.reports import current_period
+from app.financial.validation import TransactionValidationError, validate_amount
+
+
+def validate_period(period):
+    """Validar período 'AAAA-MM' (padrão: mês atual)"""
+    period = (period or '').strip() or current_period()
+    try:
+        datetime.strptime(period, '%Y-%m')
+    except ValueError:
+        raise TransactionValidationError('Período inválido! Use AAAA-MM.')
+    return period
+
+
+def set_budget(user_id, category_id, amount, period=None):
+    """Criar ou alterar o orçamento da categoria no mês
+    
+    O gasto inicial é a soma das despesas da categoria no mês, lida das
+    transações (intervalo de datas pelo índice), e não de ``monthly_rollups``.
+    
+    Returns:
+        tuple: (Budget, True se foi criado)
+    
+    Raises:
+        TransactionValidationError: Categoria, valor ou período inválido
+    """
+    amount = validate_amount(amount)
+    period = validate_period(period)
+    category = Category.query.filter_by(
+        id=category_id, user_id=user_id, transaction_type=TransactionType.DESPESA
+    ).first() if str(category_id).isdigit() else None
+    if category is None:
+        raise TransactionValidationError('Categoria de despesa inválida!')
+    
+    budget = Budget.query.filter_by(category_id=category.id, period=period).first()
+    created = budget is None
+    if created:
+        budget = Budget(
+            user_id=user_id,
+            category_id=category.id,
+            period=period,
+            spent=MonthlyRollup.compute_cell(user_id, period, category.id, TransactionType.DESPESA)[0]
+        )
+        db.session.add(budget)
+    budget.amount = amount
+    return budget, created
+
+
+def budget_status(user_id, period):
+    """Orçamentos do mês com a categoria (uma consulta pelo índice usuário/mês)"""
+    rows = db.session.query(Budget, Category.name, Category.icon, Category.color)\
+        .join(Category, Category.id == Budget.category_id)\
+        .filter(Budget.user_id == user_id, Budget.period == period)\
+        .order_by(Category.name).all()
+    
+    budgets = []
+    for budget, name, icon, color in rows:
+        data = budget.to_dict()
+        data['category'] = {'id': budget.category_id, 'name': name, 'icon': icon, 'color': color}
+        budgets.append(data)
+    
+    total_amount = sum(item['amount'] for item in budgets)
+    total_spent = sum(item['spent'] for item in budgets)
+    return {
+        'period': period,
+        'budgets': budgets,
+        'total_amount': round(total_amount, 2),
+        'total_spent': round(total_spent, 2),
+        'over_budget': [item['category_id'] for item in budgets if item['over_budget']]
+    }
+
+
+def budget_alert(transaction, category_name):
+    """Mensagem de aviso se a despesa deixou o orçamento do mês no limite ou acima
+    
+    Deve ser chamada depois de ``apply_transaction`` (o gasto já inclui a
+    transação). Lê apenas o orçamento da categoria no mês.
+    
+    Returns:
+        tuple: (mensagem, categoria do flash) ou None
+    """
+    if transaction.transaction_type != TransactionType.DESPESA:
+        return None
+    period = MonthlyRollup.period_of(transaction.transaction_date)
+    row = db.session.execute(
+        db.select(Budget.amount, Budget.spent)
+        .where(Budget.category_id == transaction.category_id, Budget.period == period)
+    ).first()
+    if row is None or not row.amount:
+        return None
+    
+    month = f'{period[5:]}/{period[:4]}'
+    if row.spent > row.amount:
+        return (f'Orçamento de "{category_name}" em {month} estourado: '
+                f'R$ {row.spent:.2f} de R$ {row.amount:.2f}.', 'warning')
+    threshold = current_app.config.get('BUDGET_WARNING_THRESHOLD', 0.8)
+    if threshold and row.spent >= row.amount * Decimal(str(threshold)):
+        percent = row.spent / row.amount * 100
+        return (f'Orçamento de "{category_name}" em {month} com {percent:.0f}% usado '
+                f'(R$ {row.spent:.2f} de R$ {row.amount:.2f}).', 'info')
+    return None
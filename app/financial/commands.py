@@ -0,0 +1,152 @@
+# app/financial/commands.py
+"""Comandos de manutenção do módulo financeiro (flask financial ...)"""
+import click
+from app.financial import financial_bp
+from app import db
+from app.models import Budget, Category, MonthlyRollup, User, UserBalance
+from app.financial.ledger import rebuild_user
+from app.query_plans import check_hot_queries
+
+
+def _user_ids(user_id):
+    if user_id:
+        return [user_id]
+    return [row.id for row in db.session.query(User.id).order_by(User.id)]
+
+
+@financial_bp.cli.command('rebuild-ledger')
+@click.option('--user-id', type=int, help='Reconstruir apenas este usuário.')
+def rebuild_ledger(user_id):
+    """Recalcular os totais consolidados e mensais a partir das transações"""
+    user_ids = _user_ids(user_id)
+    for uid in user_ids:
+        rebuild_user(uid)
+    db.session.commit()
+    click.echo(f'✅ Totais reconstruídos para {len(user_ids)} usuário(s).')
+
+
+@financial_bp.cli.command('verify-ledger')
+@click.option('--user-id', type=int, help='Verificar apenas este usuário.')
+@click.option('--fix', is_flag=True, help='Corrigir os usuários com divergência.')
+def verify_ledger(user_id, fix):
+    """Comparar os totais consolidados com a soma das transações"""
+    drifted = 0
+    for uid in _user_ids(user_id):
+        expected = UserBalance.compute(uid)
+        balance = db.session.get(UserBalance, uid)
+        stored = {
+            'receitas': balance.receitas,
+            'despesas': balance.despesas,
+            'transaction_count': balance.transaction_count
+        } if balance else None
+        
+        expected_cells = MonthlyRollup.compute(uid)
+        stored_cells = {
+            (cell.period, cell.category_id, cell.transaction_type): (cell.total, cell.count)
+            for cell in MonthlyRollup.query.filter_by(user_id=uid)
+        }
+        
+        expected_usage = Category.compute_usage(uid)
+        stored_usage = {
+            category.id: (category.transaction_count, category.total_amount, category.last_transaction_date)
+            for category in Category.query.filter_by(user_id=uid)
+        }
+        
+        expected_budgets = Budget.compute(uid)
+        stored_budgets = {
+            budget.id: budget.spent
+            for budget in Budget.query.filter_by(user_id=uid)
+        }
+        
+        if (stored == expected and stored_cells == expected_cells
+                and stored_usage == expected_usage and stored_budgets == expected_budgets):
+            continue
+        
+        drifted += 1
+        if stored != expected:
+            click.echo(f'⚠️ Usuário {uid}: consolidado={stored} esperado={expected}')
+        if stored_cells != expected_cells:
+            click.echo(f'⚠️ Usuário {uid}: totais mensais divergentes')
+        if stored_usage != expected_usage:
+            click.echo(f'⚠️ Usuário {uid}: contadores de categorias divergentes')
+        if stored_budgets != expected_budgets:
+            click.echo(f'⚠️ Usuário {uid}: gastos dos orçamentos divergentes')
+        if fix:
+            rebuild_user(uid)
+    
+    if fix and drifted:
+        db.session.commit()
+        click.echo(f'✅ {drifted} usuário(s) corrigido(s).')
+    elif drifted:
+        raise SystemExit(1)
+    else:
+        click.echo('✅ Nenhuma divergência encontrada.')
+
+
+@financial_bp.cli.command('check-query-plans')
+@click.option('--verbose', is_flag=True, help='Exibir o plano completo de cada consulta.')
+def check_query_plans(verbose):
+    """Falhar se alguma consulta frequente deixar de usar seu índice (SQLite)"""
+    if db.engine.dialect.name != 'sqlite':
+        click.echo('ℹ️ Verificação disponível apenas para SQLite.')
+        return
+    
+    failures = 0
+    for name, index_name, plan, ok in check_hot_queries():
+        failures += not ok
+        click.echo(f'{"✅" if ok else "❌"} {name} -> {index_name}')
+        if verbose or not ok:
+            for detail in plan:
+                click.echo(f'      {detail}')
+    
+    if failures:
+        raise SystemExit(1)
+
+
+@financial_bp.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Reconstruir o índice de busca textual (FTS5)"""
+    from app.financial.search import fts_enabled, rebuild_search_index
+    
+    if not fts_enabled():
+        click.echo('ℹ️ Índice FTS disponível apenas para SQLite.')
+        return
+    
+    rebuild_search_index()
+    click.echo('✅ Índice de busca reconstruído.')
+
+
+@financial_bp.cli.command('slow-queries')
+@click.option('--top', default=10, show_default=True, help='Quantidade de consultas exibidas.')
+@click.option('--since', type=click.DateTime(), help='Considerar apenas entradas a partir desta data.')
+@click.option('--file', 'path', type=click.Path(dir_okay=False), help='Arquivo de log (padrão: SLOW_QUERY_LOG).')
+@click.option('--plans/--no-plans', default=True, help='Exibir o último plano de cada consulta.')
+def slow_queries(top, since, path, plans):
+    """Resumir o log de consultas lentas pelos maiores ofensores em tempo total"""
+    from app.slow_queries import read_entries, slow_query_log, summarize
+    
+    path = path or slow_query_log.path
+    groups = summarize(read_entries(path), since=since)
+    if not groups:
+        click.echo(f'✅ Nenhuma consulta lenta registrada em {path}.')
+        return
+    
+    click.echo(f'{len(groups)} consulta(s) distinta(s) em {path}\n')
+    for rank, group in enumerate(groups[:top], 1):
+        endpoints = ', '.join(
+            f'{name} ({count})'
+            for name, count in sorted(group['endpoints'].items(), key=lambda item: -item[1])
+        )
+        click.echo(
+            f"{rank}. [{group['fingerprint']}] total {group['total_ms']:.0f} ms | "
+            f"{group['count']}x | média {group['total_ms'] / group['count']:.1f} ms | "
+            f"máx {group['max_ms']:.1f} ms"
+        )
+        click.echo(f'   endpoints: {endpoints}')
+        click.echo(f"   {group['sql'][:300]}")
+        if plans and group['plan']:
+            for detail in group['plan']:
+                unindexed = detail.startswith('SCAN') and 'INDEX' not in detail
+                marker = '⚠️ ' if unindexed or 'TEMP B-TREE' in detail else ''
+                click.echo(f'      {marker}{detail}')
+        click.echo('')
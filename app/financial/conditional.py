@@ -0,0 +1,87 @@
+# app/financial/conditional.py
+"""GET condicional (ETag / If-None-Match) pela versão dos dados do usuário.
+
+Toda escrita em categorias ou transações incrementa ``UserDataVersion``
+(ver ``app.financial.ledger``). O ETag das páginas e APIs combina essa
+versão com o usuário, a data do dia e o release da aplicação
+(``APP_RELEASE``, ou uma impressão digital do conteúdo do código). Se o navegador envia o mesmo ETag, a resposta é 304 logo
+após uma leitura por chave primária, sem executar a view nem o template.
+"""
+import hashlib
+import os
+from datetime import date
+from functools import wraps
+from flask import current_app, g, make_response, request, session
+from flask_login import current_user
+from app.models import UserDataVersion
+
+
+def source_fingerprint(root_path):
+    """Impressão digital do conteúdo dos fontes e templates
+    
+    Usada quando ``APP_RELEASE`` não está definido. Depende só dos caminhos
+    relativos e do conteúdo dos arquivos, então é a mesma em todos os hosts
+    com o mesmo código (ao contrário das datas de modificação).
+    """
+    digest = hashlib.sha1()
+    for directory, dirnames, files in os.walk(root_path):
+        dirnames.sort()
+        for name in sorted(files):
+            if name.endswith(('.py', '.html')):
+                path = os.path.join(directory, name)
+                digest.update(os.path.relpath(path, root_path).replace(os.sep, '/').encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:10]
+
+
+def etag_salt(app):
+    """Sal do ETag e das chaves de fragmentos: o release configurado ou o conteúdo do código"""
+    return app.config.get('APP_RELEASE') or source_fingerprint(app.root_path)
+
+
+def current_data_version(user_id):
+    """Versão dos dados do usuário, lida uma vez por requisição
+    
+    O ETag e o cache de fragmentos (``app.fragments``) usam o mesmo valor.
+    """
+    cached = g.get('data_version')
+    if cached is not None and cached[0] == user_id:
+        return cached[1]
+    version = UserDataVersion.get(user_id)
+    g.data_version = (user_id, version)
+    return version
+
+
+def data_etag(user_id):
+    """ETag da versão atual dos dados do usuário"""
+    version = current_data_version(user_id)
+    salt = current_app.config.get('ETAG_SALT', '')
+    return f'u{user_id}-v{version}-{date.today():%Y%m%d}-{salt}'
+
+
+def conditional_get(view):
+    """Responder 304 se o ETag enviado corresponde à versão atual dos dados
+    
+    Não se aplica a requisições não-GET ou com mensagens flash pendentes
+    (a página mudaria mesmo sem alteração nos dados).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if (request.method not in ('GET', 'HEAD') or not current_user.is_authenticated
+                or session.get('_flashes')):
+            return view(*args, **kwargs)
+        
+        etag = data_etag(current_user.id)
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+        
+        response.set_etag(etag, weak=True)
+        # Conteúdo privado: o navegador guarda, mas revalida a cada visita
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return wrapper
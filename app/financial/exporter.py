@@ -0,0 +1,115 @@
+# app/financial/exporter.py
+"""Exportação do histórico de transações em CSV ou NDJSON, por streaming.
+
+A consulta já traz o nome da categoria (JOIN) e é lida em blocos com
+``yield_per``; cada bloco é escrito e enviado antes do próximo ser lido,
+então a memória fica constante. O primeiro bloco enviado tem uma única
+linha, para que o primeiro byte não espere o lote inteiro.
+O CSV usa os mesmos cabeçalhos aceitos pela importação.
+"""
+import csv
+import io
+import json
+from app.models import Category, Transaction
+
+YIELD_PER = 1000
+
+CSV_HEADER = ['data', 'descricao', 'valor', 'tipo', 'categoria', 'observacoes', 'id', 'criado_em']
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+def export_query(query):
+    """Projetar a query de transações nas colunas exportadas, com a categoria"""
+    return query.join(Category, Category.id == Transaction.category_id)\
+        .with_entities(
+            Transaction.id,
+            Transaction.transaction_date,
+            Transaction.description,
+            Transaction.amount,
+            Transaction.transaction_type,
+            Category.name.label('category_name'),
+            Transaction.notes,
+            Transaction.created_at
+        )\
+        .order_by(Transaction.transaction_date, Transaction.created_at, Transaction.id)\
+        .execution_options(stream_results=True)\
+        .yield_per(YIELD_PER)
+
+
+def chunked(lines, size=YIELD_PER):
+    """Agrupar linhas de texto em blocos de ``size``
+    
+    O primeiro bloco sai com a primeira linha, sem esperar o lote inteiro:
+    o tempo até o primeiro byte não cresce com o tamanho do bloco.
+    """
+    batch = []
+    limit = 1
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= limit:
+            yield ''.join(batch)
+            batch = []
+            limit = size
+    
+    if batch:
+        yield ''.join(batch)
+
+
+def csv_lines(rows):
+    """Uma linha CSV (com quebra de linha) por transação"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            row.transaction_date.isoformat(),
+            row.description,
+            f'{row.amount:.2f}',
+            row.transaction_type.value,
+            row.category_name,
+            row.notes or '',
+            row.id,
+            row.created_at.isoformat() if row.created_at else ''
+        ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def ndjson_lines(rows):
+    """Um objeto JSON por linha por transação"""
+    for row in rows:
+        yield json.dumps({
+            'id': row.id,
+            'transaction_date': row.transaction_date.isoformat(),
+            'description': row.description,
+            'amount': float(row.amount),
+            'transaction_type': row.transaction_type.value,
+            'category': row.category_name,
+            'notes': row.notes,
+            'created_at': row.created_at.isoformat() if row.created_at else None
+        }, ensure_ascii=False) + '\n'
+
+
+def generate_csv(rows):
+    """Gerar o CSV: cabeçalho antes da primeira leitura no banco, depois em blocos"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_HEADER)
+    yield buffer.getvalue()
+    yield from chunked(csv_lines(rows))
+
+
+def generate_ndjson(rows):
+    """Gerar um objeto JSON por linha, em blocos"""
+    return chunked(ndjson_lines(rows))
+
+
+def generate_export(query, file_format):
+    """Gerador do arquivo exportado no formato pedido"""
+    rows = export_query(query)
+    if file_format == 'ndjson':
+        return generate_ndjson(rows)
+    return generate_csv(rows)
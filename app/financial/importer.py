@@ -0,0 +1,242 @@
+# app/financial/importer.py
+"""Importação em lote de extratos bancários (CSV e OFX).
+
+O arquivo é lido linha a linha e gravado em lotes: cada lote resolve as
+categorias a partir de um mapa em memória, atualiza os totais consolidados
+uma vez e insere todas as transações com um único executemany, seguido de
+um commit. A memória usada depende do tamanho do lote, não do arquivo.
+"""
+import csv
+import io
+import re
+from datetime import datetime
+from app import db
+from app.models import Category, Transaction
+from app.financial.ledger import apply_batch
+from app.financial.validation import (
+    TransactionValidationError, validate_amount, validate_description,
+    validate_transaction_date, validate_transaction_type
+)
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 200
+DEFAULT_CATEGORY = 'Importados'
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d/%m/%y')
+
+# Cabeçalhos aceitos no CSV (português e inglês)
+CSV_COLUMNS = {
+    'date': ('data', 'date', 'data da transação', 'data_transacao'),
+    'description': ('descrição', 'descricao', 'description', 'histórico', 'historico'),
+    'amount': ('valor', 'amount', 'value'),
+    'transaction_type': ('tipo', 'type', 'transaction_type'),
+    'category': ('categoria', 'category'),
+    'notes': ('observações', 'observacoes', 'notes', 'notas'),
+}
+
+
+class ImportResult:
+    """Resumo da importação: quantidade gravada e erros por linha"""
+    
+    def __init__(self):
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+        self.created_categories = []
+    
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+    
+    def to_dict(self):
+        return {
+            'imported': self.imported,
+            'error_count': self.error_count,
+            'errors': [{'line': line, 'message': message} for line, message in self.errors],
+            'created_categories': self.created_categories
+        }
+
+
+def parse_amount(value):
+    """Aceitar valores no formato brasileiro (1.234,56) ou internacional (1234.56)"""
+    value = (value or '').strip().replace('R$', '').replace(' ', '')
+    if ',' in value:
+        value = value.replace('.', '').replace(',', '.')
+    return value
+
+
+def iter_csv_rows(stream):
+    """Ler o CSV linha a linha, gerando (número da linha, campos normalizados)"""
+    first_line = stream.readline()
+    delimiter = ';' if first_line.count(';') > first_line.count(',') else ','
+    header = next(csv.reader([first_line], delimiter=delimiter), [])
+    
+    columns = {}
+    for index, name in enumerate(header):
+        name = name.strip().lower()
+        for field, aliases in CSV_COLUMNS.items():
+            if name in aliases:
+                columns[field] = index
+    
+    missing = {'date', 'description', 'amount'} - set(columns)
+    if missing:
+        raise TransactionValidationError(
+            'Cabeçalho do CSV deve conter as colunas data, descrição e valor.'
+        )
+    
+    for line, values in enumerate(csv.reader(stream, delimiter=delimiter), start=2):
+        if not any(value.strip() for value in values):
+            continue
+        yield line, {
+            field: values[index] if index < len(values) else ''
+            for field, index in columns.items()
+        }
+
+
+OFX_TAG = re.compile(r'<(\w+)>([^<\r\n]*)')
+
+
+def iter_ofx_rows(stream):
+    """Ler os blocos <STMTTRN> de um OFX (SGML ou XML), sem carregar o arquivo"""
+    current = None
+    start_line = 0
+    for line, text in enumerate(stream, start=1):
+        for tag, value in OFX_TAG.findall(text):
+            tag = tag.upper()
+            if tag == 'STMTTRN':
+                current, start_line = {}, line
+            elif current is not None:
+                current[tag] = value.strip()
+        
+        if current is not None and '</STMTTRN>' in text.upper():
+            posted = current.get('DTPOSTED', '')[:8]
+            yield start_line, {
+                'date': f'{posted[:4]}-{posted[4:6]}-{posted[6:8]}' if len(posted) == 8 else posted,
+                'description': current.get('MEMO') or current.get('NAME', ''),
+                'amount': current.get('TRNAMT', ''),
+                'transaction_type': '',
+                'category': '',
+                'notes': current.get('FITID', '') and f'OFX {current["FITID"]}',
+            }
+            current = None
+
+
+def normalize_row(raw):
+    """Validar uma linha com as mesmas regras de new_transaction"""
+    amount = parse_amount(raw.get('amount'))
+    transaction_type = (raw.get('transaction_type') or '').strip().lower()
+    
+    # Sem coluna de tipo, o sinal do valor define receita/despesa
+    if not transaction_type:
+        transaction_type = 'despesa' if amount.startswith('-') else 'receita'
+    amount = amount.lstrip('-+')
+    
+    return {
+        'description': validate_description(raw.get('description'))[:200],
+        'amount': validate_amount(amount),
+        'transaction_type': validate_transaction_type(transaction_type),
+        'transaction_date': validate_transaction_date(raw.get('date'), DATE_FORMATS),
+        'category': (raw.get('category') or '').strip()[:100] or DEFAULT_CATEGORY,
+        'notes': (raw.get('notes') or '').strip(),
+    }
+
+
+class CategoryResolver:
+    """Mapa em memória (nome, tipo) -> id, criando categorias faltantes por lote"""
+    
+    def __init__(self, user_id, result):
+        self.user_id = user_id
+        self.result = result
+        self.ids = {
+            (name.casefold(), transaction_type): category_id
+            for category_id, name, transaction_type in db.session.query(
+                Category.id, Category.name, Category.transaction_type
+            ).filter_by(user_id=user_id)
+        }
+    
+    def resolve(self, rows):
+        """Preencher category_id de todas as linhas do lote"""
+        missing = {}
+        for row in rows:
+            key = (row['category'].casefold(), row['transaction_type'])
+            if key not in self.ids:
+                missing[key] = row
+        
+        if missing:
+            created = [
+                Category(
+                    name=row['category'],
+                    transaction_type=row['transaction_type'],
+                    user_id=self.user_id,
+                    icon='📥'
+                )
+                for row in missing.values()
+            ]
+            db.session.add_all(created)
+            db.session.flush()
+            for category in created:
+                self.ids[(category.name.casefold(), category.transaction_type)] = category.id
+                self.result.created_categories.append(category.name)
+        
+        for row in rows:
+            row['category_id'] = self.ids[(row.pop('category').casefold(), row['transaction_type'])]
+
+
+def _flush_chunk(user_id, rows, resolver):
+    resolver.resolve(rows)
+    now = datetime.utcnow()
+    for row in rows:
+        row['user_id'] = user_id
+        row['created_at'] = now
+        row['updated_at'] = now
+    
+    # Totais antes do INSERT: a reconstrução não pode contar o próprio lote
+    apply_batch(user_id, rows)
+    db.session.execute(Transaction.__table__.insert(), rows)
+    db.session.commit()
+
+
+def import_transactions(user_id, file_storage, file_format='csv', chunk_size=CHUNK_SIZE):
+    """Importar um extrato enviado pelo usuário
+    
+    Args:
+        user_id (int): ID do usuário
+        file_storage: Arquivo enviado (werkzeug FileStorage)
+        file_format (str): 'csv' ou 'ofx'
+        chunk_size (int): Quantidade de linhas por lote/commit
+        
+    Returns:
+        ImportResult: Quantidade importada e erros por linha
+        
+    Raises:
+        TransactionValidationError: Se o arquivo não puder ser lido
+    """
+    result = ImportResult()
+    stream = io.TextIOWrapper(file_storage.stream, encoding='utf-8-sig', errors='replace', newline='')
+    rows_iter = iter_ofx_rows(stream) if file_format == 'ofx' else iter_csv_rows(stream)
+    resolver = CategoryResolver(user_id, result)
+    
+    chunk = []
+    try:
+        for line, raw in rows_iter:
+            try:
+                chunk.append(normalize_row(raw))
+            except TransactionValidationError as e:
+                result.add_error(line, str(e))
+                continue
+            
+            if len(chunk) >= chunk_size:
+                _flush_chunk(user_id, chunk, resolver)
+                result.imported += len(chunk)
+                chunk = []
+        
+        if chunk:
+            _flush_chunk(user_id, chunk, resolver)
+            result.imported += len(chunk)
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        stream.detach()
+    
+    return result
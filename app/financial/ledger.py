@@ -0,0 +1,111 @@
+# app/financial/ledger.py
+"""Manutenção incremental dos totais derivados das transações.
+
+As rotas de CRUD chamam estas funções antes do ``db.session.commit()``,
+de forma que os totais consolidados são gravados na mesma transação do
+banco que a própria alteração.
+"""
+from app import db
+from app.models import Budget, Category, MonthlyRollup, TransactionType, UserBalance, UserDataVersion
+
+
+def apply_transaction(transaction, sign=1):
+    """Aplicar (sign=1) ou estornar (sign=-1) uma transação nos totais do usuário"""
+    amount = transaction.amount * sign
+    
+    # Sem autoflush: se algum total precisar ser reconstruído, a soma do
+    # histórico não pode incluir a alteração pendente aplicada agora.
+    with db.session.no_autoflush:
+        _apply_balance(transaction.user_id, transaction.transaction_type, amount, count=sign)
+        MonthlyRollup.apply(
+            transaction.user_id,
+            transaction.transaction_date,
+            transaction.category_id,
+            transaction.transaction_type,
+            amount,
+            count=sign
+        )
+        Category.apply_usage(
+            transaction.category_id,
+            transaction.user_id,
+            transaction.transaction_date,
+            amount,
+            count=sign,
+            exclude_id=transaction.id if sign < 0 else None
+        )
+        if transaction.transaction_type == TransactionType.DESPESA:
+            Budget.apply(transaction.category_id, transaction.transaction_date, amount)
+        UserDataVersion.bump(transaction.user_id)
+
+
+def _apply_balance(user_id, transaction_type, amount, count):
+    """Somar o delta ao saldo, semeando antes todos os totais na primeira escrita
+    
+    Sem saldo consolidado, os totais mensais, contadores de categorias e
+    orçamentos também nunca foram preenchidos com o histórico: todos são
+    reconstruídos (sem a alteração pendente) antes de receber o delta.
+    """
+    if not UserBalance.apply(user_id, transaction_type, amount, count=count):
+        rebuild_user(user_id)
+        UserBalance.apply(user_id, transaction_type, amount, count=count)
+
+
+def bump_data_version(user_id):
+    """Marcar os dados do usuário como alterados (invalida ETags das páginas)"""
+    UserDataVersion.bump(user_id)
+
+
+def revert_transaction(transaction):
+    """Estornar uma transação dos totais (antes de editar ou excluir)"""
+    apply_transaction(transaction, sign=-1)
+
+
+def rebuild_user(user_id):
+    """Reconstruir todos os totais derivados de um usuário"""
+    balance = UserBalance.rebuild(user_id)
+    MonthlyRollup.rebuild(user_id)
+    Category.rebuild_usage(user_id)
+    Budget.rebuild(user_id)
+    return balance
+
+
+def apply_batch(user_id, rows):
+    """Aplicar um lote de transações novas (dicts) agregando os deltas
+    
+    Deve ser chamada antes de inserir o lote, para que uma eventual
+    reconstrução dos totais não conte as linhas do próprio lote.
+    """
+    balances = {}
+    cells = {}
+    usage = {}
+    for row in rows:
+        key = row['transaction_type']
+        amount, count = balances.get(key, (0, 0))
+        balances[key] = (amount + row['amount'], count + 1)
+        
+        key = (MonthlyRollup.period_of(row['transaction_date']), row['category_id'], row['transaction_type'])
+        amount, count = cells.get(key, (0, 0))
+        cells[key] = (amount + row['amount'], count + 1)
+        
+        key = row['category_id']
+        amount, count, last_date = usage.get(key, (0, 0, row['transaction_date']))
+        usage[key] = (amount + row['amount'], count + 1, max(last_date, row['transaction_date']))
+    
+    with db.session.no_autoflush:
+        for transaction_type, (amount, count) in balances.items():
+            _apply_balance(user_id, transaction_type, amount, count=count)
+        for (period, category_id, transaction_type), (amount, count) in cells.items():
+            MonthlyRollup.apply(
+                user_id,
+                MonthlyRollup.period_bounds(period)[0],
+                category_id,
+                transaction_type,
+                amount,
+                count=count
+            )
+        for category_id, (amount, count, last_date) in usage.items():
+            Category.apply_usage(category_id, user_id, last_date, amount, count=count)
+        for (period, category_id, transaction_type), (amount, _) in cells.items():
+            if transaction_type == TransactionType.DESPESA:
+                Budget.apply(category_id, MonthlyRollup.period_bounds(period)[0], amount)
+        UserDataVersion.bump(user_id)
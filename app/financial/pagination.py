@@ -0,0 +1,100 @@
+# app/financial/pagination.py
+"""Paginação por cursor (keyset) da listagem de transações.
+
+A ordenação é sempre (transaction_date, created_at, id) decrescente e o
+cursor guarda a chave da última linha da página. A próxima página é obtida
+com uma comparação de tupla, sem OFFSET, então o custo por página não
+depende de quantas transações o usuário já tem.
+"""
+import base64
+import json
+from datetime import date, datetime
+from app import db
+from app.models import Transaction
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    """Cursor de paginação malformado ou adulterado"""
+
+
+def encode_cursor(transaction):
+    """Gerar cursor opaco a partir da última transação da página"""
+    key = [
+        transaction.transaction_date.isoformat(),
+        transaction.created_at.isoformat(),
+        transaction.id
+    ]
+    raw = json.dumps(key, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Converter cursor opaco na chave (data, criado_em, id)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        transaction_date, created_at, transaction_id = json.loads(raw)
+        return (
+            date.fromisoformat(transaction_date),
+            datetime.fromisoformat(created_at),
+            int(transaction_id)
+        )
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Converter o parâmetro de tamanho de página respeitando o limite máximo"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_query(query, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Aplicar cursor, ordenação e limite à query de transações
+    
+    Raises:
+        InvalidCursor: Se o cursor não puder ser decodificado
+    """
+    if cursor:
+        key = decode_cursor(cursor)
+        query = query.filter(db.tuple_(
+            Transaction.transaction_date,
+            Transaction.created_at,
+            Transaction.id
+        ) < key)
+    
+    # Buscar um item a mais para saber se existe próxima página
+    return query.order_by(
+        Transaction.transaction_date.desc(),
+        Transaction.created_at.desc(),
+        Transaction.id.desc()
+    ).limit(page_size + 1)
+
+
+def paginate_transactions(query, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Buscar uma página de transações a partir do cursor
+    
+    Args:
+        query: Query de Transaction já filtrada
+        cursor (str): Cursor retornado pela página anterior (ou None)
+        page_size (int): Quantidade de itens por página
+        
+    Returns:
+        tuple: (lista de transações, próximo cursor ou None)
+        
+    Raises:
+        InvalidCursor: Se o cursor não puder ser decodificado
+    """
+    items = keyset_query(query, cursor, page_size).all()
+    
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(items[-1])
+    
+    return items, next_cursor
@@ -0,0 +1,181 @@
+# app/financial/reports.py
+"""Relatórios por período e por categoria a partir dos totais mensais.
+
+Todas as consultas leem apenas ``monthly_rollups``, então o custo depende
+do número de meses x categorias do período, não do número de transações.
+"""
+from datetime import date
+from decimal import Decimal
+from app import db
+from app.models import Category, MonthlyRollup, TransactionType
+
+
+def shift_period(period, months):
+    """Deslocar um período 'AAAA-MM' em N meses (negativo para voltar)"""
+    year, month = map(int, period.split('-'))
+    index = year * 12 + (month - 1) + months
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+
+def current_period():
+    """Período do mês atual"""
+    return MonthlyRollup.period_of(date.today())
+
+
+def list_periods(start, end):
+    """Todos os períodos entre start e end, inclusive"""
+    periods = []
+    period = start
+    while period <= end:
+        periods.append(period)
+        period = shift_period(period, 1)
+    return periods
+
+
+def monthly_totals(user_id, start, end):
+    """Receitas, despesas e saldo de cada mês do intervalo"""
+    rows = db.session.query(
+        MonthlyRollup.period,
+        MonthlyRollup.transaction_type,
+        db.func.sum(MonthlyRollup.total)
+    ).filter(
+        MonthlyRollup.user_id == user_id,
+        MonthlyRollup.period >= start,
+        MonthlyRollup.period <= end
+    ).group_by(MonthlyRollup.period, MonthlyRollup.transaction_type).all()
+    
+    months = {
+        period: {'period': period, 'receitas': Decimal('0'), 'despesas': Decimal('0')}
+        for period in list_periods(start, end)
+    }
+    for period, transaction_type, total in rows:
+        key = 'receitas' if transaction_type == TransactionType.RECEITA else 'despesas'
+        months[period][key] = Decimal(str(total or 0))
+    
+    for month in months.values():
+        month['saldo'] = month['receitas'] - month['despesas']
+    return list(months.values())
+
+
+def category_breakdown(user_id, start, end, transaction_type=None):
+    """Total, quantidade e participação de cada categoria no intervalo"""
+    query = db.session.query(
+        Category,
+        db.func.sum(MonthlyRollup.total),
+        db.func.sum(MonthlyRollup.count)
+    ).join(Category, Category.id == MonthlyRollup.category_id).filter(
+        MonthlyRollup.user_id == user_id,
+        MonthlyRollup.period >= start,
+        MonthlyRollup.period <= end
+    )
+    if transaction_type:
+        query = query.filter(MonthlyRollup.transaction_type == transaction_type)
+    
+    rows = query.group_by(Category.id).all()
+    
+    totals_by_type = {}
+    for category, total, _ in rows:
+        totals_by_type[category.transaction_type] = \
+            totals_by_type.get(category.transaction_type, Decimal('0')) + Decimal(str(total or 0))
+    
+    breakdown = []
+    for category, total, count in rows:
+        total = Decimal(str(total or 0))
+        if not count:
+            continue
+        type_total = totals_by_type[category.transaction_type]
+        breakdown.append({
+            'category': category,
+            'total': total,
+            'count': int(count),
+            'share': float(total / type_total * 100) if type_total else 0.0
+        })
+    
+    breakdown.sort(key=lambda item: item['total'], reverse=True)
+    return breakdown
+
+
+def compare_periods(user_id, period, previous):
+    """Comparar o total de cada categoria entre dois meses"""
+    rows = db.session.query(
+        MonthlyRollup.category_id,
+        MonthlyRollup.period,
+        db.func.sum(MonthlyRollup.total)
+    ).filter(
+        MonthlyRollup.user_id == user_id,
+        MonthlyRollup.period.in_([period, previous])
+    ).group_by(MonthlyRollup.category_id, MonthlyRollup.period).all()
+    
+    values = {}
+    for category_id, row_period, total in rows:
+        values.setdefault(category_id, {period: Decimal('0'), previous: Decimal('0')})
+        values[category_id][row_period] = Decimal(str(total or 0))
+    
+    categories = {
+        category.id: category
+        for category in Category.query.filter(Category.id.in_(list(values)))
+    } if values else {}
+    
+    comparison = []
+    for category_id, totals in values.items():
+        current, before = totals[period], totals[previous]
+        if not current and not before:
+            continue
+        comparison.append({
+            'category': categories[category_id],
+            'current': current,
+            'previous': before,
+            'delta': current - before,
+            'delta_percent': float((current - before) / before * 100) if before else None
+        })
+    
+    comparison.sort(key=lambda item: abs(item['delta']), reverse=True)
+    return comparison
+
+
+def build_report(user_id, start, end):
+    """Montar o relatório completo do intervalo (evolução, categorias e comparação)"""
+    return {
+        'start': start,
+        'end': end,
+        'months': monthly_totals(user_id, start, end),
+        'categories': category_breakdown(user_id, start, end),
+        'comparison': compare_periods(user_id, end, shift_period(end, -1))
+    }
+
+
+def report_to_dict(report):
+    """Converter o relatório para JSON"""
+    def money(value):
+        return float(value)
+    
+    return {
+        'start': report['start'],
+        'end': report['end'],
+        'months': [
+            {key: (money(value) if key != 'period' else value) for key, value in month.items()}
+            for month in report['months']
+        ],
+        'categories': [
+            {
+                'category_id': item['category'].id,
+                'name': item['category'].name,
+                'transaction_type': item['category'].transaction_type.value,
+                'total': money(item['total']),
+                'count': item['count'],
+                'share': round(item['share'], 2)
+            }
+            for item in report['categories']
+        ],
+        'comparison': [
+            {
+                'category_id': item['category'].id,
+                'name': item['category'].name,
+                'current': money(item['current']),
+                'previous': money(item['previous']),
+                'delta': money(item['delta']),
+                'delta_percent': round(item['delta_percent'], 2) if item['delta_percent'] is not None else None
+            }
+            for item in report['comparison']
+        ]
+    }
@@ -1,37 +1,46 @@
-from flask import render_template, redirect, url_for, flash, request, jsonify
+from flask import render_template, redirect, url_for, flash, request, jsonify, abort, Response, stream_with_context
 from flask_login import login_required, current_user
 from sqlalchemy.exc import IntegrityError  # ✅ CORREÇÃO
 from app.financial import financial_bp
 from app import db
-from app.models import Category, Transaction, TransactionType
+from app.database import read_only
+from app.financial.conditional import conditional_get
+from app.models import Budget, Category, MonthlyRollup, Transaction, TransactionType
+from app.financial.ledger import apply_transaction, bump_data_version, revert_transaction
+from app.financial.summary import LazySummary, get_dashboard_summary
+from app.financial.pagination import InvalidCursor, paginate_transactions, parse_page_size
+from app.financial.search import (
+    filter_categories_by_text, filter_transactions_by_text, search_categories, search_transactions
+)
+from app.financial.validation import (
+    TransactionValidationError, validate_amount, validate_description,
+    validate_transaction_date, validate_transaction_type
+)
+from app.financial.importer import import_transactions as run_import
+from app.financial.serializers import serialize_transactions, wants_sideload, with_categories
+from app.financial.exporter import EXPORT_FORMATS, generate_export
+from app.financial.reports import build_report, current_period, report_to_dict, shift_period
+from app.financial.budgets import budget_alert, budget_status, set_budget, validate_period
 from datetime import datetime
-from decimal import Decimal
 
 @financial_bp.route('/')
 @login_required
+@conditional_get
+@read_only
 def dashboard():
     """Dashboard financeiro principal"""
-    # Obter estatísticas do usuário
-    totals = Transaction.get_totals_by_user(current_user.id)
-    
-    # Contar categorias e transações
-    total_categories = Category.query.filter_by(user_id=current_user.id).count()
-    total_transactions = Transaction.query.filter_by(user_id=current_user.id).count()
-    
-    # Últimas 5 transações
-    recent_transactions = Transaction.query.filter_by(user_id=current_user.id)\
-        .order_by(Transaction.created_at.desc()).limit(5).all()
-    
-    return render_template('financial/dashboard.html',
-                         totals=totals,
-                         total_categories=total_categories,
-                         total_transactions=total_transactions,
-                         recent_transactions=recent_transactions)
+    # Totais, contagens e últimas 5 transações em duas consultas, feitas só
+    # se os fragmentos do template não estiverem em cache
+    summary = LazySummary(current_user.id, recent_limit=5)
+    
+    return render_template('financial/dashboard.html', summary=summary)
 
 # === CRUD DE CATEGORIAS ===
 
 @financial_bp.route('/categories')
 @login_required  
+@conditional_get
+@read_only
 def categories():
     """Listar categorias do usuário"""
     # Aplicar filtros se fornecidos
@@ -41,9 +50,9 @@ def categories():
     # Query base
     query = Category.query.filter_by(user_id=current_user.id)
     
-    # Aplicar filtro de busca
+    # Aplicar filtro de busca (índice FTS; a ordenação é a da listagem)
     if search:
-        query = query.filter(Category.name.ilike(f'%{search}%'))
+        query = filter_categories_by_text(query, search)
     
     # Aplicar filtro de tipo
     if type_filter and type_filter in ['receita', 'despesa']:
@@ -56,6 +65,7 @@ def categories():
     receita_categories = [c for c in categories if c.transaction_type == TransactionType.RECEITA]
     despesa_categories = [c for c in categories if c.transaction_type == TransactionType.DESPESA]
     
+    # Uso de cada categoria vem dos contadores mantidos pelo ledger
     return render_template('financial/categories.html',
                          categories=categories,  # ✅ ADICIONADO
                          receita_categories=receita_categories,
@@ -76,7 +86,7 @@ def new_category():
         if not name:
             flash('Nome da categoria é obrigatório!', 'danger')
             return redirect(url_for('financial.new_category'))
-            
+        
         if transaction_type not in ['receita', 'despesa']:
             flash('Tipo de transação inválido!', 'danger')
             return redirect(url_for('financial.new_category'))
@@ -104,6 +114,7 @@ def new_category():
         
         try:
             db.session.add(category)
+            bump_data_version(current_user.id)
             db.session.commit()
             flash(f'Categoria "{name}" criada com sucesso!', 'success')
             return redirect(url_for('financial.categories'))
@@ -149,6 +160,7 @@ def edit_category(id):
         category.icon = icon
         
         try:
+            bump_data_version(current_user.id)
             db.session.commit()
             flash(f'Categoria "{name}" atualizada com sucesso!', 'success')
             return redirect(url_for('financial.categories'))
@@ -166,10 +178,10 @@ def delete_category(id):
     
     Args:
         id (int): ID da categoria a ser excluída
-        
+    
     Returns:
         Response: Redirecionamento para lista de categorias
-        
+    
     Raises:
         404: Se categoria não for encontrada
         400: Se categoria possui transações
@@ -185,48 +197,47 @@ def delete_category(id):
             flash('Categoria não encontrada.', 'error')
             return redirect(url_for('financial.categories'))
         
-        # Verificar se categoria possui transações
-        transaction_count = Transaction.query.filter_by(category_id=id).count()
+        # Verificar se categoria possui transações (contador mantido pelo ledger)
+        transaction_count = category.transaction_count or 0
         if transaction_count > 0:
             flash(f'Não é possível excluir a categoria "{category.name}" porque ela possui {transaction_count} transação(ões) associada(s).', 'warning')
             return redirect(url_for('financial.categories'))
         
-        # Excluir categoria
+        # Excluir categoria (e células mensais vazias que ainda a referenciem)
         category_name = category.name
+        db.session.execute(db.delete(MonthlyRollup).where(MonthlyRollup.category_id == category.id))
         db.session.delete(category)
+        bump_data_version(current_user.id)
         db.session.commit()
         
         flash(f'Categoria "{category_name}" excluída com sucesso!', 'success')
-        
+    
     except IntegrityError as e:
         db.session.rollback()
         flash('Erro de integridade: Não é possível excluir categoria com transações associadas.', 'error')
-        
+    
     except Exception as e:
         db.session.rollback()
         flash(f'Erro interno: {str(e)}', 'error')
-        
+    
     return redirect(url_for('financial.categories'))
 
 # === CRUD DE TRANSAÇÕES ===
 
-@financial_bp.route('/transactions')
-@login_required  
-def transactions():
-    """Listar transações do usuário"""
-    # Aplicar filtros
-    search = request.args.get('search', '').strip()
-    type_filter = request.args.get('type', '')
-    category_filter = request.args.get('category', '')
-    date_from = request.args.get('date_from', '')
-    date_to = request.args.get('date_to', '')
+def filter_transactions(user_id, args):
+    """Montar a query de transações do usuário com os filtros da listagem"""
+    search = args.get('search', '').strip()
+    type_filter = args.get('type', '')
+    category_filter = args.get('category', '')
+    date_from = args.get('date_from', '')
+    date_to = args.get('date_to', '')
     
     # Query base
-    query = Transaction.query.filter_by(user_id=current_user.id)
+    query = Transaction.query.filter_by(user_id=user_id)
     
-    # Aplicar filtro de busca
+    # Aplicar filtro de busca (descrição e observações, via índice FTS)
     if search:
-        query = query.filter(Transaction.description.ilike(f'%{search}%'))
+        query = filter_transactions_by_text(query, search)
     
     # Aplicar filtro de tipo
     if type_filter and type_filter in ['receita', 'despesa']:
@@ -251,19 +262,45 @@ def transactions():
         except ValueError:
             pass
     
-    # Obter transações
-    transactions = query.order_by(Transaction.transaction_date.desc(), Transaction.created_at.desc()).all()
+    return query
+
+@financial_bp.route('/transactions')
+@login_required  
+@conditional_get
+@read_only
+def transactions():
+    """Listar transações do usuário (paginado por cursor)"""
+    filtered = filter_transactions(current_user.id, request.args)
+    query = with_categories(filtered)
+    
+    # Obter a página atual; cursor inválido volta para a primeira página
+    try:
+        transactions, next_cursor = paginate_transactions(query, request.args.get('cursor'))
+    except InvalidCursor:
+        transactions, next_cursor = paginate_transactions(query)
+    
+    # Filtros atuais, para montar o link da próxima página
+    filters = {key: value for key, value in request.args.items() if key != 'cursor' and value}
     
     # Obter categorias para filtro
     categories = Category.query.filter_by(user_id=current_user.id).order_by(Category.name).all()
     
-    # Obter totais
-    totals = Transaction.get_totals_by_user(current_user.id)
+    # Obter totais e quantidade de transações
+    summary = get_dashboard_summary(current_user.id, recent_limit=0)
+    
+    # O card "Total" conta as transações que atendem aos filtros (a página
+    # mostra só parte delas); sem filtros, vale o contador consolidado
+    total_transactions = summary['total_transactions']
+    if filters:
+        total_transactions = filtered.order_by(None).count()
     
     return render_template('financial/transactions.html',
                          transactions=transactions,
+                         next_cursor=next_cursor,
+                         filters=filters,
                          categories=categories,
-                         totals=totals) 
+                         totals=summary['totals'],
+                         total_transactions=total_transactions) 
 
 @financial_bp.route('/transactions/new', methods=['GET', 'POST'])
 @login_required
@@ -277,32 +314,19 @@ def new_transaction():
         transaction_date = request.form.get('transaction_date')
         notes = request.form.get('notes', '').strip()
         
-        # Validações
-        if not description:
-            flash('Descrição é obrigatória!', 'danger')
-            return redirect(url_for('financial.new_transaction'))
-            
-        if not amount:
-            flash('Valor é obrigatório!', 'danger')
-            return redirect(url_for('financial.new_transaction'))
-            
+        # Validações (mesmas regras da importação em lote)
         try:
-            amount = Decimal(amount)
-            if amount <= 0:
-                flash('Valor deve ser maior que zero!', 'danger')
-                return redirect(url_for('financial.new_transaction'))
-        except:
-            flash('Valor inválido!', 'danger')
-            return redirect(url_for('financial.new_transaction'))
-            
-        if transaction_type not in ['receita', 'despesa']:
-            flash('Tipo de transação inválido!', 'danger')
+            description = validate_description(description)
+            amount = validate_amount(amount)
+            validate_transaction_type(transaction_type)
+        except TransactionValidationError as e:
+            flash(str(e), 'danger')
             return redirect(url_for('financial.new_transaction'))
-            
+        
         if not category_id or not category_id.isdigit():
             flash('Categoria é obrigatória!', 'danger')
             return redirect(url_for('financial.new_transaction'))
-            
+        
         # Verificar se categoria pertence ao usuário
         category = Category.query.filter_by(
             id=int(category_id), 
@@ -313,15 +337,11 @@ def new_transaction():
         if not category:
             flash('Categoria inválida!', 'danger')
             return redirect(url_for('financial.new_transaction'))
-            
-        if not transaction_date:
-            flash('Data da transação é obrigatória!', 'danger')
-            return redirect(url_for('financial.new_transaction'))
-            
+        
         try:
-            transaction_date = datetime.strptime(transaction_date, '%Y-%m-%d').date()
-        except:
-            flash('Data inválida!', 'danger')
+            transaction_date = validate_transaction_date(transaction_date)
+        except TransactionValidationError as e:
+            flash(str(e), 'danger')
             return redirect(url_for('financial.new_transaction'))
         
         # Criar transação
@@ -337,8 +357,12 @@ def new_transaction():
         
         try:
             db.session.add(transaction)
+            apply_transaction(transaction)
+            alert = budget_alert(transaction, category.name)
             db.session.commit()
             flash(f'Transação "{description}" criada com sucesso!', 'success')
+            if alert:
+                flash(*alert)
             return redirect(url_for('financial.transactions'))
         except Exception as e:
             db.session.rollback()
@@ -361,48 +385,49 @@ def edit_transaction(id):
         transaction_date = request.form.get('transaction_date')
         notes = request.form.get('notes', '').strip()
         
-        # Validações (mesmo código da criação)
-        if not description:
-            flash('Descrição é obrigatória!', 'danger')
-            return redirect(url_for('financial.edit_transaction', id=id))
-            
+        # Validações (mesmas regras da criação e da importação em lote)
         try:
-            amount = Decimal(amount)
-            if amount <= 0:
-                flash('Valor deve ser maior que zero!', 'danger')
-                return redirect(url_for('financial.edit_transaction', id=id))
-        except:
-            flash('Valor inválido!', 'danger')
+            description = validate_description(description)
+            amount = validate_amount(amount)
+            transaction_type = validate_transaction_type(transaction_type)
+            transaction_date = validate_transaction_date(transaction_date)
+        except TransactionValidationError as e:
+            flash(str(e), 'danger')
             return redirect(url_for('financial.edit_transaction', id=id))
-            
+        
+        if not category_id or not category_id.isdigit():
+            flash('Categoria é obrigatória!', 'danger')
+            return redirect(url_for('financial.edit_transaction', id=id))
+        
         # Verificar categoria
         category = Category.query.filter_by(
             id=int(category_id), 
             user_id=current_user.id,
-            transaction_type=TransactionType(transaction_type)
+            transaction_type=transaction_type
         ).first()
         
         if not category:
             flash('Categoria inválida!', 'danger')
             return redirect(url_for('financial.edit_transaction', id=id))
-            
-        try:
-            transaction_date = datetime.strptime(transaction_date, '%Y-%m-%d').date()
-        except:
-            flash('Data inválida!', 'danger')
-            return redirect(url_for('financial.edit_transaction', id=id))
-        
-        # Atualizar transação
-        transaction.description = description
-        transaction.amount = amount
-        transaction.transaction_type = TransactionType(transaction_type)
-        transaction.category_id = category.id
-        transaction.transaction_date = transaction_date
-        transaction.notes = notes
         
         try:
+            # Estornar os valores antigos dos totais antes de atualizar
+            revert_transaction(transaction)
+            
+            # Atualizar transação
+            transaction.description = description
+            transaction.amount = amount
+            transaction.transaction_type = transaction_type
+            transaction.category_id = category.id
+            transaction.transaction_date = transaction_date
+            transaction.notes = notes
+            
+            apply_transaction(transaction)
+            alert = budget_alert(transaction, category.name)
             db.session.commit()
             flash(f'Transação "{description}" atualizada com sucesso!', 'success')
+            if alert:
+                flash(*alert)
             return redirect(url_for('financial.transactions'))
         except Exception as e:
             db.session.rollback()
@@ -410,10 +435,96 @@ def edit_transaction(id):
     
     return render_template('financial/transaction_form.html', transaction=transaction)
 
+@financial_bp.route('/transactions/import', methods=['GET', 'POST'])
+@login_required
+def import_transactions():
+    """Importar extrato bancário (CSV ou OFX) em lote"""
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            flash('Selecione um arquivo para importar!', 'danger')
+            return redirect(url_for('financial.import_transactions'))
+        
+        file_format = 'ofx' if upload.filename.lower().endswith('.ofx') else 'csv'
+        
+        try:
+            result = run_import(current_user.id, upload, file_format)
+        except TransactionValidationError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('financial.import_transactions'))
+        except Exception as e:
+            flash('Erro ao importar arquivo. Tente novamente.', 'danger')
+            return redirect(url_for('financial.import_transactions'))
+        
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify(result.to_dict())
+        
+        if result.imported:
+            flash(f'{result.imported} transação(ões) importada(s) com sucesso!', 'success')
+        if result.error_count:
+            flash(f'{result.error_count} linha(s) ignorada(s) por erro.', 'warning')
+        return render_template('financial/import.html', result=result)
+    
+    return render_template('financial/import.html', result=None)
+
+@financial_bp.route('/transactions/export.<file_format>')
+@login_required
+@read_only
+def export_transactions(file_format):
+    """Exportar transações (com os filtros da listagem) em CSV ou NDJSON"""
+    if file_format not in EXPORT_FORMATS:
+        abort(404)
+    
+    query = filter_transactions(current_user.id, request.args)
+    filename = f'coinctrl-transacoes-{datetime.utcnow():%Y%m%d}.{file_format}'
+    
+    return Response(
+        stream_with_context(generate_export(query, file_format)),
+        content_type=EXPORT_FORMATS[file_format],
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+# === RELATÓRIOS ===
+
+MAX_REPORT_MONTHS = 120
+
+def parse_report_range(args):
+    """Ler o intervalo do relatório ('AAAA-MM'); padrão: últimos 6 meses"""
+    end = args.get('end', '') or current_period()
+    try:
+        datetime.strptime(end, '%Y-%m')
+        start = args.get('start', '') or shift_period(end, -5)
+        datetime.strptime(start, '%Y-%m')
+    except ValueError:
+        return None
+    
+    if start > end or start < shift_period(end, -(MAX_REPORT_MONTHS - 1)):
+        return None
+    return start, end
+
+@financial_bp.route('/reports')
+@login_required
+@conditional_get
+@read_only
+def reports():
+    """Relatórios mensais e por categoria"""
+    period_range = parse_report_range(request.args)
+    if period_range is None:
+        flash('Período inválido! Use o formato AAAA-MM (máximo de 10 anos).', 'warning')
+        return redirect(url_for('financial.reports'))
+    
+    report = build_report(current_user.id, *period_range)
+    return render_template('financial/reports.html', report=report)
+
 # === API ENDPOINTS ===
 
 @financial_bp.route('/api/categories/<transaction_type>')
 @login_required
+@conditional_get
+@read_only
 def api_categories_by_type(transaction_type):
     """API para obter categorias por tipo"""
     if transaction_type not in ['receita', 'despesa']:
@@ -431,6 +542,132 @@ def api_categories_by_type(transaction_type):
         'color': cat.color
     } for cat in categories])
 
+@financial_bp.route('/api/transactions')
+@login_required
+@conditional_get
+@read_only
+def api_transactions():
+    """API para listar transações paginadas por cursor"""
+    query = with_categories(filter_transactions(current_user.id, request.args))
+    page_size = parse_page_size(request.args.get('limit'))
+    
+    try:
+        transactions, next_cursor = paginate_transactions(
+            query, request.args.get('cursor'), page_size
+        )
+    except InvalidCursor:
+        return jsonify({'error': 'Cursor inválido'}), 400
+    
+    data = serialize_transactions(transactions, sideload=wants_sideload(request.args))
+    data['next_cursor'] = next_cursor
+    return jsonify(data)
+
+@financial_bp.route('/api/search')
+@login_required
+@conditional_get
+@read_only
+def api_search():
+    """API de busca textual em transações e categorias, por relevância"""
+    term = request.args.get('q', '').strip()
+    if not term:
+        return jsonify({'error': 'Informe o termo de busca'}), 400
+    
+    limit = parse_page_size(request.args.get('limit'), default=20)
+    
+    transactions = with_categories(search_transactions(
+        Transaction.query.filter_by(user_id=current_user.id), term, limit
+    )).all()
+    categories = search_categories(
+        Category.query.filter_by(user_id=current_user.id), term
+    ).limit(limit).all()
+    
+    data = serialize_transactions(transactions, sideload=wants_sideload(request.args))
+    data['matching_categories'] = [c.to_dict() for c in categories]
+    return jsonify(data)
+
+@financial_bp.route('/api/reports')
+@login_required
+@conditional_get
+@read_only
+def api_reports():
+    """API de relatórios mensais e por categoria"""
+    period_range = parse_report_range(request.args)
+    if period_range is None:
+        return jsonify({'error': 'Período inválido'}), 400
+    
+    return jsonify(report_to_dict(build_report(current_user.id, *period_range)))
+
+@financial_bp.route('/api/insights')
+@login_required
+@conditional_get
+@read_only
+def api_insights():
+    """API de indicadores de fluxo de caixa (médias móveis, variações, outliers)"""
+    try:
+        from app.financial.analytics import compute_insights, load_arrays
+    except ImportError:
+        return jsonify({'error': 'NumPy não instalado. Execute: pip install numpy'}), 503
+    
+    window = request.args.get('window', 3, type=int)
+    months = request.args.get('months', 12, type=int)
+    burn_days = request.args.get('burn_days', 90, type=int)
+    if not (1 <= window <= 24 and 1 <= months <= 120 and 1 <= burn_days <= 730):
+        return jsonify({'error': 'Parâmetros inválidos'}), 400
+    
+    insights = compute_insights(
+        load_arrays(current_user.id),
+        window=window,
+        months=months,
+        burn_days=burn_days
+    )
+    return jsonify(insights)
+
+@financial_bp.route('/api/budgets')
+@login_required
+@conditional_get
+@read_only
+def api_budgets():
+    """API de status dos orçamentos do mês (lê apenas os contadores)"""
+    try:
+        period = validate_period(request.args.get('period'))
+    except TransactionValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify(budget_status(current_user.id, period))
+
+@financial_bp.route('/api/budgets', methods=['POST'])
+@login_required
+def api_set_budget():
+    """API para criar ou alterar o orçamento de uma categoria no mês"""
+    data = request.get_json(silent=True) or request.form
+    try:
+        budget, created = set_budget(
+            current_user.id,
+            data.get('category_id'),
+            str(data.get('amount', '')),
+            data.get('period')
+        )
+        bump_data_version(current_user.id)
+        db.session.commit()
+    except TransactionValidationError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify(budget.to_dict()), 201 if created else 200
+
+@financial_bp.route('/api/budgets/<int:id>', methods=['DELETE'])
+@login_required
+def api_delete_budget(id):
+    """API para excluir um orçamento"""
+    budget = Budget.query.filter_by(id=id, user_id=current_user.id).first()
+    if budget is None:
+        return jsonify({'error': 'Orçamento não encontrado'}), 404
+    
+    db.session.delete(budget)
+    bump_data_version(current_user.id)
+    db.session.commit()
+    return '', 204
+
 @financial_bp.route('/transactions/<int:id>/delete', methods=['POST', 'DELETE'])
 @login_required
 def delete_transaction(id):
@@ -443,13 +680,14 @@ def delete_transaction(id):
             return redirect(url_for('financial.transactions'))
         
         transaction_desc = transaction.description
+        revert_transaction(transaction)
         db.session.delete(transaction)
         db.session.commit()
         
         flash(f'Transação "{transaction_desc}" excluída com sucesso!', 'success')
-        
+    
     except Exception as e:
         db.session.rollback()
         flash(f'Erro ao excluir transação: {str(e)}', 'error')
-        
+    
     return redirect(url_for('financial.transactions'))
\ No newline at end of file
@@ -0,0 +1,167 @@
+# app/financial/search.py
+"""Busca textual com índice FTS5 (SQLite) sobre transações e categorias.
+
+As tabelas virtuais usam conteúdo externo (as próprias tabelas
+``transactions`` e ``categories``) e são mantidas por triggers, então
+nenhuma rota precisa atualizá-las. O tokenizer ``unicode61`` com
+``remove_diacritics 2`` faz com que "alimentacao" encontre "alimentação".
+Em outros bancos a busca volta a usar ``ILIKE``.
+"""
+import re
+from sqlalchemy import event
+from app import db
+from app.models import Category, Transaction
+
+TOKENIZER = "unicode61 remove_diacritics 2"
+
+TRANSACTIONS_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, notes,
+        content='transactions', content_rowid='id',
+        tokenize="{TOKENIZER}"
+    )""",
+    # Descrição pesa mais que observações na ordenação por relevância
+    "INSERT INTO transactions_fts(transactions_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description, notes ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+        INSERT INTO transactions_fts(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END""",
+]
+
+CATEGORIES_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS categories_fts USING fts5(
+        name,
+        content='categories', content_rowid='id',
+        tokenize="{TOKENIZER}"
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS categories_fts_ai AFTER INSERT ON categories BEGIN
+        INSERT INTO categories_fts(rowid, name) VALUES (new.id, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS categories_fts_ad AFTER DELETE ON categories BEGIN
+        INSERT INTO categories_fts(categories_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS categories_fts_au AFTER UPDATE OF name ON categories BEGIN
+        INSERT INTO categories_fts(categories_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO categories_fts(rowid, name) VALUES (new.id, new.name);
+    END""",
+]
+
+# DDL do db.create_all (after_create) e do rebuild-search-index. A migração 2b3c4d5e6f02
+# tem sua própria cópia fixa: mudar o esquema FTS aqui pede uma nova revisão.
+FTS_DDL = TRANSACTIONS_FTS_DDL + CATEGORIES_FTS_DDL
+
+# Reindexar o conteúdo já gravado nas tabelas de origem
+FTS_REBUILD = [
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+    "INSERT INTO categories_fts(categories_fts) VALUES ('rebuild')",
+]
+
+# Tabelas virtuais, para montar as consultas sem SQL solto nas rotas
+transactions_fts = db.table('transactions_fts', db.column('rowid'), db.column('rank'),
+                            db.column('transactions_fts'))
+categories_fts = db.table('categories_fts', db.column('rowid'), db.column('rank'),
+                          db.column('categories_fts'))
+
+
+def _register_ddl(table, statements):
+    for statement in statements:
+        event.listen(table, 'after_create', db.DDL(statement).execute_if(dialect='sqlite'))
+
+
+_register_ddl(Transaction.__table__, TRANSACTIONS_FTS_DDL)
+_register_ddl(Category.__table__, CATEGORIES_FTS_DDL)
+
+
+def fts_enabled():
+    """Verificar se o banco atual suporta o índice FTS5"""
+    return db.engine.dialect.name == 'sqlite'
+
+
+def build_match_query(term):
+    """Converter o texto digitado em uma expressão MATCH segura
+    
+    Cada palavra vira um termo entre aspas com busca por prefixo, e todas
+    precisam aparecer (AND implícito). Retorna None se não houver palavras.
+    """
+    tokens = re.findall(r'\w+', term, flags=re.UNICODE)
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def filter_transactions_by_text(query, term):
+    """Restringir a query de transações às que casam com o texto buscado"""
+    if not fts_enabled():
+        return query.filter(db.or_(
+            Transaction.description.ilike(f'%{term}%'),
+            Transaction.notes.ilike(f'%{term}%')
+        ))
+    
+    match = build_match_query(term)
+    if match is None:
+        return query.filter(db.false())
+    
+    matching_ids = db.select(transactions_fts.c.rowid)\
+        .where(transactions_fts.c.transactions_fts.match(match))
+    return query.filter(Transaction.id.in_(matching_ids))
+
+
+def search_transactions(query, term, limit=20):
+    """Buscar transações ordenadas por relevância (bm25)"""
+    if not fts_enabled():
+        return filter_transactions_by_text(query, term)\
+            .order_by(Transaction.transaction_date.desc()).limit(limit)
+    
+    match = build_match_query(term)
+    if match is None:
+        return query.filter(db.false())
+    
+    return query.join(transactions_fts, transactions_fts.c.rowid == Transaction.id)\
+        .filter(transactions_fts.c.transactions_fts.match(match))\
+        .order_by(transactions_fts.c.rank)\
+        .limit(limit)
+
+
+def filter_categories_by_text(query, term):
+    """Restringir a query de categorias ao texto buscado (sem alterar a ordenação)"""
+    if not fts_enabled():
+        return query.filter(Category.name.ilike(f'%{term}%'))
+    
+    match = build_match_query(term)
+    if match is None:
+        return query.filter(db.false())
+    
+    matching_ids = db.select(categories_fts.c.rowid)\
+        .where(categories_fts.c.categories_fts.match(match))
+    return query.filter(Category.id.in_(matching_ids))
+
+
+def search_categories(query, term):
+    """Buscar categorias ordenadas por relevância (bm25)"""
+    if not fts_enabled():
+        return filter_categories_by_text(query, term).order_by(Category.name)
+    
+    match = build_match_query(term)
+    if match is None:
+        return query.filter(db.false())
+    
+    return query.join(categories_fts, categories_fts.c.rowid == Category.id)\
+        .filter(categories_fts.c.categories_fts.match(match))\
+        .order_by(categories_fts.c.rank)
+
+
+def rebuild_search_index():
+    """Reconstruir os índices FTS a partir das tabelas de origem"""
+    for statement in FTS_DDL + FTS_REBUILD:
+        db.session.execute(db.text(statement))
+    db.session.commit()
@@ -0,0 +1,42 @@
+# app/financial/serializers.py
+"""Serialização de listas de transações para as APIs JSON"""
+from sqlalchemy.orm import selectinload
+from app.models import Transaction
+
+
+def with_categories(query):
+    """Carregar as categorias das transações em uma única consulta extra (IN)"""
+    return query.options(selectinload(Transaction.category))
+
+
+def serialize_transactions(transactions, sideload=True):
+    """Serializar transações, enviando cada categoria uma única vez
+    
+    Args:
+        transactions (list): Transações (de preferência com a categoria já carregada)
+        sideload (bool): Se True, as categorias vão em uma lista separada e
+            cada transação traz apenas category_id; se False, a categoria é
+            embutida em cada transação (formato de Transaction.to_dict()).
+            
+    Returns:
+        dict: {'transactions': [...]} e, com sideload, {'categories': [...]}
+    """
+    if not sideload:
+        return {'transactions': [t.to_dict() for t in transactions]}
+    
+    categories = {}
+    items = []
+    for transaction in transactions:
+        items.append(transaction.to_dict(include_category=False))
+        if transaction.category_id not in categories and transaction.category:
+            categories[transaction.category_id] = transaction.category.to_dict()
+    
+    return {
+        'transactions': items,
+        'categories': list(categories.values())
+    }
+
+
+def wants_sideload(args):
+    """Respostas usam sideload por padrão; ?embed=category embute a categoria"""
+    return args.get('embed') != 'category'
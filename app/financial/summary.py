@@ -0,0 +1,76 @@
+# app/financial/summary.py
+"""Resumo financeiro dos dashboards em no máximo duas consultas"""
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models import Category, Transaction, UserBalance
+from app.financial.ledger import rebuild_user
+
+
+def recent_transactions_query(user_id, limit=5):
+    """Query das últimas transações criadas pelo usuário, com a categoria"""
+    return Transaction.query.filter_by(user_id=user_id)\
+        .options(joinedload(Transaction.category))\
+        .order_by(Transaction.created_at.desc())\
+        .limit(limit)
+
+
+class LazySummary:
+    """Resumo do dashboard calculado só no primeiro acesso a um atributo
+    
+    Com os fragmentos do template em cache, nenhum atributo é lido e as
+    consultas não são feitas.
+    """
+    
+    def __init__(self, user_id, recent_limit=5):
+        self.user_id = user_id
+        self.recent_limit = recent_limit
+        self._data = None
+    
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if self._data is None:
+            self._data = get_dashboard_summary(self.user_id, self.recent_limit)
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def get_dashboard_summary(user_id, recent_limit=5):
+    """Obter totais, contagens e últimas transações do usuário
+    
+    Args:
+        user_id (int): ID do usuário
+        recent_limit (int): Quantidade de transações recentes (0 para não buscar)
+    
+    Returns:
+        dict: totals, total_categories, total_transactions e recent_transactions
+    """
+    # 1ª consulta: saldo consolidado + contagem de categorias em um único SELECT
+    category_count = db.select(db.func.count(Category.id))\
+        .where(Category.user_id == user_id)\
+        .scalar_subquery()
+    
+    row = db.session.query(UserBalance, category_count)\
+        .filter(UserBalance.user_id == user_id).first()
+    
+    if row is None:
+        # Usuário ainda sem saldo consolidado (ocorre apenas uma vez)
+        balance = rebuild_user(user_id)
+        db.session.commit()
+        total_categories = Category.query.filter_by(user_id=user_id).count()
+    else:
+        balance, total_categories = row
+    
+    # 2ª consulta: últimas transações com a categoria carregada no mesmo SELECT
+    recent_transactions = []
+    if recent_limit:
+        recent_transactions = recent_transactions_query(user_id, recent_limit).all()
+    
+    return {
+        'totals': balance.to_totals(),
+        'total_categories': total_categories,
+        'total_transactions': balance.transaction_count,
+        'recent_transactions': recent_transactions
+    }
@@ -0,0 +1,56 @@
+# app/financial/validation.py
+"""Regras de validação de transações compartilhadas entre formulário e importação"""
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from app.models import TransactionType
+
+
+class TransactionValidationError(ValueError):
+    """Campo de transação inválido; a mensagem é exibida ao usuário"""
+
+
+def validate_description(description):
+    """Validar descrição obrigatória"""
+    description = (description or '').strip()
+    if not description:
+        raise TransactionValidationError('Descrição é obrigatória!')
+    return description
+
+
+def validate_amount(amount):
+    """Converter valor para Decimal positivo"""
+    if isinstance(amount, str):
+        amount = amount.strip()
+    if amount is None or amount == '':
+        raise TransactionValidationError('Valor é obrigatório!')
+    
+    try:
+        amount = Decimal(amount)
+    except (InvalidOperation, TypeError, ValueError):
+        raise TransactionValidationError('Valor inválido!')
+    
+    if not amount.is_finite():
+        raise TransactionValidationError('Valor inválido!')
+    if amount <= 0:
+        raise TransactionValidationError('Valor deve ser maior que zero!')
+    return amount
+
+
+def validate_transaction_type(transaction_type):
+    """Converter tipo ('receita'/'despesa') para TransactionType"""
+    if transaction_type not in ['receita', 'despesa']:
+        raise TransactionValidationError('Tipo de transação inválido!')
+    return TransactionType(transaction_type)
+
+
+def validate_transaction_date(transaction_date, formats=('%Y-%m-%d',)):
+    """Converter data da transação (aceita os formatos informados, em ordem)"""
+    if not transaction_date:
+        raise TransactionValidationError('Data da transação é obrigatória!')
+    
+    for date_format in formats:
+        try:
+            return datetime.strptime(transaction_date.strip(), date_format).date()
+        except ValueError:
+            continue
+    raise TransactionValidationError('Data inválida!')
@@ -0,0 +1,253 @@
+# app/fragments.py
+"""Cache de fragmentos de template por usuário e versão dos dados.
+
+Nos templates::
+
+    {% cache 'dashboard-cards' %} ... {% endcache %}
+    {% cache 'report', period %} ... {% endcache %}
+
+A chave combina o nome, os argumentos extras, o usuário logado, a versão
+dos dados dele (``UserDataVersion``, a mesma dos ETags) e a impressão
+digital do código/templates. Qualquer escrita do usuário muda a versão, de
+modo que as entradas antigas nunca são lidas de novo e saem do cache pelo
+LRU. Para que um acerto não faça consultas, a view deve passar os dados de
+forma preguiçosa (ver ``LazySummary`` em ``app.financial.summary``).
+
+Armazenamento (``FRAGMENT_CACHE``): ``'memory'`` (LRU por processo,
+limitado em bytes), ``'sqlite:///caminho'`` (compartilhado entre os
+workers da mesma máquina) ou ``''`` para desativar.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, has_request_context
+from flask_login import current_user
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+class MemoryFragmentStore:
+    """LRU em memória limitado pelo tamanho total (bytes UTF-8) dos fragmentos"""
+    
+    def __init__(self, max_bytes=8 * 1024 * 1024, ttl=3600):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+    
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+    
+    def after_fork(self):
+        self._lock = threading.Lock()
+
+
+class SQLiteFragmentStore:
+    """Fragmentos em um arquivo SQLite compartilhado entre workers da máquina"""
+    
+    PRUNE_EVERY = 100  # gravações entre limpezas
+    
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, ttl=3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._writes = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS fragments ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, '
+            'expires_at REAL NOT NULL, used_at REAL NOT NULL)'
+        )
+    
+    def _connect(self):
+        # Uma conexão por thread (e por processo, já que é criada sob demanda)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    def get(self, key):
+        now = time.time()
+        row = self._connect().execute(
+            'SELECT value FROM fragments WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key, value):
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO fragments (key, value, size, expires_at, used_at) '
+            'VALUES (?, ?, ?, ?, ?)', (key, value, size, now + self.ttl, now)
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune(now)
+    
+    def prune(self, now=None):
+        """Apagar expirados e, acima do limite de bytes, os gravados há mais tempo"""
+        conn = self._connect()
+        conn.execute('DELETE FROM fragments WHERE expires_at <= ?', (now or time.time(),))
+        total = conn.execute('SELECT coalesce(sum(size), 0) FROM fragments').fetchone()[0]
+        if total > self.max_bytes:
+            conn.execute(
+                'DELETE FROM fragments WHERE key IN ('
+                ' SELECT key FROM ('
+                '  SELECT key, size, sum(size) OVER (ORDER BY used_at, key) AS running FROM fragments'
+                ' ) WHERE running - size < ?)',
+                (total - self.max_bytes,)
+            )
+    
+    def __len__(self):
+        return self._connect().execute('SELECT count(*) FROM fragments').fetchone()[0]
+    
+    def clear(self):
+        self._connect().execute('DELETE FROM fragments')
+    
+    def after_fork(self):
+        # A conexão herdada não é fechada aqui: ela ainda pertence ao processo pai
+        self._local = threading.local()
+
+
+def create_store(url, max_bytes, ttl):
+    """Criar o armazenamento a partir de FRAGMENT_CACHE ('memory', 'sqlite:///caminho' ou '')"""
+    if not url:
+        return None
+    if url == 'memory':
+        return MemoryFragmentStore(max_bytes, ttl)
+    if url.startswith('sqlite:///'):
+        return SQLiteFragmentStore(url[len('sqlite:///'):], max_bytes, ttl)
+    raise ValueError(f'Backend de cache de fragmentos desconhecido: {url}')
+
+
+class FragmentCache:
+    """Cache de fragmentos de template, com contadores de acerto"""
+    
+    def __init__(self):
+        self.store = None
+        self.hits = 0
+        self.misses = 0
+    
+    def init_app(self, app):
+        """Configurar a partir de FRAGMENT_CACHE_* e registrar a tag {% cache %}"""
+        self.store = create_store(
+            app.config.get('FRAGMENT_CACHE', 'memory'),
+            app.config.get('FRAGMENT_CACHE_MAX_BYTES', 8 * 1024 * 1024),
+            app.config.get('FRAGMENT_CACHE_TTL', 3600)
+        )
+        app.extensions['fragment_cache'] = self
+        extensions = list(app.jinja_options.get('extensions', ()))
+        app.jinja_options = {**app.jinja_options, 'extensions': extensions + [FragmentCacheExtension]}
+    
+    def key(self, name, args):
+        """Chave do fragmento para o usuário atual, ou None (anônimo: sem cache)"""
+        if not has_request_context() or not current_user.is_authenticated:
+            return None
+        from app.financial.conditional import current_data_version
+        
+        user_id = current_user.id
+        salt = current_app.config.get('ETAG_SALT', '')
+        extra = ':'.join(str(arg) for arg in args)
+        return f'{name}:u{user_id}:v{current_data_version(user_id)}:{salt}:{extra}'
+    
+    def render(self, name, args, caller):
+        """Fragmento em cache ou renderizado agora (e guardado)"""
+        key = self.key(name, args) if self.store is not None else None
+        if key is None:
+            return caller()
+        
+        value = self.store.get(key)
+        if value is not None:
+            self.hits += 1
+            return Markup(value)
+        self.misses += 1
+        value = caller()
+        self.store.set(key, str(value))
+        return value
+    
+    def clear(self):
+        """Esvaziar o cache e zerar os contadores"""
+        if self.store is not None:
+            self.store.clear()
+        self.hits = self.misses = 0
+    
+    def stats(self):
+        """Contadores de acerto/erro e tamanho atual"""
+        return {
+            'entries': len(self.store) if self.store is not None else 0,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+    
+    def after_fork(self):
+        if self.store is not None:
+            self.store.after_fork()
+
+
+fragment_cache = FragmentCache()
+
+
+class FragmentCacheExtension(Extension):
+    """Tag ``{% cache nome[, args...] %}...{% endcache %}`` do Jinja"""
+    
+    tags = {'cache'}
+    
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        name = parser.parse_expression()
+        args = []
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_render', [name, nodes.List(args)]), [], [], body
+        ).set_lineno(lineno)
+    
+    @staticmethod
+    def _render(name, args, caller):
+        return fragment_cache.render(name, args, caller)
@@ -2,7 +2,9 @@
 from flask import render_template, redirect, url_for
 from flask_login import login_required, current_user
 from app.main import main_bp
-from app.models import Transaction
+from app.database import read_only
+from app.financial.conditional import conditional_get
+from app.financial.summary import LazySummary
 
 @main_bp.route('/')
 def index():
@@ -44,13 +46,13 @@ def index():
 
 @main_bp.route('/dashboard')
 @login_required
+@conditional_get
+@read_only
 def dashboard():
     """Dashboard principal do usuário"""
-    # Obter estatísticas financeiras básicas
-    totals = Transaction.get_totals_by_user(current_user.id)
-    total_transactions = Transaction.query.filter_by(user_id=current_user.id).count()
+    # Estatísticas financeiras básicas (uma consulta, só sem fragmento em cache)
+    summary = LazySummary(current_user.id, recent_limit=0)
     
     return render_template('dashboard.html', 
                          user=current_user,
-                         totals=totals,
-                         total_transactions=total_transactions)
\ No newline at end of file
+                         summary=summary)
\ No newline at end of file
@@ -0,0 +1,279 @@
+# app/metrics.py
+"""Instrumentação por requisição: consultas SQL, tempo de banco e de template.
+
+Eventos dos engines (``before/after_cursor_execute``) e os sinais de
+renderização do Flask acumulam, em ``g``, o número de consultas, o tempo
+gasto no banco e o tempo de template de cada requisição. Ao final, os
+valores vão para histogramas por endpoint expostos em ``/metrics`` no
+formato texto do Prometheus e, no modo debug ou com ``SERVER_TIMING``, para
+o cabeçalho ``Server-Timing`` (visível no DevTools do navegador).
+
+Os dois revelam detalhes internos (endpoints, tempos de banco), então
+``/metrics`` só é registrada com ``METRICS_TOKEN`` definido e o cabeçalho
+fica desligado em produção por padrão.
+
+O custo por requisição é de alguns ``perf_counter()`` e uma atualização de
+histograma sob lock. Os números são por processo: com vários workers
+gunicorn, cada scrape lê o worker que atendeu a requisição.
+"""
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from flask import before_render_template, current_app, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+
+# Limites superiores (segundos / consultas) dos buckets dos histogramas
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+HISTOGRAMS = {
+    'coinctrl_request_duration_seconds': ('Latência total da requisição', DURATION_BUCKETS),
+    'coinctrl_db_duration_seconds': ('Tempo gasto em consultas SQL por requisição', DURATION_BUCKETS),
+    'coinctrl_template_duration_seconds': ('Tempo de renderização de templates por requisição', DURATION_BUCKETS),
+    'coinctrl_db_queries': ('Consultas SQL por requisição', QUERY_BUCKETS),
+}
+
+
+class Histogram:
+    """Histograma com buckets fixos (contagens não cumulativas)"""
+    
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+    
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # último = +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def cumulative(self):
+        """Pares (le, contagem acumulada), como o Prometheus espera"""
+        total = 0
+        for bound, count in zip(self.bounds + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RequestMetrics:
+    """Coleta por requisição e agregação por endpoint"""
+    
+    def __init__(self):
+        self.enabled = True
+        self.server_timing = False
+        self._histograms = {}
+        self._responses = {}
+        self._lock = threading.Lock()
+        self._engines = set()
+        self._listening = False
+    
+    def init_app(self, app):
+        """Configurar a partir de METRICS_* / SERVER_TIMING e registrar hooks e rota"""
+        from app import db
+        
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        self.server_timing = app.config.get('SERVER_TIMING', False)
+        app.extensions['request_metrics'] = self
+        if not self.enabled:
+            return
+        
+        with app.app_context():
+            engines = list(db.engines.values())
+        if 'db_read_engine' in app.extensions:
+            engines.append(app.extensions['db_read_engine'])
+        for engine in engines:
+            self.instrument_engine(engine)
+        self._listen_templates()
+        
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        path = app.config.get('METRICS_PATH', '/metrics')
+        if app.config.get('METRICS_TOKEN'):
+            app.add_url_rule(path, 'metrics', self.metrics_view)
+        else:
+            app.logger.info('METRICS_TOKEN não definido: %s desativado', path)
+    
+    def instrument_engine(self, engine):
+        """Contar consultas e tempo de banco do engine (uma vez por engine)"""
+        if engine in self._engines:
+            return
+        event.listen(engine, 'before_cursor_execute', self._before_cursor)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor)
+        self._engines.add(engine)
+    
+    def _listen_templates(self):
+        if self._listening:
+            return
+        before_render_template.connect(self._before_render)
+        template_rendered.connect(self._after_render)
+        self._listening = True
+    
+    # Coleta (por requisição, em g)
+    
+    @staticmethod
+    def _before_cursor(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.metrics_started = time.perf_counter()
+    
+    @staticmethod
+    def _after_cursor(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, 'metrics_started', None)
+        if started is not None and has_request_context() and 'metrics_started' in g:
+            g.metrics_queries += 1
+            g.metrics_db += time.perf_counter() - started
+    
+    @staticmethod
+    def _before_render(sender, template, context, **extra):
+        if has_request_context() and 'metrics_started' in g:
+            g.metrics_render_started = time.perf_counter()
+    
+    @staticmethod
+    def _after_render(sender, template, context, **extra):
+        started = g.pop('metrics_render_started', None) if has_request_context() else None
+        if started is not None:
+            g.metrics_template += time.perf_counter() - started
+    
+    @staticmethod
+    def _start():
+        g.metrics_queries = 0
+        g.metrics_db = 0.0
+        g.metrics_template = 0.0
+        g.metrics_started = time.perf_counter()
+    
+    def _finish(self, response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        total = time.perf_counter() - started
+        queries, db_time, template_time = g.metrics_queries, g.metrics_db, g.metrics_template
+        
+        endpoint = request.endpoint or 'unknown'
+        if endpoint != 'metrics':
+            self.observe(endpoint, response.status_code, total, db_time, template_time, queries)
+        
+        if self.server_timing or current_app.debug:
+            # Respostas em streaming (exportação) só contam o trabalho até aqui
+            response.headers['Server-Timing'] = (
+                f'db;dur={db_time * 1000:.2f};desc="{queries} queries", '
+                f'tpl;dur={template_time * 1000:.2f}, '
+                f'app;dur={total * 1000:.2f}'
+            )
+        return response
+    
+    # Agregação
+    
+    def observe(self, endpoint, status, total, db_time, template_time, queries):
+        """Registrar uma requisição nos histogramas do endpoint"""
+        values = (
+            ('coinctrl_request_duration_seconds', total),
+            ('coinctrl_db_duration_seconds', db_time),
+            ('coinctrl_template_duration_seconds', template_time),
+            ('coinctrl_db_queries', queries),
+        )
+        with self._lock:
+            for name, value in values:
+                histogram = self._histograms.get((name, endpoint))
+                if histogram is None:
+                    histogram = self._histograms[(name, endpoint)] = Histogram(HISTOGRAMS[name][1])
+                histogram.observe(value)
+            key = (endpoint, status)
+            self._responses[key] = self._responses.get(key, 0) + 1
+    
+    def after_fork(self):
+        """Começar o worker com histogramas vazios e lock novo"""
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Zerar histogramas e contadores"""
+        with self._lock:
+            self._histograms.clear()
+            self._responses.clear()
+    
+    def render(self):
+        """Métricas no formato texto do Prometheus (versão 0.0.4)"""
+        lines = []
+        with self._lock:
+            lines += [
+                '# HELP coinctrl_http_responses_total Respostas por endpoint e status',
+                '# TYPE coinctrl_http_responses_total counter',
+            ]
+            for (endpoint, status), count in sorted(self._responses.items()):
+                lines.append(f'coinctrl_http_responses_total{{endpoint="{escape_label(endpoint)}",'
+                             f'status="{status}"}} {count}')
+            
+            for name, (description, _) in HISTOGRAMS.items():
+                lines += [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+                for (metric, endpoint), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    label = f'endpoint="{escape_label(endpoint)}"'
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+                    lines.append(f'{name}_sum{{{label}}} {histogram.sum:.6f}')
+                    lines.append(f'{name}_count{{{label}}} {histogram.count}')
+        
+        lines += self._component_metrics()
+        return '\n'.join(lines) + '\n'
+    
+    @staticmethod
+    def _component_metrics():
+        """Contadores das extensões (cache de usuários, hashing, rate limit, Google)"""
+        extensions = current_app.extensions
+        metrics = []
+        
+        def add(name, kind, description, value):
+            metrics.extend([f'# HELP {name} {description}', f'# TYPE {name} {kind}', f'{name} {value}'])
+        
+        cache = extensions.get('user_cache')
+        if cache is not None:
+            stats = cache.stats()
+            add('coinctrl_user_cache_hits_total', 'counter', 'Acertos do cache de usuários', stats['hits'])
+            add('coinctrl_user_cache_misses_total', 'counter', 'Faltas do cache de usuários', stats['misses'])
+            add('coinctrl_user_cache_invalidations_total', 'counter',
+                'Invalidações do cache de usuários', stats['invalidations'])
+            add('coinctrl_user_cache_size', 'gauge', 'Usuários no cache', stats['size'])
+        fragments = extensions.get('fragment_cache')
+        if fragments is not None:
+            stats = fragments.stats()
+            add('coinctrl_fragment_cache_hits_total', 'counter', 'Fragmentos de template servidos do cache',
+                stats['hits'])
+            add('coinctrl_fragment_cache_misses_total', 'counter', 'Fragmentos de template renderizados',
+                stats['misses'])
+        hasher = extensions.get('password_hasher')
+        if hasher is not None:
+            add('coinctrl_password_hash_rejected_total', 'counter',
+                'Hashes recusados por excesso de concorrência (503)', hasher.rejected)
+        limiter = extensions.get('login_rate_limiter')
+        if limiter is not None:
+            add('coinctrl_login_rate_limited_total', 'counter',
+                'Tentativas de login recusadas pelo rate limit (429)', limiter.rejected)
+        slow_queries = extensions.get('slow_query_log')
+        if slow_queries is not None:
+            add('coinctrl_slow_queries_total', 'counter',
+                'Consultas acima de SLOW_QUERY_MS', slow_queries.logged)
+        certs = extensions.get('google_certs')
+        if certs is not None:
+            add('coinctrl_google_certs_fetches_total', 'counter',
+                'Downloads dos certificados do Google', certs.fetches)
+        return metrics
+    
+    def metrics_view(self):
+        """Endpoint /metrics (exige ``Authorization: Bearer <METRICS_TOKEN>``)"""
+        expected = f"Bearer {current_app.config['METRICS_TOKEN']}"
+        if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected.encode()):
+            return current_app.response_class('Não autorizado\n', status=401, mimetype='text/plain')
+        return current_app.response_class(
+            self.render(), content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+request_metrics = RequestMetrics()
@@ -1,6 +1,5 @@
 from app import db
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
 import re
 
@@ -25,14 +24,21 @@ class User(UserMixin, db.Model):
     auth_provider = db.Column(db.String(20), default='local')
     
     def set_password(self, password):
-        """Criptografar senha"""
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256', salt_length=16)
+        """Criptografar senha (pelo pool limitado de hashing)"""
+        from app.auth.hashing import password_hasher
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
-        """Verificar senha"""
+        """Verificar senha (pelo pool limitado de hashing)"""
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        from app.auth.hashing import password_hasher
+        return password_hasher.verify(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """Verificar se o hash usa parâmetros diferentes dos configurados"""
+        from app.auth.hashing import password_hasher
+        return password_hasher.needs_rehash(self.password_hash)
     
     def is_locked(self):
         """Verificar se conta está bloqueada"""
@@ -47,6 +53,12 @@ class User(UserMixin, db.Model):
             self.locked_until = datetime.utcnow() + timedelta(minutes=30)
         db.session.commit()
     
+    def lock_account(self, seconds, attempts):
+        """Bloquear conta (chamado só quando o rate limiter cruza o limite)"""
+        self.login_attempts = attempts
+        self.locked_until = datetime.utcnow() + timedelta(seconds=seconds)
+        db.session.commit()
+    
     def reset_login_attempts(self):
         """Resetar tentativas de login"""
         self.login_attempts = 0
@@ -87,6 +99,10 @@ class TransactionType(Enum):
 class Category(db.Model):
     """Modelo para categorias financeiras"""
     __tablename__ = 'categories'
+    __table_args__ = (
+        # Listagem/contagem por usuário e API de categorias por tipo
+        db.Index('ix_categories_user_type_name', 'user_id', 'transaction_type', 'name'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -97,6 +113,11 @@ class Category(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Uso da categoria, mantido incrementalmente pelas transações (ver ledger)
+    transaction_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    total_amount = db.Column(db.Numeric(14, 2), nullable=False, default=Decimal('0'), server_default='0')
+    last_transaction_date = db.Column(db.Date, nullable=True)
+    
     # Relacionamentos
     user = db.relationship('User', backref=db.backref('categories', lazy=True))
     transactions = db.relationship('Transaction', backref='category', lazy=True, cascade='all, delete-orphan')
@@ -113,12 +134,109 @@ class Category(db.Model):
             'color': self.color,
             'icon': self.icon,
             'transaction_type': self.transaction_type.value,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'transaction_count': self.transaction_count or 0,
+            'total_amount': float(self.total_amount or 0),
+            'last_transaction_date': (
+                self.last_transaction_date.isoformat() if self.last_transaction_date else None
+            )
+        }
+    
+    @classmethod
+    def apply_usage(cls, category_id, user_id, transaction_date, amount, count=1, exclude_id=None):
+        """Somar um delta aos contadores de uso da categoria com um UPDATE atômico
+        
+        Ao estornar (count < 0), a data mais recente é recalculada sem a
+        transação ``exclude_id``, que ainda está gravada no banco.
+        """
+        if count > 0:
+            last_date = db.case(
+                (db.or_(cls.last_transaction_date.is_(None),
+                        cls.last_transaction_date < transaction_date), transaction_date),
+                else_=cls.last_transaction_date
+            )
+        else:
+            last_date = (
+                db.select(db.func.max(Transaction.transaction_date))
+                .where(
+                    Transaction.user_id == user_id,
+                    Transaction.category_id == category_id,
+                    Transaction.id != exclude_id
+                )
+                .scalar_subquery()
+            )
+        
+        db.session.execute(
+            db.update(cls)
+            .where(cls.id == category_id)
+            .values(
+                transaction_count=cls.transaction_count + count,
+                total_amount=cls.total_amount + amount,
+                last_transaction_date=last_date
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    @classmethod
+    def compute_usage(cls, user_id):
+        """Recalcular o uso de cada categoria do usuário a partir das transações
+        
+        Returns:
+            dict: {category_id: (quantidade, total, data mais recente)}
+        """
+        usage = {
+            category_id: (count, Decimal(str(total)).quantize(Decimal('0.01')), last_date)
+            for category_id, count, total, last_date in db.session.execute(
+                db.select(
+                    Transaction.category_id,
+                    db.func.count(Transaction.id),
+                    db.func.coalesce(db.func.sum(Transaction.amount), 0),
+                    db.func.max(Transaction.transaction_date)
+                )
+                .where(Transaction.user_id == user_id)
+                .group_by(Transaction.category_id)
+            )
+        }
+        category_ids = db.session.execute(
+            db.select(cls.id).where(cls.user_id == user_id)
+        ).scalars()
+        return {
+            category_id: usage.get(category_id, (0, Decimal('0.00'), None))
+            for category_id in category_ids
         }
+    
+    @classmethod
+    def rebuild_usage(cls, user_id):
+        """Regravar os contadores de uso de todas as categorias do usuário"""
+        rows = [
+            {
+                'id': category_id,
+                'transaction_count': count,
+                'total_amount': total,
+                'last_transaction_date': last_date
+            }
+            for category_id, (count, total, last_date) in cls.compute_usage(user_id).items()
+        ]
+        if rows:
+            db.session.execute(db.update(cls), rows)
 
 class Transaction(db.Model):
     """Modelo para transações financeiras (receitas e despesas)"""
     __tablename__ = 'transactions'
+    __table_args__ = (
+        # Listagem paginada: WHERE user_id ORDER BY transaction_date, created_at, id
+        db.Index('ix_transactions_user_date', 'user_id', 'transaction_date', 'created_at', 'id'),
+        # Filtro por tipo (mesma ordenação) e agregações por tipo
+        db.Index('ix_transactions_user_type_date', 'user_id', 'transaction_type',
+                 'transaction_date', 'created_at', 'id'),
+        # Filtro por categoria (mesma ordenação)
+        db.Index('ix_transactions_user_category_date', 'user_id', 'category_id',
+                 'transaction_date', 'created_at', 'id'),
+        # Contagem por categoria em delete_category
+        db.Index('ix_transactions_category', 'category_id'),
+        # Últimas transações do dashboard
+        db.Index('ix_transactions_user_created', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     description = db.Column(db.String(200), nullable=False)
@@ -141,19 +259,26 @@ class Transaction(db.Model):
     def __repr__(self):
         return f'<Transaction {self.description} - R\$ {self.amount}>'
     
-    def to_dict(self):
-        """Converter para dicionário"""
-        return {
+    def to_dict(self, include_category=True):
+        """Converter para dicionário
+        
+        Com include_category=False a categoria não é embutida (apenas
+        category_id), para respostas que enviam as categorias uma única vez.
+        """
+        data = {
             'id': self.id,
             'description': self.description,
             'amount': float(self.amount),
             'transaction_type': self.transaction_type.value,
             'transaction_date': self.transaction_date.isoformat() if self.transaction_date else None,
             'notes': self.notes,
-            'category': self.category.to_dict() if self.category else None,
+            'category_id': self.category_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        if include_category:
+            data['category'] = self.category.to_dict() if self.category else None
+        return data
     
     @property
     def formatted_amount(self):
@@ -163,33 +288,356 @@ class Transaction(db.Model):
     @staticmethod
     def get_balance_by_user(user_id):
         """Calcular saldo total do usuário"""
-        receitas = db.session.query(db.func.sum(Transaction.amount)).filter_by(
-            user_id=user_id, 
-            transaction_type=TransactionType.RECEITA
-        ).scalar() or Decimal('0')
-        
-        despesas = db.session.query(db.func.sum(Transaction.amount)).filter_by(
-            user_id=user_id, 
-            transaction_type=TransactionType.DESPESA
-        ).scalar() or Decimal('0')
-        
-        return receitas - despesas
+        return Transaction.get_totals_by_user(user_id)['saldo']
     
     @staticmethod
     def get_totals_by_user(user_id):
-        """Obter totais de receitas e despesas"""
-        receitas = db.session.query(db.func.sum(Transaction.amount)).filter_by(
-            user_id=user_id, 
-            transaction_type=TransactionType.RECEITA
-        ).scalar() or Decimal('0')
-        
-        despesas = db.session.query(db.func.sum(Transaction.amount)).filter_by(
-            user_id=user_id, 
-            transaction_type=TransactionType.DESPESA
-        ).scalar() or Decimal('0')
-        
+        """Obter totais de receitas e despesas (lidos do saldo consolidado)"""
+        balance = db.session.get(UserBalance, user_id)
+        if balance is None:
+            # Primeiro acesso: consolidar o histórico (todas as tabelas do ledger) uma única vez
+            from app.financial.ledger import rebuild_user
+            balance = rebuild_user(user_id)
+            db.session.commit()
+        return balance.to_totals()
+
+class UserBalance(db.Model):
+    """Totais consolidados por usuário, mantidos incrementalmente pelas transações"""
+    __tablename__ = 'user_balances'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    receitas = db.Column(db.Numeric(14, 2), nullable=False, default=Decimal('0'))
+    despesas = db.Column(db.Numeric(14, 2), nullable=False, default=Decimal('0'))
+    transaction_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<UserBalance {self.user_id} - R$ {self.saldo}>'
+    
+    @property
+    def saldo(self):
+        """Saldo atual (receitas - despesas)"""
+        return (self.receitas or Decimal('0')) - (self.despesas or Decimal('0'))
+    
+    def to_totals(self):
+        """Converter para o mesmo formato de Transaction.get_totals_by_user"""
+        receitas = Decimal(self.receitas or 0)
+        despesas = Decimal(self.despesas or 0)
         return {
             'receitas': receitas,
             'despesas': despesas,
             'saldo': receitas - despesas
-        }
\ No newline at end of file
+        }
+    
+    @staticmethod
+    def compute(user_id):
+        """Recalcular os totais a partir das transações (uma única agregação condicional)"""
+        receitas = db.func.coalesce(db.func.sum(db.case(
+            (Transaction.transaction_type == TransactionType.RECEITA, Transaction.amount),
+            else_=0
+        )), 0)
+        despesas = db.func.coalesce(db.func.sum(db.case(
+            (Transaction.transaction_type == TransactionType.DESPESA, Transaction.amount),
+            else_=0
+        )), 0)
+        row = db.session.query(
+            receitas, despesas, db.func.count(Transaction.id)
+        ).filter(Transaction.user_id == user_id).one()
+        
+        cents = Decimal('0.01')
+        return {
+            'receitas': Decimal(str(row[0])).quantize(cents),
+            'despesas': Decimal(str(row[1])).quantize(cents),
+            'transaction_count': row[2]
+        }
+    
+    @classmethod
+    def rebuild(cls, user_id):
+        """Recriar o saldo consolidado do usuário a partir das transações
+        
+        Grava com UPDATE/INSERT imediatos (e não com um objeto pendente na
+        sessão), para que um ``apply`` logo em seguida já encontre a linha.
+        """
+        values = cls.compute(user_id)
+        result = db.session.execute(
+            db.update(cls)
+            .where(cls.user_id == user_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.session.execute(db.insert(cls).values(user_id=user_id, **values))
+        return db.session.get(cls, user_id, populate_existing=True)
+    
+    @classmethod
+    def apply(cls, user_id, transaction_type, amount, count=1):
+        """Somar um delta aos totais do usuário com um UPDATE atômico
+        
+        Returns:
+            bool: False se o usuário ainda não tem saldo consolidado (nada
+            foi alterado; ver ``ledger.apply_transaction``)
+        """
+        column = 'receitas' if transaction_type == TransactionType.RECEITA else 'despesas'
+        result = db.session.execute(
+            db.update(cls)
+            .where(cls.user_id == user_id)
+            .values({
+                column: getattr(cls, column) + amount,
+                'transaction_count': cls.transaction_count + count
+            })
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+class MonthlyRollup(db.Model):
+    """Totais mensais por categoria, mantidos incrementalmente pelas transações"""
+    __tablename__ = 'monthly_rollups'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    period = db.Column(db.String(7), primary_key=True)  # 'AAAA-MM'
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), primary_key=True)
+    transaction_type = db.Column(db.Enum(TransactionType), primary_key=True)
+    total = db.Column(db.Numeric(14, 2), nullable=False, default=Decimal('0'))
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<MonthlyRollup {self.user_id} {self.period} {self.category_id}>'
+    
+    @staticmethod
+    def period_of(day):
+        """Período 'AAAA-MM' de uma data"""
+        return day.strftime('%Y-%m')
+    
+    @staticmethod
+    def period_bounds(period):
+        """Primeiro dia do período e primeiro dia do período seguinte"""
+        start = datetime.strptime(period, '%Y-%m').date()
+        if start.month == 12:
+            return start, start.replace(year=start.year + 1, month=1)
+        return start, start.replace(month=start.month + 1)
+    
+    @staticmethod
+    def period_column():
+        """Expressão SQL do período 'AAAA-MM' de Transaction.transaction_date"""
+        return db.func.substr(db.cast(Transaction.transaction_date, db.String), 1, 7)
+    
+    @classmethod
+    def compute_cell(cls, user_id, period, category_id, transaction_type):
+        """Recalcular uma célula (usuário, mês, categoria, tipo) a partir das transações"""
+        start, end = cls.period_bounds(period)
+        total, count = db.session.query(
+            db.func.coalesce(db.func.sum(Transaction.amount), 0),
+            db.func.count(Transaction.id)
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.category_id == category_id,
+            Transaction.transaction_type == transaction_type,
+            Transaction.transaction_date >= start,
+            Transaction.transaction_date < end
+        ).one()
+        return Decimal(str(total)).quantize(Decimal('0.01')), count
+    
+    @classmethod
+    def compute(cls, user_id):
+        """Agrupar todas as transações do usuário por mês, categoria e tipo"""
+        period = cls.period_column()
+        rows = db.session.query(
+            period, Transaction.category_id, Transaction.transaction_type,
+            db.func.sum(Transaction.amount), db.func.count(Transaction.id)
+        ).filter(Transaction.user_id == user_id)\
+            .group_by(period, Transaction.category_id, Transaction.transaction_type).all()
+        
+        return {
+            (row[0], row[1], row[2]): (Decimal(str(row[3])).quantize(Decimal('0.01')), row[4])
+            for row in rows
+        }
+    
+    @classmethod
+    def rebuild(cls, user_id):
+        """Recriar os totais mensais do usuário a partir das transações"""
+        cells = cls.compute(user_id)
+        db.session.execute(db.delete(cls).where(cls.user_id == user_id))
+        if cells:
+            db.session.execute(db.insert(cls), [
+                {
+                    'user_id': user_id,
+                    'period': period,
+                    'category_id': category_id,
+                    'transaction_type': transaction_type,
+                    'total': total,
+                    'count': count
+                }
+                for (period, category_id, transaction_type), (total, count) in cells.items()
+            ])
+    
+    @classmethod
+    def apply(cls, user_id, transaction_date, category_id, transaction_type, amount, count=1):
+        """Somar um delta à célula do mês com um UPDATE atômico
+        
+        Uma célula que fica sem transações é apagada: ela referencia a
+        categoria, que de outro modo não poderia mais ser excluída.
+        """
+        period = cls.period_of(transaction_date)
+        cell = (
+            cls.user_id == user_id,
+            cls.period == period,
+            cls.category_id == category_id,
+            cls.transaction_type == transaction_type
+        )
+        result = db.session.execute(
+            db.update(cls)
+            .where(*cell)
+            .values(total=cls.total + amount, count=cls.count + count)
+            .execution_options(synchronize_session=False)
+        )
+        
+        if count < 0 and result.rowcount:
+            db.session.execute(
+                db.delete(cls).where(*cell, cls.count <= 0)
+                .execution_options(synchronize_session=False)
+            )
+        elif result.rowcount == 0:
+            # Célula ainda não existe: partir das transações já gravadas no mês
+            total, existing = cls.compute_cell(user_id, period, category_id, transaction_type)
+            if existing + count <= 0:
+                return
+            db.session.execute(db.insert(cls).values(
+                user_id=user_id,
+                period=period,
+                category_id=category_id,
+                transaction_type=transaction_type,
+                total=total + Decimal(amount),
+                count=existing + count
+            ))
+
+
+class Budget(db.Model):
+    """Orçamento mensal de uma categoria de despesa
+    
+    ``spent`` é o gasto do mês, mantido pelas transações com um UPDATE
+    atômico (ver ledger): conferir o orçamento não soma o histórico.
+    """
+    __tablename__ = 'budgets'
+    __table_args__ = (
+        # Um orçamento por categoria e mês; também é o caminho do UPDATE do ledger
+        db.Index('ix_budgets_category_period', 'category_id', 'period', unique=True),
+        db.Index('ix_budgets_user_period', 'user_id', 'period'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    category_id = db.Column(db.Integer, db.ForeignKey('categories.id'), nullable=False)
+    period = db.Column(db.String(7), nullable=False)  # 'AAAA-MM'
+    amount = db.Column(db.Numeric(14, 2), nullable=False)
+    spent = db.Column(db.Numeric(14, 2), nullable=False, default=Decimal('0'), server_default='0')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    category = db.relationship('Category', backref=db.backref(
+        'budgets', lazy=True, cascade='all, delete-orphan'
+    ))
+    
+    def __repr__(self):
+        return f'<Budget {self.category_id} {self.period}>'
+    
+    @property
+    def remaining(self):
+        return self.amount - self.spent
+    
+    @property
+    def is_over(self):
+        return self.spent > self.amount
+    
+    def to_dict(self):
+        """Converter para dicionário"""
+        return {
+            'id': self.id,
+            'category_id': self.category_id,
+            'period': self.period,
+            'amount': float(self.amount),
+            'spent': float(self.spent),
+            'remaining': float(self.remaining),
+            'percent_used': round(float(self.spent / self.amount * 100), 1) if self.amount else 0.0,
+            'over_budget': self.is_over
+        }
+    
+    @classmethod
+    def apply(cls, category_id, transaction_date, amount):
+        """Somar um delta ao gasto do mês (se houver orçamento) com um UPDATE atômico"""
+        db.session.execute(
+            db.update(cls)
+            .where(
+                cls.category_id == category_id,
+                cls.period == MonthlyRollup.period_of(transaction_date)
+            )
+            .values(spent=cls.spent + amount)
+            .execution_options(synchronize_session=False)
+        )
+    
+    @classmethod
+    def compute(cls, user_id):
+        """Gasto esperado de cada orçamento do usuário, somado direto das transações
+        
+        Não usa ``monthly_rollups``: serve para conferir também os totais mensais.
+        
+        Args:
+            user_id: ID do usuário
+        
+        Returns:
+            dict: {budget_id: gasto}
+        """
+        rows = db.session.execute(
+            db.select(cls.id, db.func.coalesce(db.func.sum(Transaction.amount), 0))
+            .outerjoin(Transaction, db.and_(
+                Transaction.user_id == cls.user_id,
+                Transaction.category_id == cls.category_id,
+                Transaction.transaction_type == TransactionType.DESPESA,
+                MonthlyRollup.period_column() == cls.period
+            ))
+            .where(cls.user_id == user_id)
+            .group_by(cls.id)
+        )
+        return {budget_id: Decimal(str(spent)).quantize(Decimal('0.01')) for budget_id, spent in rows}
+    
+    @classmethod
+    def rebuild(cls, user_id):
+        """Regravar o gasto de todos os orçamentos do usuário"""
+        rows = [
+            {'id': budget_id, 'spent': spent}
+            for budget_id, spent in cls.compute(user_id).items()
+        ]
+        if rows:
+            db.session.execute(db.update(cls), rows)
+
+
+class UserDataVersion(db.Model):
+    """Versão dos dados financeiros do usuário, incrementada a cada escrita (ETag)"""
+    __tablename__ = 'user_data_versions'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<UserDataVersion {self.user_id} v{self.version}>'
+    
+    @classmethod
+    def get(cls, user_id):
+        """Versão atual (0 se o usuário nunca escreveu), por chave primária"""
+        version = db.session.execute(
+            db.select(cls.version).where(cls.user_id == user_id)
+        ).scalar()
+        return version or 0
+    
+    @classmethod
+    def bump(cls, user_id):
+        """Incrementar a versão com um UPDATE atômico"""
+        result = db.session.execute(
+            db.update(cls)
+            .where(cls.user_id == user_id)
+            .values(version=cls.version + 1, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        
+        if result.rowcount == 0:
+            db.session.execute(db.insert(cls).values(user_id=user_id, version=1))
@@ -0,0 +1,86 @@
+# app/query_plans.py
+"""Utilitários para inspecionar o plano de execução das consultas (SQLite)"""
+from datetime import date, datetime
+from app import db
+
+
+def compile_statement(query):
+    """Compilar uma Query/Select em SQL com os valores já embutidos"""
+    statement = getattr(query, 'statement', query)
+    return str(statement.compile(
+        dialect=db.engine.dialect,
+        compile_kwargs={'literal_binds': True}
+    ))
+
+
+def explain_query_plan(query):
+    """Executar EXPLAIN QUERY PLAN e retornar as linhas de detalhe do plano"""
+    sql = compile_statement(query)
+    rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).fetchall()
+    return [row[-1] for row in rows]
+
+
+def plan_uses_index(plan, index_name):
+    """Verificar se o plano usa o índice e não ordena em tabela temporária"""
+    uses_index = any(index_name in detail for detail in plan)
+    temp_sort = any('TEMP B-TREE' in detail for detail in plan)
+    return uses_index and not temp_sort
+
+
+def hot_queries():
+    """Consultas mais frequentes da aplicação e o índice que cada uma deve usar"""
+    from app.models import Budget, Category, Transaction, TransactionType
+    from app.financial.routes import filter_transactions
+    from app.financial.pagination import encode_cursor, keyset_query
+    from app.financial.summary import recent_transactions_query
+    
+    cursor = encode_cursor(Transaction(
+        id=1, transaction_date=date(2024, 1, 1), created_at=datetime(2024, 1, 1)
+    ))
+    return [
+        ('transactions (1ª página)',
+         keyset_query(filter_transactions(1, {})),
+         'ix_transactions_user_date'),
+        ('transactions (página seguinte)',
+         keyset_query(filter_transactions(1, {}), cursor),
+         'ix_transactions_user_date'),
+        ('transactions por tipo',
+         keyset_query(filter_transactions(1, {'type': 'despesa'}), cursor),
+         'ix_transactions_user_type_date'),
+        ('transactions por categoria',
+         keyset_query(filter_transactions(1, {'category': '1'}), cursor),
+         'ix_transactions_user_category_date'),
+        ('dashboard: últimas transações',
+         recent_transactions_query(1),
+         'ix_transactions_user_created'),
+        ('ledger: última transação da categoria (estorno)',
+         db.select(db.func.max(Transaction.transaction_date)).where(
+             Transaction.user_id == 1, Transaction.category_id == 1, Transaction.id != 1
+         ),
+         'ix_transactions_user_category_date'),
+        ('api_categories_by_type',
+         Category.query.filter_by(user_id=1, transaction_type=TransactionType.DESPESA)
+         .order_by(Category.name),
+         'ix_categories_user_type_name'),
+        ('orçamento da categoria no mês (aviso ao salvar)',
+         db.select(Budget.amount, Budget.spent).where(
+             Budget.category_id == 1, Budget.period == '2024-01'
+         ),
+         'ix_budgets_category_period'),
+        ('api_budgets',
+         db.select(Budget.id).where(Budget.user_id == 1, Budget.period == '2024-01'),
+         'ix_budgets_user_period'),
+    ]
+
+
+def check_hot_queries():
+    """Plano de cada consulta frequente e se ele usa o índice esperado
+    
+    Returns:
+        list: (nome, índice, linhas do plano, True se usa o índice)
+    """
+    results = []
+    for name, query, index_name in hot_queries():
+        plan = explain_query_plan(query)
+        results.append((name, index_name, plan, plan_uses_index(plan, index_name)))
+    return results
@@ -0,0 +1,212 @@
+# app/slow_queries.py
+"""Log de consultas lentas com o plano de execução capturado no momento.
+
+Toda instrução que passa de ``SLOW_QUERY_MS`` vira uma linha JSON em um
+arquivo rotativo. A linha traz o SQL normalizado, os tipos dos parâmetros
+(não os valores), o endpoint que fez a consulta, a duração e o
+``EXPLAIN QUERY PLAN`` executado na mesma conexão, logo após a consulta.
+``flask financial slow-queries`` resume o arquivo pelos maiores
+ofensores em tempo total.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from flask import has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger('coinctrl.slow_queries')
+
+# Instruções para as quais não faz sentido pedir o plano
+NO_EXPLAIN = ('PRAGMA', 'EXPLAIN', 'BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'INSERT',
+              'CREATE', 'DROP', 'ALTER')
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PARAM_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+
+def normalize_sql(statement):
+    """SQL sem literais e com listas de parâmetros colapsadas (agrupa variações)"""
+    sql = _WHITESPACE.sub(' ', statement).strip()
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return _PARAM_LIST.sub('(?, ...)', sql)
+
+
+def fingerprint(normalized):
+    """Identificador curto da consulta normalizada"""
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+def parameter_shapes(parameters, executemany=False):
+    """Tipos dos parâmetros (nunca os valores: podem conter dados pessoais)"""
+    if executemany:
+        rows = list(parameters or ())
+        return {'rows': len(rows), 'types': parameter_shapes(rows[0]) if rows else []}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    return [type(value).__name__ for value in parameters or ()]
+
+
+def explain(cursor, dialect, statement, parameters):
+    """Plano da consulta pelo cursor DBAPI (sem passar pelos eventos do engine)"""
+    if statement.lstrip().split(None, 1)[0].upper() in NO_EXPLAIN:
+        return None
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+    try:
+        plan_cursor = cursor.connection.cursor()
+        try:
+            plan_cursor.execute(prefix + statement, parameters)
+            return [str(row[-1]) for row in plan_cursor.fetchall()]
+        finally:
+            plan_cursor.close()
+    except Exception as e:
+        return [f'(plano indisponível: {e})']
+
+
+class SlowQueryLog:
+    """Registrar instruções acima do limite em um arquivo JSON rotativo"""
+    
+    def __init__(self, threshold_ms=100):
+        self.threshold_ms = threshold_ms
+        self.explain = True
+        self.path = None
+        self.logged = 0
+        self._engines = set()
+    
+    def init_app(self, app):
+        """Configurar a partir de SLOW_QUERY_* e instrumentar os engines"""
+        from app import db
+        
+        self.threshold_ms = app.config.get('SLOW_QUERY_MS', self.threshold_ms)
+        self.explain = app.config.get('SLOW_QUERY_EXPLAIN', True)
+        self.path = app.config.get('SLOW_QUERY_LOG') or os.path.join(app.instance_path, 'slow_queries.log')
+        app.extensions['slow_query_log'] = self
+        if not self.threshold_ms:
+            return
+        
+        self._configure_logger(
+            app.config.get('SLOW_QUERY_LOG_MAX_BYTES', 5 * 1024 * 1024),
+            app.config.get('SLOW_QUERY_LOG_BACKUPS', 3)
+        )
+        with app.app_context():
+            engines = list(db.engines.values())
+        if 'db_read_engine' in app.extensions:
+            engines.append(app.extensions['db_read_engine'])
+        for engine in engines:
+            self.instrument_engine(engine)
+    
+    def _configure_logger(self, max_bytes, backups):
+        path = os.path.abspath(self.path)
+        for handler in logger.handlers:
+            if getattr(handler, 'baseFilename', None) == path:
+                return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                      encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    
+    def instrument_engine(self, engine):
+        """Medir cada instrução do engine (uma vez por engine)"""
+        if engine in self._engines:
+            return
+        event.listen(engine, 'before_cursor_execute', self._before_cursor)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor)
+        self._engines.add(engine)
+    
+    @staticmethod
+    def _before_cursor(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.slow_query_started = time.perf_counter()
+    
+    def _after_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, 'slow_query_started', None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if not self.threshold_ms or elapsed_ms < self.threshold_ms:
+            return
+        
+        normalized = normalize_sql(statement)
+        plan = None
+        if self.explain and not executemany:
+            plan = explain(cursor, conn.dialect.name, statement, parameters)
+        self.record({
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'fingerprint': fingerprint(normalized),
+            'duration_ms': round(elapsed_ms, 2),
+            'endpoint': request.endpoint if has_request_context() else None,
+            'method': request.method if has_request_context() else None,
+            'database': conn.engine.url.database,
+            'sql': normalized,
+            'parameters': parameter_shapes(parameters, executemany),
+            'plan': plan,
+        })
+    
+    def record(self, entry):
+        """Gravar uma entrada no log"""
+        self.logged += 1
+        logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+
+slow_query_log = SlowQueryLog()
+
+
+def read_entries(path):
+    """Ler as entradas do log e dos arquivos rotacionados (mais antigos primeiro)"""
+    paths = sorted(
+        (p for p in (f'{path}.{n}' for n in range(1, 100)) if os.path.exists(p)),
+        key=lambda p: -int(p.rsplit('.', 1)[1])
+    )
+    if os.path.exists(path):
+        paths.append(path)
+    for file_path in paths:
+        with open(file_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def summarize(entries, since=None):
+    """Agrupar entradas por consulta normalizada, do maior tempo total ao menor
+    
+    Args:
+        entries: Entradas do log (dicts)
+        since: Considerar apenas entradas a partir deste ``datetime``
+    
+    Returns:
+        list: Um dict por consulta (count, total_ms, max_ms, endpoints, sql e último plano)
+    """
+    groups = {}
+    for entry in entries:
+        if since and datetime.fromisoformat(entry['timestamp']) < since:
+            continue
+        group = groups.setdefault(entry['fingerprint'], {
+            'fingerprint': entry['fingerprint'],
+            'sql': entry['sql'],
+            'count': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'endpoints': {},
+            'plan': None,
+            'last_seen': None,
+        })
+        group['count'] += 1
+        group['total_ms'] += entry['duration_ms']
+        group['max_ms'] = max(group['max_ms'], entry['duration_ms'])
+        endpoint = entry.get('endpoint') or '(fora de requisição)'
+        group['endpoints'][endpoint] = group['endpoints'].get(endpoint, 0) + 1
+        group['plan'] = entry.get('plan') or group['plan']
+        group['last_seen'] = entry['timestamp']
+    return sorted(groups.values(), key=lambda group: group['total_ms'], reverse=True)
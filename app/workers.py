@@ -0,0 +1,62 @@
+# app/workers.py
+"""Suporte a ``gunicorn --preload``: carregar uma vez, fazer fork com segurança.
+
+Com ``--preload`` o processo mestre importa a aplicação e compila os
+templates uma única vez; os workers nascem por fork já com tudo em
+memória. O que não pode atravessar o fork é descartado no filho por
+``os.register_at_fork``: conexões dos engines (``dispose(close=False)``,
+para não fechar as do pai), conexões do rate limit em SQLite, a sessão
+HTTP dos certificados do Google, o pool de hashing e os locks copiados.
+"""
+import os
+import weakref
+
+_apps = weakref.WeakSet()
+_registered = False
+
+
+def register_app(app):
+    """Preparar a aplicação para ser herdada por fork"""
+    global _registered
+    _apps.add(app)
+    if not _registered and hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_after_fork_in_child)
+        _registered = True
+
+
+def _after_fork_in_child():
+    for app in list(_apps):
+        reset_after_fork(app)
+
+
+def reset_after_fork(app):
+    """Descartar no processo filho os recursos herdados do pai"""
+    from app import db
+    
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    read_engine = app.extensions.get('db_read_engine')
+    if read_engine is not None:
+        read_engine.dispose(close=False)
+    
+    for name in ('password_hasher', 'user_cache', 'google_certs', 'request_metrics', 'fragment_cache'):
+        extension = app.extensions.get(name)
+        if extension is not None:
+            extension.after_fork()
+    limiter = app.extensions.get('login_rate_limiter')
+    if limiter is not None:
+        limiter.backend.after_fork()
+
+
+def precompile_templates(app):
+    """Compilar todos os templates (no mestre, antes do fork)
+    
+    Returns:
+        int: Número de templates compilados
+    """
+    env = app.jinja_env
+    names = env.list_templates(extensions=('html',))
+    for name in names:
+        env.get_template(name)
+    return len(names)
@@ -0,0 +1,150 @@
+# benchmarks/bench_cold_start.py
+"""Tempo de boot de um worker: import, create_app e primeiras requisições.
+
+Cada amostra é um processo Python novo que importa a aplicação, chama
+``create_app()`` e faz as primeiras requisições (login e lista de
+transações, que compilam os templates). Três cenários:
+
+- ``cold``: sem cache de bytecode dos templates
+- ``bytecode``: com ``FileSystemBytecodeCache`` já populado
+- ``preload``: como ``gunicorn --preload``, o mestre carrega a app e
+  compila os templates; mede-se do ``fork()`` à primeira resposta do worker
+
+Sai com código 1 se a mediana do boot no cenário ``--check`` passar de
+``--budget-ms``; serve como verificação em CI.
+
+Uso:
+    python benchmarks/bench_cold_start.py
+    python benchmarks/bench_cold_start.py --runs 10 --budget-ms 800 --check bytecode
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executado em um processo novo; imprime os tempos (ms) em JSON
+WORKER = r'''
+import json, os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, os.environ['BENCH_ROOT'])
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+
+
+def first_requests(app):
+    begin = time.perf_counter()
+    client = app.test_client()
+    assert client.get('/auth/login').status_code == 200
+    with client.session_transaction() as session:
+        session['_user_id'] = os.environ['BENCH_USER_ID']
+        session['_fresh'] = True
+    assert client.get('/financial/transactions').status_code == 200
+    return (time.perf_counter() - begin) * 1000
+
+
+if os.environ.get('BENCH_PRELOAD') == '1':
+    from app import db
+    from app.workers import precompile_templates
+    precompile_templates(app)
+    with app.app_context():
+        db.session.execute(db.text('SELECT 1'))  # conexão no pool do mestre (descartada no filho)
+    read, write = os.pipe()
+    forked = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        requests_ms = first_requests(app)
+        os.write(write, json.dumps({
+            'boot_ms': (time.perf_counter() - forked) * 1000,
+            'requests_ms': requests_ms,
+        }).encode())
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    result = json.loads(os.read(read, 65536))
+    result.update(import_ms=0.0, create_app_ms=0.0)
+else:
+    requests_ms = first_requests(app)
+    result = {
+        'import_ms': (imported - started) * 1000,
+        'create_app_ms': (created - imported) * 1000,
+        'requests_ms': requests_ms,
+        'boot_ms': (time.perf_counter() - started) * 1000,
+    }
+print(json.dumps(result))
+'''
+
+
+def prepare_database(tmpdir):
+    """Banco com um usuário e algumas transações (para renderizar a lista)"""
+    sys.path.insert(0, ROOT)
+    from app import create_app
+    from benchmarks.seed import bench_config, seed_database
+    
+    config = bench_config(f'sqlite:///{os.path.join(tmpdir, "bench.db")}')
+    config.JINJA_BYTECODE_CACHE_DIR = ''
+    app = create_app(config)
+    with app.app_context():
+        return seed_database(users=1, categories=12, transactions=500)[0]
+
+
+def run_sample(env):
+    output = subprocess.run(
+        [sys.executable, '-c', WORKER], env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo de boot de workers (import + primeira requisição).')
+    parser.add_argument('--runs', type=int, default=5, help='amostras por cenário')
+    parser.add_argument('--budget-ms', type=float, default=1500, help='orçamento de boot (mediana)')
+    parser.add_argument('--check', default='bytecode', choices=('cold', 'bytecode', 'preload'),
+                        help='cenário comparado com o orçamento')
+    args = parser.parse_args()
+    
+    tmpdir = tempfile.mkdtemp(prefix='coinctrl-boot-')
+    try:
+        user_id = prepare_database(tmpdir)
+        cache_dir = os.path.join(tmpdir, 'jinja_cache')
+        base_env = dict(
+            os.environ,
+            BENCH_ROOT=ROOT,
+            BENCH_USER_ID=str(user_id),
+            DATABASE_URL=f'sqlite:///{os.path.join(tmpdir, "bench.db")}',
+            SLOW_QUERY_LOG=os.path.join(tmpdir, 'slow_queries.log'),
+        )
+        scenarios = {
+            'cold': dict(base_env, JINJA_BYTECODE_CACHE_DIR=''),
+            'bytecode': dict(base_env, JINJA_BYTECODE_CACHE_DIR=cache_dir),
+            'preload': dict(base_env, JINJA_BYTECODE_CACHE_DIR='', BENCH_PRELOAD='1'),
+        }
+        run_sample(scenarios['bytecode'])  # popular o cache de bytecode
+        
+        print(f"{'cenário':<10}{'import':>10}{'create_app':>12}{'1ªs reqs':>10}{'boot':>10}  (mediana, ms)")
+        medians = {}
+        for name, env in scenarios.items():
+            samples = [run_sample(env) for _ in range(args.runs)]
+            median = {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+            medians[name] = median
+            print(f"{name:<10}{median['import_ms']:>10.0f}{median['create_app_ms']:>12.0f}"
+                  f"{median['requests_ms']:>10.0f}{median['boot_ms']:>10.0f}")
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    
+    boot = medians[args.check]['boot_ms']
+    if boot > args.budget_ms:
+        print(f'❌ Boot ({args.check}) {boot:.0f} ms acima do orçamento de {args.budget_ms:.0f} ms')
+        raise SystemExit(1)
+    print(f'✅ Boot ({args.check}) {boot:.0f} ms dentro do orçamento de {args.budget_ms:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
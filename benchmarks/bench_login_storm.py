@@ -0,0 +1,195 @@
+# benchmarks/bench_login_storm.py
+"""Benchmark: latência do dashboard durante uma rajada de logins.
+
+Sobe o gunicorn com workers sync (como em produção) sobre um banco
+temporário e, enquanto vários clientes fazem POST /auth/login sem parar,
+mede a latência de GET /dashboard de um usuário já autenticado. Modos:
+
+- ``inline``: PASSWORD_HASH_MAX_INFLIGHT = 0 (comportamento antigo)
+- ``limite por processo``: vagas só dentro de cada worker; com workers
+  sync nunca chegam a faltar, então o resultado é igual ao inline
+- ``vagas entre workers``: vagas em arquivos com ``flock`` compartilhadas
+  pelos workers; logins acima do limite recebem 503 na hora
+
+Uso:
+    python benchmarks/bench_login_storm.py                  # 4 workers, 8 clientes, 10s por modo
+    python benchmarks/bench_login_storm.py 4 16 20
+"""
+import http.cookiejar
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import create_app, db  # noqa: E402
+from app.models import User  # noqa: E402
+from benchmarks.seed import bench_config  # noqa: E402
+
+PASSWORD = 'Bench123!'
+EMAIL_PREFIX = 'bench-login-storm-'
+
+# (nome, variáveis de ambiente do gunicorn); SLOTS_DIR é trocado pelo diretório temporário
+MODES = [
+    ('inline', {'PASSWORD_HASH_MAX_INFLIGHT': '0'}),
+    ('limite por processo (1)', {'PASSWORD_HASH_MAX_INFLIGHT': '1', 'PASSWORD_HASH_SLOTS_DIR': ''}),
+    ('vagas entre workers (1)', {'PASSWORD_HASH_MAX_INFLIGHT': '1', 'PASSWORD_HASH_SLOTS_DIR': 'SLOTS_DIR'}),
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Não seguir o redirect do login (302 = sucesso)"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def make_opener():
+    return urllib.request.build_opener(
+        urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), NoRedirect()
+    )
+
+
+def login(opener, base, email):
+    data = urllib.parse.urlencode({'email': email, 'password': PASSWORD}).encode()
+    try:
+        with opener.open(f'{base}/auth/login', data=data) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as error:
+        return error.code
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def seed(uri, clients):
+    """Criar o usuário que acompanha o dashboard e os que fazem login"""
+    config = bench_config(uri)
+    config.JINJA_BYTECODE_CACHE_DIR = ''
+    config.PASSWORD_HASH_MAX_INFLIGHT = 0
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        emails = [f'{EMAIL_PREFIX}viewer@bench.local'] + [
+            f'{EMAIL_PREFIX}{i}@bench.local' for i in range(clients)
+        ]
+        for i, email in enumerate(emails):
+            user = User(email=email, first_name='Bench', username=f'{EMAIL_PREFIX}{i}')
+            user.set_password(PASSWORD)
+            db.session.add(user)
+        db.session.commit()
+        db.engine.dispose()
+
+
+def start_gunicorn(workers, port, env):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}',
+         '--log-level', 'warning', 'app:create_app()'],
+        cwd=ROOT, env=env
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('gunicorn não subiu')
+
+
+def run_mode(base, clients, duration):
+    viewer = make_opener()
+    assert login(viewer, base, f'{EMAIL_PREFIX}viewer@bench.local') == 302
+
+    stop = threading.Event()
+    statuses = []
+
+    def storm(index):
+        while not stop.is_set():
+            # Novo opener a cada iteração: sempre um login completo
+            statuses.append(login(make_opener(), base, f'{EMAIL_PREFIX}{index}@bench.local'))
+
+    threads = [threading.Thread(target=storm, args=(i,), daemon=True) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        with viewer.open(f'{base}/dashboard') as response:
+            response.read()
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.02)
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'dashboard_requests': len(latencies),
+        'p50': statistics.median(latencies),
+        'p99': percentile(latencies, 99),
+        'logins_ok': sum(1 for status in statuses if status == 302),
+        'logins_503': sum(1 for status in statuses if status == 503),
+    }
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+
+    tmpdir = tempfile.mkdtemp(prefix='coinctrl-login-storm-')
+    uri = f'sqlite:///{os.path.join(tmpdir, "bench.db")}'
+    try:
+        seed(uri, clients)
+        print(f'gunicorn com {workers} workers sync, {clients} clientes fazendo login '
+              f'por {duration:.0f}s em cada modo\n')
+        print(f"{'modo':<28}{'dash req':>10}{'p50 ms':>10}{'p99 ms':>10}{'login ok':>10}{'503':>8}")
+        for name, options in MODES:
+            options = {
+                key: os.path.join(tmpdir, 'hash_slots') if value == 'SLOTS_DIR' else value
+                for key, value in options.items()
+            }
+            env = dict(
+                os.environ, DATABASE_URL=uri, JINJA_BYTECODE_CACHE_DIR='',
+                SLOW_QUERY_LOG=os.path.join(tmpdir, 'slow_queries.log'), **options
+            )
+            port = free_port()
+            process = start_gunicorn(workers, port, env)
+            try:
+                result = run_mode(f'http://127.0.0.1:{port}', clients, duration)
+            finally:
+                process.terminate()
+                process.wait()
+            print(
+                f"{name:<28}{result['dashboard_requests']:>10}{result['p50']:>10.1f}"
+                f"{result['p99']:>10.1f}{result['logins_ok']:>10}{result['logins_503']:>8}"
+            )
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+# benchmarks/bench_routes.py
+"""Benchmark de rotas: latência e número de consultas por rota, em vários tamanhos.
+
+Para cada tamanho de base (transações por usuário), cria um banco SQLite
+temporário com ``benchmarks/seed.py`` e percorre as rotas de ``main``,
+``auth`` e ``financial`` pelo test client do Flask, medindo p50/p95/p99 e
+consultas SQL por requisição. O resultado é gravado em JSON para comparar
+execuções (``--compare``). Roda offline; as rotas do Google OAuth ficam de
+fora por dependerem da rede.
+
+Uso:
+    python benchmarks/bench_routes.py                         # 1k e 10k transações/usuário
+    python benchmarks/bench_routes.py --sizes 1000,10000,50000 --iterations 50
+    python benchmarks/bench_routes.py --compare benchmarks/results/routes-anterior.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import event  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.auth.cache import user_cache  # noqa: E402
+from app.models import Category, Transaction, TransactionType  # noqa: E402
+from benchmarks.seed import PASSWORD, bench_config, seed_database  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+IMPORT_CSV = (
+    'date,description,amount,type,category\n'
+    + ''.join(f'2024-01-{day:02d},Importada {day},{day}.50,despesa,Mercado\n' for day in range(1, 29))
+).encode()
+
+
+def transaction_form(ctx, **overrides):
+    form = {
+        'description': 'Benchmark', 'amount': '42.50', 'transaction_type': 'despesa',
+        'category_id': str(ctx['expense_category']), 'transaction_date': date.today().isoformat(),
+        'notes': ''
+    }
+    form.update(overrides)
+    return form
+
+
+# (nome, método, caminho, kwargs do test client, autenticado)
+# Caminhos e kwargs podem ser funções do contexto (ids do usuário de benchmark).
+ROUTES = [
+    ('main.index', 'GET', '/', None, True),
+    ('main.dashboard', 'GET', '/dashboard', None, True),
+    ('auth.login GET', 'GET', '/auth/login', None, False),
+    ('auth.register GET', 'GET', '/auth/register', None, False),
+    ('auth.login POST', 'POST', '/auth/login',
+     lambda ctx: {'data': {'email': ctx['email'], 'password': PASSWORD}}, False),
+    ('auth.logout', 'GET', '/auth/logout', None, True),
+    ('financial.dashboard', 'GET', '/financial/', None, True),
+    ('financial.categories', 'GET', '/financial/categories', None, True),
+    ('financial.categories (busca)', 'GET', '/financial/categories?search=merc', None, True),
+    ('financial.new_category GET', 'GET', '/financial/categories/new', None, True),
+    ('financial.new_category POST', 'POST', '/financial/categories/new',
+     lambda ctx: {'data': {'name': f'Categoria {time.perf_counter_ns()}', 'transaction_type': 'despesa',
+                           'color': '#007bff', 'icon': '💰', 'description': ''}}, True),
+    ('financial.edit_category GET', 'GET',
+     lambda ctx: f"/financial/categories/{ctx['expense_category']}/edit", None, True),
+    ('financial.edit_category POST', 'POST',
+     lambda ctx: f"/financial/categories/{ctx['expense_category']}/edit",
+     lambda ctx: {'data': {'name': 'Mercado', 'color': '#28a745', 'icon': '🛒', 'description': ''}}, True),
+    ('financial.delete_category', 'POST',
+     lambda ctx: f"/financial/categories/{ctx['empty_categories'].pop()}/delete", None, True),
+    ('financial.transactions', 'GET', '/financial/transactions', None, True),
+    ('financial.transactions (filtros)', 'GET',
+     lambda ctx: f"/financial/transactions?type=despesa&category={ctx['expense_category']}"
+                 f"&date_from=2024-01-01", None, True),
+    ('financial.transactions (busca)', 'GET', '/financial/transactions?search=padaria', None, True),
+    ('financial.new_transaction GET', 'GET', '/financial/transactions/new', None, True),
+    ('financial.new_transaction POST', 'POST', '/financial/transactions/new',
+     lambda ctx: {'data': transaction_form(ctx)}, True),
+    ('financial.edit_transaction GET', 'GET',
+     lambda ctx: f"/financial/transactions/{ctx['transaction']}/edit", None, True),
+    ('financial.edit_transaction POST', 'POST',
+     lambda ctx: f"/financial/transactions/{ctx['transaction']}/edit",
+     lambda ctx: {'data': transaction_form(ctx, amount='43.00')}, True),
+    ('financial.delete_transaction', 'POST',
+     lambda ctx: f"/financial/transactions/{ctx['disposable_transactions'].pop()}/delete", None, True),
+    ('financial.import_transactions GET', 'GET', '/financial/transactions/import', None, True),
+    ('financial.import_transactions POST', 'POST', '/financial/transactions/import',
+     lambda ctx: {'data': {'file': (io.BytesIO(IMPORT_CSV), 'extrato.csv')},
+                  'content_type': 'multipart/form-data'}, True),
+    ('financial.export_transactions csv', 'GET', '/financial/transactions/export.csv', None, True),
+    ('financial.export_transactions ndjson', 'GET', '/financial/transactions/export.ndjson', None, True),
+    ('financial.reports', 'GET', '/financial/reports', None, True),
+    ('financial.api_categories_by_type', 'GET', '/financial/api/categories/despesa', None, True),
+    ('financial.api_transactions', 'GET', '/financial/api/transactions', None, True),
+    ('financial.api_search', 'GET', '/financial/api/search?q=uber', None, True),
+    ('financial.api_reports', 'GET', '/financial/api/reports', None, True),
+    ('financial.api_insights', 'GET', '/financial/api/insights', None, True),
+    ('financial.api_budgets', 'GET', '/financial/api/budgets', None, True),
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def logged_in(client, user_id):
+    """Autenticar o client direto na sessão (sem pagar o hash da senha)"""
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+
+def prepare_context(user_id, iterations):
+    """IDs usados pelas rotas de edição/exclusão (um item descartável por iteração)"""
+    expense_category = db.session.execute(
+        db.select(Category.id)
+        .where(Category.user_id == user_id, Category.transaction_type == TransactionType.DESPESA,
+               Category.name == 'Mercado')
+    ).scalar()
+    transaction = db.session.execute(
+        db.select(Transaction.id).where(Transaction.user_id == user_id).limit(1)
+    ).scalar()
+    
+    empty = [Category(name=f'Vazia {n}', transaction_type=TransactionType.DESPESA, user_id=user_id)
+             for n in range(iterations)]
+    db.session.add_all(empty)
+    db.session.flush()
+    disposable = db.session.execute(
+        db.select(Transaction.id).where(Transaction.user_id == user_id)
+        .order_by(Transaction.id.desc()).limit(iterations)
+    ).scalars().all()
+    db.session.commit()
+    return {
+        'expense_category': expense_category,
+        'transaction': transaction,
+        'empty_categories': [category.id for category in empty],
+        'disposable_transactions': list(disposable),
+    }
+
+
+def run_route(app, route, ctx, user_id, iterations, warmup, queries):
+    name, method, path, kwargs, authenticated = route
+    latencies, counts, statuses = [], [], set()
+    for n in range(warmup + iterations):
+        client = app.test_client()
+        if authenticated:
+            logged_in(client, user_id)
+        url = path(ctx) if callable(path) else path
+        options = kwargs(ctx) if callable(kwargs) else {}
+        
+        queries.clear()
+        started = time.perf_counter()
+        response = client.open(url, method=method, **options)
+        response.get_data()  # consumir respostas em streaming (exportação)
+        elapsed = (time.perf_counter() - started) * 1000
+        response.close()
+        
+        if n >= warmup:
+            latencies.append(elapsed)
+            counts.append(len(queries))
+            statuses.add(response.status_code)
+    return {
+        'p50_ms': round(statistics.median(latencies), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'mean_ms': round(statistics.fmean(latencies), 2),
+        'queries': round(statistics.fmean(counts), 1),
+        'status': sorted(statuses),
+    }
+
+
+def run_size(size, users, categories, iterations, warmup, routes):
+    tmpdir = tempfile.mkdtemp(prefix='coinctrl-routes-')
+    try:
+        config = bench_config(f'sqlite:///{os.path.join(tmpdir, "bench.db")}')
+        config.LOGIN_RATE_LIMIT_ENABLED = False  # o login POST repete o mesmo email
+        app = create_app(config)
+        user_cache.clear()
+        
+        queries = []
+        with app.app_context():
+            started = time.perf_counter()
+            user_ids = seed_database(users=users, categories=categories, transactions=size)
+            seed_seconds = time.perf_counter() - started
+            
+            engines = list(db.engines.values())
+            if 'db_read_engine' in app.extensions:
+                engines.append(app.extensions['db_read_engine'])
+            for engine in engines:
+                event.listen(engine, 'before_cursor_execute',
+                             lambda *args, **kwargs: queries.append(args[2]))
+            
+            user_id = user_ids[0]
+            ctx = prepare_context(user_id, iterations + warmup)
+            ctx['email'] = 'bench0@bench.local'
+        
+        results = {}
+        for route in routes:
+            results[route[0]] = run_route(app, route, ctx, user_id, iterations, warmup, queries)
+            print(f"  {route[0]:<42}{results[route[0]]['p50_ms']:>9.1f}{results[route[0]]['p95_ms']:>9.1f}"
+                  f"{results[route[0]]['p99_ms']:>9.1f}{results[route[0]]['queries']:>9.1f}"
+                  f"  {','.join(map(str, results[route[0]]['status']))}")
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+        return {
+            'transactions_per_user': size,
+            'users': users,
+            'categories_per_user': categories,
+            'seed_seconds': round(seed_seconds, 2),
+            'routes': results,
+        }
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def environment():
+    """Metadados da execução (para comparar resultados entre máquinas/commits)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(current, previous_path):
+    """Imprimir a variação de p50 e consultas em relação a uma execução anterior"""
+    with open(previous_path) as f:
+        previous = json.load(f)
+    before = {run['transactions_per_user']: run['routes'] for run in previous['runs']}
+    print(f"\nComparação com {previous_path} ({previous['environment'].get('commit')})")
+    for run in current['runs']:
+        old_routes = before.get(run['transactions_per_user'])
+        if not old_routes:
+            continue
+        print(f"\n{run['transactions_per_user']} transações/usuário"
+              f"\n  {'rota':<42}{'p50 antes':>11}{'p50 agora':>11}{'Δ%':>8}{'consultas':>14}")
+        for name, result in run['routes'].items():
+            old = old_routes.get(name)
+            if not old:
+                continue
+            delta = (result['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0.0
+            print(f"  {name:<42}{old['p50_ms']:>11.1f}{result['p50_ms']:>11.1f}{delta:>+8.0f}"
+                  f"{old['queries']:>7.1f} → {result['queries']:<5.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de rotas (latência e consultas).')
+    parser.add_argument('--sizes', default='1000,10000', help='transações por usuário, separadas por vírgula')
+    parser.add_argument('--users', type=int, default=3)
+    parser.add_argument('--categories', type=int, default=12)
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--routes', help='filtrar rotas cujo nome contém este texto')
+    parser.add_argument('--output', help='arquivo JSON de saída (padrão: benchmarks/results/)')
+    parser.add_argument('--compare', help='JSON de uma execução anterior para comparar')
+    args = parser.parse_args()
+    
+    routes = [route for route in ROUTES if not args.routes or args.routes in route[0]]
+    report = {'environment': environment(), 'iterations': args.iterations, 'runs': []}
+    for size in (int(value) for value in args.sizes.split(',')):
+        print(f'\n{size} transações/usuário ({args.users} usuários)')
+        print(f"  {'rota':<42}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}  status")
+        report['runs'].append(run_size(size, args.users, args.categories,
+                                       args.iterations, args.warmup, routes))
+    
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"routes-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f'\n💾 Resultados em {output}')
+    
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
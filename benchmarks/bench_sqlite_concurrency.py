@@ -0,0 +1,221 @@
+# benchmarks/bench_sqlite_concurrency.py
+"""Benchmark: leituras e escritas concorrentes no SQLite com vários workers gunicorn.
+
+Sobe o gunicorn (workers sync) sobre um banco temporário e dispara clientes
+em paralelo: a maioria lê a lista de transações e o restante cria
+transações. Compara o SQLite padrão (journal DELETE, sem busy_timeout)
+com os PRAGMAs de app.database (WAL, synchronous=NORMAL, busy_timeout,
+cache_size, mmap_size). Erros de "database is locked" aparecem como
+escritas falhas.
+
+Uso:
+    python benchmarks/bench_sqlite_concurrency.py              # 4 workers, 16 clientes, 15s
+    python benchmarks/bench_sqlite_concurrency.py 8 32 30
+"""
+import http.cookiejar
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import create_app, db  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.financial.ledger import rebuild_user  # noqa: E402
+from app.models import Category, Transaction, TransactionType, User  # noqa: E402
+
+PASSWORD = 'Bench123!'
+USERS = 4
+TRANSACTIONS_PER_USER = 5000
+WRITE_RATIO = 0.2
+
+MODES = [
+    ('SQLite padrão', '0'),
+    ('WAL + PRAGMAs', '1'),
+]
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Não seguir redirects: o Location indica sucesso ou falha da escrita"""
+    
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def seed(uri, pragmas):
+    """Criar banco com usuários, categorias e transações"""
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = uri
+        SQLITE_PRAGMAS = pragmas
+    
+    app = create_app(BenchConfig)
+    rng = random.Random(42)
+    categories = {}
+    with app.app_context():
+        db.create_all()
+        for i in range(USERS):
+            user = User(email=f'bench{i}@bench.local', first_name='Bench', username=f'bench{i}')
+            user.set_password(PASSWORD)
+            db.session.add(user)
+            db.session.flush()
+            expense = Category(name='Mercado', transaction_type=TransactionType.DESPESA, user_id=user.id)
+            income = Category(name='Salário', transaction_type=TransactionType.RECEITA, user_id=user.id)
+            db.session.add_all([expense, income])
+            db.session.flush()
+            categories[i] = expense.id
+            
+            start = date.today() - timedelta(days=730)
+            rows = [{
+                'description': f'Compra {n}',
+                'amount': round(rng.uniform(5, 500), 2),
+                'transaction_type': TransactionType.DESPESA.name,
+                'transaction_date': start + timedelta(days=rng.randrange(730)),
+                'category_id': expense.id,
+                'user_id': user.id,
+            } for n in range(TRANSACTIONS_PER_USER)]
+            db.session.execute(Transaction.__table__.insert(), rows)
+            rebuild_user(user.id)
+        db.session.commit()
+        db.engine.dispose()
+    return categories
+
+
+def start_gunicorn(workers, port, env):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}',
+         '--log-level', 'warning', 'app:create_app()'],
+        cwd=ROOT, env=env
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('gunicorn não subiu')
+
+
+def client(base, index, category_id, stop, results):
+    opener = urllib.request.build_opener(
+        urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), NoRedirect()
+    )
+    data = urllib.parse.urlencode({
+        'email': f'bench{index % USERS}@bench.local', 'password': PASSWORD
+    }).encode()
+    try:
+        opener.open(f'{base}/auth/login', data=data)
+    except urllib.error.HTTPError:
+        pass  # 302 = login ok
+    
+    rng = random.Random(index)
+    while not stop.is_set():
+        write = rng.random() < WRITE_RATIO
+        start = time.perf_counter()
+        try:
+            if write:
+                form = urllib.parse.urlencode({
+                    'description': 'Bench', 'amount': '12.34', 'transaction_type': 'despesa',
+                    'category_id': str(category_id), 'transaction_date': date.today().isoformat()
+                }).encode()
+                opener.open(f'{base}/financial/transactions/new', data=form)
+                ok = False  # sem redirect não há confirmação
+            else:
+                with opener.open(f'{base}/financial/transactions') as response:
+                    response.read()
+                ok = True
+        except urllib.error.HTTPError as error:
+            # Escrita bem-sucedida redireciona para a lista de transações
+            ok = error.code == 302 and error.headers.get('Location', '').endswith('/financial/transactions')
+        except OSError:
+            ok = False
+        results.append((write, ok, (time.perf_counter() - start) * 1000))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_mode(workers, clients, duration, pragmas_flag):
+    tmpdir = tempfile.mkdtemp(prefix='coinctrl-bench-')
+    uri = f'sqlite:///{os.path.join(tmpdir, "bench.db")}'
+    try:
+        pragmas = Config.SQLITE_PRAGMAS if pragmas_flag == '1' else {}
+        categories = seed(uri, pragmas)
+        
+        env = dict(os.environ, DATABASE_URL=uri, SQLITE_PRAGMAS=pragmas_flag)
+        port = free_port()
+        process = start_gunicorn(workers, port, env)
+        try:
+            stop = threading.Event()
+            results = []
+            threads = [
+                threading.Thread(
+                    target=client,
+                    args=(f'http://127.0.0.1:{port}', i, categories[i % USERS], stop, results),
+                    daemon=True
+                )
+                for i in range(clients)
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            process.terminate()
+            process.wait()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    
+    reads = [ms for write, ok, ms in results if not write and ok]
+    writes = [ms for write, ok, ms in results if write and ok]
+    failed = sum(1 for write, ok, _ in results if not ok)
+    return {
+        'reads_s': len(reads) / duration,
+        'writes_s': len(writes) / duration,
+        'failed': failed,
+        'read_p99': percentile(reads, 99) if reads else 0.0,
+        'write_p99': percentile(writes, 99) if writes else 0.0,
+        'read_p50': statistics.median(reads) if reads else 0.0,
+    }
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 15.0
+    
+    print(f'gunicorn com {workers} workers, {clients} clientes, {duration:.0f}s por modo '
+          f'({int(WRITE_RATIO * 100)}% escritas)\n')
+    print(f"{'modo':<16}{'leituras/s':>12}{'escritas/s':>12}{'falhas':>8}"
+          f"{'leit. p50':>11}{'leit. p99':>11}{'escr. p99':>11}")
+    for name, flag in MODES:
+        result = run_mode(workers, clients, duration, flag)
+        print(f"{name:<16}{result['reads_s']:>12.1f}{result['writes_s']:>12.1f}{result['failed']:>8}"
+              f"{result['read_p50']:>10.0f}ms{result['read_p99']:>9.0f}ms{result['write_p99']:>9.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
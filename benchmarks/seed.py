@@ -0,0 +1,202 @@
+# benchmarks/seed.py
+"""Gerador de dados sintéticos: N usuários × M categorias × K transações.
+
+As transações seguem distribuições próximas do uso real: salário e
+receitas extras mensais, despesas com valores log-normais, mais compras
+perto do fim de semana e poucas categorias concentrando a maior parte dos
+gastos (pesos de Zipf). Tudo é gravado com INSERTs em lote e os totais
+derivados (saldos, totais mensais, contadores de categorias) são
+reconstruídos ao final pelo ledger.
+
+Uso:
+    python benchmarks/seed.py --database sqlite:////tmp/coinctrl-bench.db
+    python benchmarks/seed.py --users 20 --categories 15 --transactions 20000 --database ...
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.financial.ledger import rebuild_user  # noqa: E402
+from app.models import Category, Transaction, TransactionType, User  # noqa: E402
+
+PASSWORD = 'Bench123!'
+BATCH_SIZE = 5000
+INCOME_SHARE = 0.08  # fração das transações que são receitas
+
+INCOME_CATEGORIES = [
+    ('Salário', '💼'), ('Freelance', '💻'), ('Investimentos', '📈'), ('Aluguel recebido', '🏠'),
+    ('Reembolsos', '↩️'),
+]
+EXPENSE_CATEGORIES = [
+    ('Alimentação', '🍽️'), ('Mercado', '🛒'), ('Transporte', '🚗'), ('Moradia', '🏠'),
+    ('Saúde', '💊'), ('Lazer', '🎉'), ('Educação', '📚'), ('Assinaturas', '📺'),
+    ('Vestuário', '👕'), ('Viagens', '✈️'), ('Presentes', '🎁'), ('Pets', '🐶'),
+    ('Impostos', '🧾'), ('Serviços', '🔧'), ('Doações', '🤝'),
+]
+EXPENSE_DESCRIPTIONS = [
+    'Padaria', 'Supermercado', 'Uber', 'Combustível', 'Farmácia', 'Restaurante', 'Cinema',
+    'Streaming', 'Conta de luz', 'Internet', 'Academia', 'Livraria', 'Pet shop', 'Estacionamento',
+]
+COLORS = ['#007bff', '#28a745', '#dc3545', '#ffc107', '#17a2b8', '#6f42c1', '#fd7e14', '#20c997']
+
+
+def bench_config(database_url):
+    """Configuração com o banco indicado (demais opções de app.config.Config)"""
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+    return BenchConfig
+
+
+def zipf_weights(n, s=1.1):
+    """Pesos de Zipf: poucas categorias concentram a maioria das transações"""
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def random_day(rng, start, days):
+    """Data no intervalo, com mais compras de sexta a domingo"""
+    while True:
+        day = start + timedelta(days=rng.randrange(days))
+        if day.weekday() >= 4 or rng.random() < 0.7:
+            return day
+
+
+def generate_transactions(rng, user_id, incomes, expenses, count, days, today):
+    """Gerar ``count`` transações (dicts) para o usuário nos últimos ``days`` dias"""
+    start = today - timedelta(days=days)
+    expense_weights = zipf_weights(len(expenses))
+    # Valor típico por categoria (log-normal em torno de R$ 20 a R$ 400)
+    typical = {category_id: math.log(rng.uniform(20, 400)) for category_id in expenses}
+    salary = round(rng.uniform(2500, 15000), 2)
+    
+    rows = []
+    income_count = max(1, int(count * INCOME_SHARE)) if incomes else 0
+    # Salário: todo dia 5, no mesmo valor; o restante são receitas extras
+    paydays = [
+        day for day in (
+            date(start.year + (start.month - 1 + n) // 12, (start.month - 1 + n) % 12 + 1, 5)
+            for n in range(days // 28 + 2)
+        )
+        if start <= day <= today
+    ][:income_count]
+    for day in paydays:
+        rows.append((incomes[0], TransactionType.RECEITA, 'Salário', salary, day))
+    for _ in range(income_count - len(paydays)):
+        rows.append((rng.choice(incomes), TransactionType.RECEITA, 'Receita extra',
+                     round(rng.lognormvariate(6.5, 0.8), 2), start + timedelta(days=rng.randrange(days))))
+    
+    for _ in range(count - income_count):
+        category_id = rng.choices(expenses, expense_weights)[0]
+        amount = round(max(1.0, rng.lognormvariate(typical[category_id], 0.6)), 2)
+        rows.append((category_id, TransactionType.DESPESA, rng.choice(EXPENSE_DESCRIPTIONS),
+                     amount, random_day(rng, start, days)))
+    
+    rows.sort(key=lambda row: row[4])
+    now = datetime.utcnow()
+    return [
+        {
+            'description': description,
+            'amount': amount,
+            'transaction_type': transaction_type.name,
+            'transaction_date': day,
+            'notes': None,
+            'category_id': category_id,
+            'user_id': user_id,
+            'created_at': now - timedelta(days=(today - day).days),
+        }
+        for category_id, transaction_type, description, amount, day in rows
+    ]
+
+
+def seed_database(users=5, categories=12, transactions=1000, days=730, seed=42, email_prefix='bench'):
+    """Popular o banco da aplicação atual (dentro de um app context)
+    
+    Args:
+        users: Número de usuários
+        categories: Categorias por usuário (receitas + despesas)
+        transactions: Transações por usuário
+        days: Janela de datas das transações (até hoje)
+        seed: Semente do gerador (dados reproduzíveis)
+        email_prefix: Prefixo dos emails (``bench0@bench.local``, ...)
+    
+    Returns:
+        list: IDs dos usuários criados
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    income_total = max(1, min(len(INCOME_CATEGORIES), categories // 4))
+    expense_total = max(1, min(len(EXPENSE_CATEGORIES), categories - income_total))
+    
+    # Um único hash para todos (600 mil iterações por hash tornariam a geração lenta)
+    seed_user = User(email='seed@bench.local')
+    seed_user.set_password(PASSWORD)
+    password_hash = seed_user.password_hash
+    
+    db.create_all()
+    user_ids = []
+    for index in range(users):
+        user = User(
+            email=f'{email_prefix}{index}@bench.local',
+            first_name=f'Usuário {index}',
+            username=f'{email_prefix}{index}',
+            password_hash=password_hash,
+            auth_provider='local'
+        )
+        db.session.add(user)
+        db.session.flush()
+        user_ids.append(user.id)
+        
+        category_rows = [
+            {'name': name, 'icon': icon, 'color': rng.choice(COLORS),
+             'transaction_type': TransactionType.RECEITA.name, 'user_id': user.id}
+            for name, icon in INCOME_CATEGORIES[:income_total]
+        ] + [
+            {'name': name, 'icon': icon, 'color': rng.choice(COLORS),
+             'transaction_type': TransactionType.DESPESA.name, 'user_id': user.id}
+            for name, icon in EXPENSE_CATEGORIES[:expense_total]
+        ]
+        db.session.execute(Category.__table__.insert(), category_rows)
+        ids = dict(db.session.execute(
+            db.select(Category.name, Category.id).where(Category.user_id == user.id)
+        ).all())
+        incomes = [ids[name] for name, _ in INCOME_CATEGORIES[:income_total]]
+        expenses = [ids[name] for name, _ in EXPENSE_CATEGORIES[:expense_total]]
+        
+        rows = generate_transactions(rng, user.id, incomes, expenses, transactions, days, today)
+        for start in range(0, len(rows), BATCH_SIZE):
+            db.session.execute(Transaction.__table__.insert(), rows[start:start + BATCH_SIZE])
+        
+        rebuild_user(user.id)
+        db.session.commit()
+    return user_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gerar dados sintéticos para benchmarks.')
+    parser.add_argument('--database', required=True, help='URL do banco (ex.: sqlite:////tmp/bench.db)')
+    parser.add_argument('--users', type=int, default=5)
+    parser.add_argument('--categories', type=int, default=12, help='categorias por usuário')
+    parser.add_argument('--transactions', type=int, default=1000, help='transações por usuário')
+    parser.add_argument('--days', type=int, default=730, help='janela de datas (dias até hoje)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    app = create_app(bench_config(args.database))
+    started = time.perf_counter()
+    with app.app_context():
+        user_ids = seed_database(args.users, args.categories, args.transactions, args.days, args.seed)
+    elapsed = time.perf_counter() - started
+    total = len(user_ids) * args.transactions
+    print(f'✅ {len(user_ids)} usuários, {total} transações em {elapsed:.1f}s '
+          f'(login: bench0@bench.local / {PASSWORD})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+# gunicorn.conf.py
+"""Configuração do gunicorn (lida automaticamente a partir do diretório atual).
+
+A aplicação é carregada uma vez no processo mestre (``preload_app``) e os
+templates são compilados antes do fork; ver ``app/workers.py``.
+"""
+import os
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from app.workers import precompile_templates
+    count = precompile_templates(server.app.wsgi())
+    server.log.info('Templates compilados antes do fork: %s', count)
@@ -0,0 +1,86 @@
+"""Esquema inicial: usuários, categorias e transações
+
+Revision ID: 0f1a2b3c4d00
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0f1a2b3c4d00'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # As tabelas podem já existir (instalações criadas com db.create_all antes
+    # das migrações): nesse caso esta revisão não altera nada
+    transaction_type = sa.Enum('RECEITA', 'DESPESA', name='transactiontype')
+    
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('first_name', sa.String(length=80), nullable=False),
+        sa.Column('last_name', sa.String(length=80), nullable=True),
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_login', sa.DateTime(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('login_attempts', sa.Integer(), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('google_id', sa.String(length=100), nullable=True),
+        sa.Column('profile_picture', sa.String(length=255), nullable=True),
+        sa.Column('auth_provider', sa.String(length=20), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('google_id'),
+        sa.UniqueConstraint('username'),
+        if_not_exists=True
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True, if_not_exists=True)
+    
+    op.create_table(
+        'categories',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('color', sa.String(length=7), nullable=True),
+        sa.Column('icon', sa.String(length=50), nullable=True),
+        sa.Column('transaction_type', transaction_type, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    
+    op.create_table(
+        'transactions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('description', sa.String(length=200), nullable=False),
+        sa.Column('amount', sa.Numeric(10, 2), nullable=False),
+        sa.Column('transaction_type', transaction_type, nullable=False),
+        sa.Column('transaction_date', sa.Date(), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('transactions')
+    op.drop_table('categories')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+    sa.Enum(name='transactiontype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,42 @@
+"""Índices compostos para as consultas de transações e categorias
+
+Revision ID: 1a2b3c4d5e01
+Revises: 0f1a2b3c4d00
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1a2b3c4d5e01'
+down_revision = '0f1a2b3c4d00'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_transactions_user_date', 'transactions',
+                    ['user_id', 'transaction_date', 'created_at', 'id'], if_not_exists=True)
+    op.create_index('ix_transactions_user_type_date', 'transactions',
+                    ['user_id', 'transaction_type', 'transaction_date', 'created_at', 'id'],
+                    if_not_exists=True)
+    op.create_index('ix_transactions_user_category_date', 'transactions',
+                    ['user_id', 'category_id', 'transaction_date', 'created_at', 'id'],
+                    if_not_exists=True)
+    op.create_index('ix_transactions_category', 'transactions',
+                    ['category_id'], if_not_exists=True)
+    op.create_index('ix_transactions_user_created', 'transactions',
+                    ['user_id', 'created_at'], if_not_exists=True)
+    op.create_index('ix_categories_user_type_name', 'categories',
+                    ['user_id', 'transaction_type', 'name'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_categories_user_type_name', table_name='categories')
+    op.drop_index('ix_transactions_user_created', table_name='transactions')
+    op.drop_index('ix_transactions_category', table_name='transactions')
+    op.drop_index('ix_transactions_user_category_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_type_date', table_name='transactions')
+    op.drop_index('ix_transactions_user_date', table_name='transactions')
@@ -0,0 +1,88 @@
+"""Índice de busca textual FTS5 para transações e categorias (SQLite)
+
+Revision ID: 2b3c4d5e6f02
+Revises: 1a2b3c4d5e01
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2b3c4d5e6f02'
+down_revision = '1a2b3c4d5e01'
+branch_labels = None
+depends_on = None
+
+# DDL fixo desta revisão (cópia do que app.financial.search criava nesta data).
+# Não importar do módulo: mudanças posteriores nele alterariam esta migração;
+# um esquema FTS novo pede uma nova revisão.
+TOKENIZER = "unicode61 remove_diacritics 2"
+
+FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, notes,
+        content='transactions', content_rowid='id',
+        tokenize="{TOKENIZER}"
+    )""",
+    "INSERT INTO transactions_fts(transactions_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description, notes ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+        INSERT INTO transactions_fts(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END""",
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS categories_fts USING fts5(
+        name,
+        content='categories', content_rowid='id',
+        tokenize="{TOKENIZER}"
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS categories_fts_ai AFTER INSERT ON categories BEGIN
+        INSERT INTO categories_fts(rowid, name) VALUES (new.id, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS categories_fts_ad AFTER DELETE ON categories BEGIN
+        INSERT INTO categories_fts(categories_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS categories_fts_au AFTER UPDATE OF name ON categories BEGIN
+        INSERT INTO categories_fts(categories_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO categories_fts(rowid, name) VALUES (new.id, new.name);
+    END""",
+]
+
+FTS_REBUILD = [
+    "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')",
+    "INSERT INTO categories_fts(categories_fts) VALUES ('rebuild')",
+]
+
+FTS_DROP_DDL = [
+    "DROP TRIGGER IF EXISTS categories_fts_au",
+    "DROP TRIGGER IF EXISTS categories_fts_ad",
+    "DROP TRIGGER IF EXISTS categories_fts_ai",
+    "DROP TABLE IF EXISTS categories_fts",
+    "DROP TRIGGER IF EXISTS transactions_fts_au",
+    "DROP TRIGGER IF EXISTS transactions_fts_ad",
+    "DROP TRIGGER IF EXISTS transactions_fts_ai",
+    "DROP TABLE IF EXISTS transactions_fts",
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in FTS_DDL + FTS_REBUILD:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in FTS_DROP_DDL:
+        op.execute(statement)
@@ -0,0 +1,57 @@
+"""Contadores de uso por categoria (quantidade, total e última transação)
+
+Revision ID: 3c4d5e6f7a03
+Revises: 2b3c4d5e6f02
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c4d5e6f7a03'
+down_revision = '2b3c4d5e6f02'
+branch_labels = None
+depends_on = None
+
+BACKFILL = """
+UPDATE categories SET
+    transaction_count = (
+        SELECT count(*) FROM transactions t
+        WHERE t.user_id = categories.user_id AND t.category_id = categories.id
+    ),
+    total_amount = (
+        SELECT coalesce(sum(t.amount), 0) FROM transactions t
+        WHERE t.user_id = categories.user_id AND t.category_id = categories.id
+    ),
+    last_transaction_date = (
+        SELECT max(t.transaction_date) FROM transactions t
+        WHERE t.user_id = categories.user_id AND t.category_id = categories.id
+    )
+"""
+
+
+COLUMNS = [
+    sa.Column('transaction_count', sa.Integer(), nullable=False, server_default='0'),
+    sa.Column('total_amount', sa.Numeric(14, 2), nullable=False, server_default='0'),
+    sa.Column('last_transaction_date', sa.Date(), nullable=True),
+]
+
+
+def upgrade():
+    # Banco criado com db.create_all já tem as colunas: só recalcular os contadores
+    existing = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('categories')}
+    for column in COLUMNS:
+        if column.name not in existing:
+            op.add_column('categories', column)
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    # DROP COLUMN nativo (SQLite 3.35+): recriar a tabela em lote apagaria os triggers FTS
+    for column in ('last_transaction_date', 'total_amount', 'transaction_count'):
+        if op.get_bind().dialect.name == 'sqlite':
+            op.execute(f'ALTER TABLE categories DROP COLUMN {column}')
+        else:
+            op.drop_column('categories', column)
@@ -0,0 +1,56 @@
+"""Orçamentos mensais por categoria com contador de gasto
+
+Revision ID: 4d5e6f7a8b04
+Revises: 3c4d5e6f7a03
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d5e6f7a8b04'
+down_revision = '3c4d5e6f7a03'
+branch_labels = None
+depends_on = None
+
+# Mesma soma de Budget.compute, para todos os orçamentos. A tabela pode já
+# existir (banco criado com db.create_all): o gasto é sempre recalculado.
+BACKFILL = """
+UPDATE budgets SET spent = (
+    SELECT coalesce(sum(t.amount), 0) FROM transactions t
+    WHERE t.user_id = budgets.user_id
+      AND t.category_id = budgets.category_id
+      AND t.transaction_type = 'DESPESA'
+      AND substr(CAST(t.transaction_date AS VARCHAR(10)), 1, 7) = budgets.period
+)
+"""
+
+
+def upgrade():
+    op.create_table(
+        'budgets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=7), nullable=False),
+        sa.Column('amount', sa.Numeric(14, 2), nullable=False),
+        sa.Column('spent', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_budgets_category_period', 'budgets', ['category_id', 'period'],
+                    unique=True, if_not_exists=True)
+    op.create_index('ix_budgets_user_period', 'budgets', ['user_id', 'period'], if_not_exists=True)
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    op.drop_index('ix_budgets_user_period', table_name='budgets')
+    op.drop_index('ix_budgets_category_period', table_name='budgets')
+    op.drop_table('budgets')
@@ -0,0 +1,54 @@
+"""Saldo consolidado por usuário (user_balances), preenchido a partir das transações
+
+Revision ID: 5e6f7a8b9c05
+Revises: 4d5e6f7a8b04
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e6f7a8b9c05'
+down_revision = '4d5e6f7a8b04'
+branch_labels = None
+depends_on = None
+
+# Mesma agregação condicional de UserBalance.compute, para todos os usuários.
+# A tabela pode já existir (banco criado com db.create_all): os saldos são
+# sempre recalculados, então a migração pode rodar em qualquer um dos casos.
+BACKFILL = [
+    "DELETE FROM user_balances",
+    """
+    INSERT INTO user_balances (user_id, receitas, despesas, transaction_count, updated_at)
+    SELECT
+        user_id,
+        coalesce(sum(CASE WHEN transaction_type = 'RECEITA' THEN amount ELSE 0 END), 0),
+        coalesce(sum(CASE WHEN transaction_type = 'DESPESA' THEN amount ELSE 0 END), 0),
+        count(id),
+        CURRENT_TIMESTAMP
+    FROM transactions
+    GROUP BY user_id
+    """,
+]
+
+
+def upgrade():
+    op.create_table(
+        'user_balances',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('receitas', sa.Numeric(14, 2), nullable=False),
+        sa.Column('despesas', sa.Numeric(14, 2), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id'),
+        if_not_exists=True
+    )
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade():
+    op.drop_table('user_balances')
@@ -0,0 +1,59 @@
+"""Totais mensais por categoria (monthly_rollups), preenchidos a partir das transações
+
+Revision ID: 6f7a8b9c0d06
+Revises: 5e6f7a8b9c05
+Create Date: 2026-10-17 22:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f7a8b9c0d06'
+down_revision = '5e6f7a8b9c05'
+branch_labels = None
+depends_on = None
+
+# Mesmo agrupamento de MonthlyRollup.compute (mês 'AAAA-MM', categoria e tipo),
+# para todos os usuários. Recalcula tudo, inclusive se a tabela já existia
+# (db.create_all) com meses faltando.
+BACKFILL = [
+    "DELETE FROM monthly_rollups",
+    """
+    INSERT INTO monthly_rollups (user_id, period, category_id, transaction_type, total, count)
+    SELECT
+        user_id,
+        substr(CAST(transaction_date AS VARCHAR(10)), 1, 7),
+        category_id,
+        transaction_type,
+        sum(amount),
+        count(id)
+    FROM transactions
+    GROUP BY user_id, substr(CAST(transaction_date AS VARCHAR(10)), 1, 7), category_id, transaction_type
+    """,
+]
+
+
+def upgrade():
+    op.create_table(
+        'monthly_rollups',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=7), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        # O tipo enum já existe (coluna transactions.transaction_type no PostgreSQL)
+        sa.Column('transaction_type', sa.Enum('RECEITA', 'DESPESA', name='transactiontype', create_type=False),
+                  nullable=False),
+        sa.Column('total', sa.Numeric(14, 2), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'period', 'category_id', 'transaction_type'),
+        if_not_exists=True
+    )
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade():
+    op.drop_table('monthly_rollups')
@@ -0,0 +1,34 @@
+"""Versão dos dados de cada usuário (user_data_versions), usada no ETag e no cache de fragmentos
+
+Revision ID: 7a8b9c0d1e07
+Revises: 6f7a8b9c0d06
+Create Date: 2026-10-17 22:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a8b9c0d1e07'
+down_revision = '6f7a8b9c0d06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Sem preenchimento: usuário sem linha está na versão 0, e a primeira
+    # escrita cria a linha (UserDataVersion.bump)
+    op.create_table(
+        'user_data_versions',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('user_data_versions')
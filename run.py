@@ -1,18 +1,23 @@
 # run.py
 import os
 from app import create_app, db
+from flask_migrate import upgrade
 from dotenv import load_dotenv
 load_dotenv()
-# PERMITIR HTTP EM DESENVOLVIMENTO (apenas para desenvolvimento local)
-os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 
 app = create_app()
 
 if __name__ == '__main__':
+    # PERMITIR HTTP EM DESENVOLVIMENTO (apenas no servidor local, nunca no gunicorn)
+    os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
+    
     with app.app_context():
+        # Tabelas novas pelo create_all; as migrações (idempotentes) completam
+        # um banco existente e registram a revisão atual
         db.create_all()
+        upgrade()
         print("✅ Banco de dados criado!")
     
     print("�� Servidor iniciando em http://127.0.0.1:5000")
     print("⚠️  ATENÇÃO: OAUTHLIB_INSECURE_TRANSPORT ativado para desenvolvimento")
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
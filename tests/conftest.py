@@ -0,0 +1,83 @@
+# tests/conftest.py
+"""Fixtures: aplicação com banco SQLite temporário e um usuário com histórico"""
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app import create_app, db
+from app.auth.cache import user_cache
+from app.fragments import fragment_cache
+from benchmarks.seed import bench_config, seed_database
+
+
+@pytest.fixture
+def config_overrides():
+    """Opções extras de configuração; sobrescreva no módulo de teste"""
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, config_overrides):
+    config = bench_config(f'sqlite:///{tmp_path / "test.db"}')
+    config.TESTING = True
+    config.WTF_CSRF_ENABLED = False
+    config.LOGIN_RATE_LIMIT_ENABLED = False
+    config.JINJA_BYTECODE_CACHE_DIR = ''
+    config.SLOW_QUERY_LOG = str(tmp_path / 'slow_queries.log')
+    config.PASSWORD_HASH_SLOTS_DIR = str(tmp_path / 'hash_slots')
+    for key, value in config_overrides.items():
+        setattr(config, key, value)
+    app = create_app(config)
+    user_cache.clear()
+    fragment_cache.clear()
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def user_id(app):
+    """Usuário com categorias e algumas centenas de transações"""
+    with app.app_context():
+        return seed_database(users=1, categories=8, transactions=300)[0]
+
+
+@pytest.fixture
+def client(app, user_id):
+    """Cliente de teste já autenticado como ``user_id``"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+
+@pytest.fixture
+def count_queries(app):
+    """Contar as instruções SQL enviadas ao banco (todos os engines)
+    
+    Uso: ``with count_queries() as queries: ...`` e depois ``len(queries)``.
+    """
+    @contextmanager
+    def counter():
+        queries = []
+        
+        def record(conn, cursor, statement, *args):
+            queries.append(statement)
+        
+        with app.app_context():
+            engines = set(db.engines.values())
+        if 'db_read_engine' in app.extensions:
+            engines.add(app.extensions['db_read_engine'])
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield queries
+        finally:
+            for engine in engines:
+                event.remove(engine, 'before_cursor_execute', record)
+    
+    return counter
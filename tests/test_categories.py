@@ -0,0 +1,45 @@
+# tests/test_categories.py
+"""Exclusão de categorias com o banco checando chaves estrangeiras"""
+from datetime import date
+import pytest
+from app import db
+from app.config import Config
+from app.models import Category, MonthlyRollup, Transaction, TransactionType
+
+
+@pytest.fixture
+def config_overrides():
+    # PostgreSQL sempre checa as chaves estrangeiras; no SQLite é preciso ligar
+    return {'SQLITE_PRAGMAS': dict(Config.SQLITE_PRAGMAS, foreign_keys='ON')}
+
+
+def test_delete_category_after_its_last_transaction(app, client, user_id):
+    with app.app_context():
+        category = Category(name='Temporária', transaction_type=TransactionType.DESPESA, user_id=user_id)
+        db.session.add(category)
+        db.session.commit()
+        category_id = category.id
+    
+    response = client.post('/financial/transactions/new', data={
+        'description': 'Única',
+        'amount': '15.00',
+        'transaction_type': 'despesa',
+        'category_id': str(category_id),
+        'transaction_date': date.today().isoformat(),
+        'notes': '',
+    })
+    assert response.status_code == 302
+    with app.app_context():
+        transaction_id = Transaction.query.filter_by(category_id=category_id).one().id
+    
+    assert client.post(f'/financial/transactions/{transaction_id}/delete').status_code == 302
+    with app.app_context():
+        # A célula do mês ficou sem transações e foi apagada
+        assert MonthlyRollup.query.filter_by(category_id=category_id).count() == 0
+    
+    assert client.post(f'/financial/categories/{category_id}/delete').status_code == 302
+    with app.app_context():
+        assert db.session.get(Category, category_id) is None
+    
+    result = app.test_cli_runner().invoke(args=['financial', 'verify-ledger'])
+    assert result.exit_code == 0, result.output
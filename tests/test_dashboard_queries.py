@@ -0,0 +1,34 @@
+# tests/test_dashboard_queries.py
+"""Orçamento de consultas dos dashboards (resumo em no máximo duas consultas)"""
+import pytest
+from app.fragments import fragment_cache
+
+# Por requisição: versão dos dados (ETag) + resumo (totais/contagens e últimas transações)
+DASHBOARD_BUDGETS = {
+    '/dashboard': 2,
+    '/financial/': 3,
+}
+
+
+@pytest.mark.parametrize('path', DASHBOARD_BUDGETS)
+def test_dashboard_query_budget(client, count_queries, path):
+    client.get(path)  # aquece o cache do usuário logado
+    fragment_cache.clear()
+    
+    with count_queries() as queries:
+        response = client.get(path)
+    
+    assert response.status_code == 200
+    assert len(queries) <= DASHBOARD_BUDGETS[path], '\n'.join(queries)
+
+
+@pytest.mark.parametrize('path', DASHBOARD_BUDGETS)
+def test_dashboard_cached_fragments_skip_summary(client, count_queries, path):
+    client.get(path)
+    
+    with count_queries() as queries:
+        response = client.get(path)
+    
+    # Fragmentos em cache: só a versão dos dados é lida
+    assert response.status_code == 200
+    assert len(queries) == 1, '\n'.join(queries)
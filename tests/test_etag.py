@@ -0,0 +1,39 @@
+# tests/test_etag.py
+"""ETag: sal pelo release configurado, igual em todos os hosts"""
+import os
+import shutil
+import pytest
+from app.financial.conditional import source_fingerprint
+
+
+@pytest.fixture
+def config_overrides():
+    return {'APP_RELEASE': '2026.10.1'}
+
+
+def test_etag_uses_configured_release(client):
+    response = client.get('/financial/')
+    assert response.status_code == 200
+    etag, _ = response.get_etag()
+    assert etag.endswith('-2026.10.1')
+    
+    assert client.get('/financial/', headers={'If-None-Match': f'W/"{etag}"'}).status_code == 304
+
+
+def write_sources(root):
+    os.makedirs(root / 'templates')
+    (root / 'views.py').write_text('def view(): pass\n')
+    (root / 'templates' / 'page.html').write_text('<p>{{ x }}</p>\n')
+
+
+def test_fingerprint_ignores_mtime_and_location(tmp_path):
+    write_sources(tmp_path / 'host1')
+    fingerprint = source_fingerprint(str(tmp_path / 'host1'))
+    
+    # Outro host: mesmo código em outro diretório, com outras datas
+    shutil.copytree(tmp_path / 'host1', tmp_path / 'host2')
+    os.utime(tmp_path / 'host2' / 'views.py', (0, 0))
+    assert source_fingerprint(str(tmp_path / 'host2')) == fingerprint
+    
+    (tmp_path / 'host2' / 'templates' / 'page.html').write_text('<p>{{ y }}</p>\n')
+    assert source_fingerprint(str(tmp_path / 'host2')) != fingerprint
@@ -0,0 +1,32 @@
+# tests/test_export.py
+"""Exportação por streaming: primeiro bloco imediato e arquivo completo"""
+import json
+from app.financial.exporter import YIELD_PER, chunked
+from app.models import Transaction
+
+
+def test_first_chunk_is_a_single_line():
+    lines = (f'{i}\n' for i in range(YIELD_PER + 10))
+    chunks = list(chunked(lines))
+    assert chunks[0] == '0\n'
+    assert [chunk.count('\n') for chunk in chunks] == [1, YIELD_PER, 9]
+
+
+def test_ndjson_streams_first_row_before_the_batch(app, client, user_id):
+    response = client.get('/financial/transactions/export.ndjson', buffered=False)
+    chunks = iter(response.response)
+    first = next(chunks)
+    assert first.count(b'\n') == 1
+    
+    rows = [json.loads(line) for line in (first + b''.join(chunks)).decode().splitlines()]
+    response.close()
+    with app.app_context():
+        assert len(rows) == Transaction.query.filter_by(user_id=user_id).count()
+
+
+def test_csv_sends_header_then_first_row(client, user_id):
+    response = client.get('/financial/transactions/export.csv', buffered=False)
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b'data,descricao,valor')
+    assert next(chunks).count(b'\n') == 1
+    response.close()
@@ -0,0 +1,118 @@
+# tests/test_google_certs.py
+"""Cache dos certificados do Google contra um servidor de chaves local"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from app.auth import google
+from app.auth.google import MIN_REFRESH_INTERVAL, google_certs
+
+MAX_AGE = 300
+
+
+class KeyServer:
+    """Servidor HTTP local no lugar de GOOGLE_CERTS_URL"""
+    
+    def __init__(self):
+        self.hits = 0
+        self.version = 1
+        self.failing = False
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.hits += 1
+                if server.failing:
+                    self.send_error(503)
+                    return
+                body = json.dumps({f'kid-{server.version}': 'PEM'}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Cache-Control', f'public, max-age={MAX_AGE}, must-revalidate')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}/oauth2/v1/certs'
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+    
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def key_server():
+    server = KeyServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def config_overrides(key_server):
+    return {'GOOGLE_CERTS_URL': key_server.url}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(google.time, 'monotonic', clock)
+    return clock
+
+
+def test_certs_reused_within_max_age(app, key_server, clock):
+    assert google_certs.url == key_server.url
+    assert google_certs.get() == {'kid-1': 'PEM'}
+    
+    clock.now += MAX_AGE - 1
+    key_server.version = 2
+    assert google_certs.get() == {'kid-1': 'PEM'}
+    assert key_server.hits == 1
+
+
+def test_certs_refetched_after_expiry(app, key_server, clock):
+    google_certs.get()
+    
+    clock.now += MAX_AGE
+    key_server.version = 2
+    assert google_certs.get() == {'kid-2': 'PEM'}
+    assert key_server.hits == 2
+
+
+def test_stale_certs_served_when_fetch_fails(app, key_server, clock):
+    google_certs.get()
+    
+    clock.now += MAX_AGE + 1
+    key_server.failing = True
+    assert google_certs.get() == {'kid-1': 'PEM'}
+    assert key_server.hits == 2
+    
+    # Sem cópia anterior, o erro chega ao chamador
+    google_certs.reset()
+    with pytest.raises(requests.RequestException):
+        google_certs.get()
+
+
+def test_forced_refresh_is_rate_limited(app, key_server, clock):
+    google_certs.get()
+    key_server.version = 2
+    
+    clock.now += MIN_REFRESH_INTERVAL - 1
+    assert google_certs.get(force=True) == {'kid-1': 'PEM'}
+    clock.now += 1
+    assert google_certs.get(force=True) == {'kid-2': 'PEM'}
+    assert key_server.hits == 2
@@ -0,0 +1,60 @@
+# tests/test_hashing.py
+"""Controle de admissão do hashing de senhas entre processos"""
+import multiprocessing
+import pytest
+from app.auth import hashing
+from app.auth.hashing import HashingBusy, PasswordHasher
+
+pytestmark = pytest.mark.skipif(hashing.fcntl is None, reason='vagas entre processos exigem fcntl')
+
+
+def hold_slot(slots_dir, held, release):
+    """Outro worker: ocupa a única vaga até ser liberado"""
+    slots = hashing.FileSlots(slots_dir, 1)
+    token = slots.acquire(timeout=1)
+    held.set()
+    release.wait(10)
+    slots.release(token)
+
+
+def test_slot_taken_by_another_process_rejects_hash(tmp_path):
+    hasher = PasswordHasher(max_inflight=1, queue_timeout=0.05, slots_dir=str(tmp_path))
+    context = multiprocessing.get_context('fork')
+    held, release = context.Event(), context.Event()
+    worker = context.Process(target=hold_slot, args=(str(tmp_path), held, release))
+    worker.start()
+    try:
+        assert held.wait(10)
+        with pytest.raises(HashingBusy):
+            hasher.hash('Senha123!')
+        assert hasher.rejected == 1
+    finally:
+        release.set()
+        worker.join(10)
+    
+    # Vaga devolvida: o hash volta a ser aceito
+    assert hasher.verify(hasher.hash('Senha123!'), 'Senha123!')
+
+
+def test_slot_of_dead_process_is_released(tmp_path):
+    context = multiprocessing.get_context('fork')
+    worker = context.Process(target=hashing.FileSlots(str(tmp_path), 1).acquire, args=(1,))
+    worker.start()
+    worker.join(10)
+    
+    hasher = PasswordHasher(max_inflight=1, queue_timeout=0.05, slots_dir=str(tmp_path))
+    assert hasher.hash('Senha123!')
+
+
+def test_login_returns_503_when_slots_are_taken(app, user_id):
+    slots = hashing.FileSlots(app.config['PASSWORD_HASH_SLOTS_DIR'], app.extensions['password_hasher'].max_inflight)
+    tokens = [slots.acquire(timeout=1) for _ in slots.paths]
+    try:
+        response = app.test_client().post('/auth/login', data={
+            'email': 'bench0@bench.local', 'password': 'Bench123!'
+        })
+    finally:
+        for token in tokens:
+            slots.release(token)
+    
+    assert response.status_code == 503
@@ -0,0 +1,153 @@
+# tests/test_ledger.py
+"""Totais derivados (ledger) continuam iguais ao histórico após cada escrita"""
+from datetime import date
+from decimal import Decimal
+import pytest
+from app import db
+from app.models import Budget, Category, MonthlyRollup, Transaction, TransactionType, UserBalance
+
+
+def stored_ledger(user_id):
+    balance = db.session.get(UserBalance, user_id)
+    return {
+        'balance': {
+            'receitas': balance.receitas,
+            'despesas': balance.despesas,
+            'transaction_count': balance.transaction_count,
+        } if balance else None,
+        'cells': {
+            (cell.period, cell.category_id, cell.transaction_type): (cell.total, cell.count)
+            for cell in MonthlyRollup.query.filter_by(user_id=user_id)
+        },
+        'usage': {
+            category.id: (category.transaction_count, category.total_amount, category.last_transaction_date)
+            for category in Category.query.filter_by(user_id=user_id)
+        },
+    }
+
+
+def spent_in(user_id, category_id, period):
+    """Gasto da categoria no mês somado direto das transações"""
+    return sum(
+        (t.amount for t in Transaction.query.filter_by(
+            user_id=user_id, category_id=category_id, transaction_type=TransactionType.DESPESA
+        ) if MonthlyRollup.period_of(t.transaction_date) == period),
+        Decimal('0')
+    )
+
+
+def expected_ledger(user_id):
+    return {
+        'balance': UserBalance.compute(user_id),
+        'cells': MonthlyRollup.compute(user_id),
+        'usage': Category.compute_usage(user_id),
+    }
+
+
+@pytest.fixture
+def legacy_user(app, user_id):
+    """Usuário com histórico gravado antes do ledger (nenhum total consolidado)"""
+    with app.app_context():
+        db.session.execute(db.delete(UserBalance).where(UserBalance.user_id == user_id))
+        db.session.execute(db.delete(MonthlyRollup).where(MonthlyRollup.user_id == user_id))
+        db.session.execute(
+            db.update(Category).where(Category.user_id == user_id)
+            .values(transaction_count=0, total_amount=0, last_transaction_date=None)
+        )
+        db.session.commit()
+    return user_id
+
+
+def test_first_write_seeds_every_ledger_table(app, client, legacy_user):
+    with app.app_context():
+        category = Category.query.filter_by(
+            user_id=legacy_user, transaction_type=TransactionType.DESPESA
+        ).first()
+        months_before = {key[0] for key in MonthlyRollup.compute(legacy_user)}
+    
+    response = client.post('/financial/transactions/new', data={
+        'description': 'Primeira escrita',
+        'amount': '42.50',
+        'transaction_type': 'despesa',
+        'category_id': str(category.id),
+        'transaction_date': date.today().isoformat(),
+        'notes': '',
+    })
+    assert response.status_code == 302
+    
+    with app.app_context():
+        assert Transaction.query.filter_by(description='Primeira escrita').count() == 1
+        stored = stored_ledger(legacy_user)
+        assert stored == expected_ledger(legacy_user)
+        # Os meses anteriores à primeira escrita também foram consolidados
+        assert months_before <= {key[0] for key in stored['cells']}
+
+
+def test_first_read_seeds_every_ledger_table(app, legacy_user):
+    with app.app_context():
+        Transaction.get_totals_by_user(legacy_user)
+        assert stored_ledger(legacy_user) == expected_ledger(legacy_user)
+
+
+def test_verify_ledger_after_first_write(app, client, legacy_user):
+    with app.app_context():
+        transaction = Transaction.query.filter_by(user_id=legacy_user).first()
+    
+    response = client.post(f'/financial/transactions/{transaction.id}/delete')
+    assert response.status_code == 302
+    
+    result = app.test_cli_runner().invoke(args=['financial', 'verify-ledger'])
+    assert result.exit_code == 0, result.output
+
+
+def test_budget_spent_matches_transactions(app, client, legacy_user):
+    with app.app_context():
+        expense = Transaction.query.filter_by(
+            user_id=legacy_user, transaction_type=TransactionType.DESPESA
+        ).first()
+        category_id, day = expense.category_id, expense.transaction_date
+        period = MonthlyRollup.period_of(day)
+    
+    response = client.post('/financial/api/budgets', json={
+        'category_id': category_id, 'amount': '100000.00', 'period': period
+    })
+    assert response.status_code == 201
+    with app.app_context():
+        # Sem totais mensais consolidados: o gasto inicial vem das transações
+        assert MonthlyRollup.query.filter_by(user_id=legacy_user).count() == 0
+        assert Decimal(str(response.get_json()['spent'])) == spent_in(legacy_user, category_id, period)
+    
+    response = client.post('/financial/transactions/new', data={
+        'description': 'Despesa no orçamento',
+        'amount': '10.00',
+        'transaction_type': 'despesa',
+        'category_id': str(category_id),
+        'transaction_date': day.isoformat(),
+        'notes': '',
+    })
+    assert response.status_code == 302
+    
+    with app.app_context():
+        budget = Budget.query.filter_by(category_id=category_id, period=period).one()
+        assert budget.spent == spent_in(legacy_user, category_id, period) > Decimal('10.00')
+    
+    result = app.test_cli_runner().invoke(args=['financial', 'verify-ledger'])
+    assert result.exit_code == 0, result.output
+
+
+def test_verify_ledger_detects_budget_drift(app, client, user_id):
+    with app.app_context():
+        category = Category.query.filter_by(
+            user_id=user_id, transaction_type=TransactionType.DESPESA
+        ).first()
+    assert client.post('/financial/api/budgets', json={
+        'category_id': category.id, 'amount': '500.00'
+    }).status_code == 201
+    
+    with app.app_context():
+        db.session.execute(db.update(Budget).values(spent=Budget.spent + 1))
+        db.session.commit()
+    
+    result = app.test_cli_runner().invoke(args=['financial', 'verify-ledger'])
+    assert result.exit_code == 1
+    assert 'gastos dos orçamentos divergentes' in result.output
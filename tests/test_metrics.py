@@ -0,0 +1,43 @@
+# tests/test_metrics.py
+"""Métricas: /metrics só com token e Server-Timing desligado por padrão"""
+import pytest
+from app import create_app
+from benchmarks.seed import bench_config
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Criar a aplicação com opções extras de configuração"""
+    def factory(**options):
+        config = bench_config(f'sqlite:///{tmp_path / "metrics.db"}')
+        config.TESTING = True
+        config.JINJA_BYTECODE_CACHE_DIR = ''
+        config.SLOW_QUERY_LOG = str(tmp_path / 'slow_queries.log')
+        config.PASSWORD_HASH_SLOTS_DIR = str(tmp_path / 'hash_slots')
+        for key, value in options.items():
+            setattr(config, key, value)
+        return create_app(config)
+    return factory
+
+
+def test_defaults_expose_nothing(make_app):
+    client = make_app().test_client()
+    assert client.get('/metrics').status_code == 404
+    assert 'Server-Timing' not in client.get('/auth/login').headers
+
+
+def test_metrics_require_token(make_app):
+    client = make_app(METRICS_TOKEN='s3cret').test_client()
+    client.get('/auth/login')
+    
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer errado'}).status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+    assert response.status_code == 200
+    assert b'coinctrl_request_duration_seconds_count{endpoint="auth.login"}' in response.data
+
+
+@pytest.mark.parametrize('options', [{'SERVER_TIMING': True}, {'DEBUG': True}])
+def test_server_timing_when_enabled_or_debug(make_app, options):
+    client = make_app(**options).test_client()
+    assert client.get('/auth/login').headers['Server-Timing'].startswith('db;dur=')
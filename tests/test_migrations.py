@@ -0,0 +1,166 @@
+# tests/test_migrations.py
+"""Migrações: um banco anterior a elas chega ao mesmo esquema de db.create_all"""
+import os
+import pytest
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import create_engine, inspect, text
+from app import create_app, db
+from benchmarks.seed import bench_config
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
+
+# Esquema original (antes de qualquer migração), como o db.create_all da época criava
+BASELINE_DDL = [
+    """
+    CREATE TABLE users (
+        id INTEGER NOT NULL, email VARCHAR(120) NOT NULL, first_name VARCHAR(80) NOT NULL,
+        last_name VARCHAR(80), username VARCHAR(80) NOT NULL, password_hash VARCHAR(255),
+        created_at DATETIME, last_login DATETIME, is_active BOOLEAN, login_attempts INTEGER,
+        locked_until DATETIME, google_id VARCHAR(100), profile_picture VARCHAR(255),
+        auth_provider VARCHAR(20),
+        PRIMARY KEY (id), UNIQUE (username), UNIQUE (google_id)
+    )
+    """,
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    """
+    CREATE TABLE categories (
+        id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, description TEXT, color VARCHAR(7),
+        icon VARCHAR(50), transaction_type VARCHAR(7) NOT NULL, user_id INTEGER NOT NULL,
+        created_at DATETIME,
+        PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES users (id)
+    )
+    """,
+    """
+    CREATE TABLE transactions (
+        id INTEGER NOT NULL, description VARCHAR(200) NOT NULL, amount NUMERIC(10, 2) NOT NULL,
+        transaction_type VARCHAR(7) NOT NULL, transaction_date DATE NOT NULL, notes TEXT,
+        user_id INTEGER NOT NULL, category_id INTEGER NOT NULL, created_at DATETIME,
+        updated_at DATETIME,
+        PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES users (id),
+        FOREIGN KEY(category_id) REFERENCES categories (id)
+    )
+    """,
+    """
+    INSERT INTO users (id, email, first_name, username, created_at, is_active, login_attempts, auth_provider)
+    VALUES (1, 'ana@example.com', 'Ana', 'ana', '2025-01-01 09:00:00', 1, 0, 'local')
+    """,
+    """
+    INSERT INTO categories (id, name, transaction_type, user_id, created_at)
+    VALUES (1, 'Salário', 'RECEITA', 1, '2025-01-01 09:00:00'),
+           (2, 'Mercado', 'DESPESA', 1, '2025-01-01 09:00:00')
+    """,
+    """
+    INSERT INTO transactions (description, amount, transaction_type, transaction_date, user_id,
+                              category_id, created_at, updated_at)
+    VALUES ('Salário', 5000, 'RECEITA', '2025-01-05', 1, 1, '2025-01-05 10:00:00', '2025-01-05 10:00:00'),
+           ('Feira', 120.50, 'DESPESA', '2025-01-10', 1, 2, '2025-01-10 10:00:00', '2025-01-10 10:00:00'),
+           ('Mercado', 310.00, 'DESPESA', '2025-02-03', 1, 2, '2025-02-03 10:00:00', '2025-02-03 10:00:00')
+    """,
+]
+
+
+def make_app(tmp_path, statements):
+    """Aplicação sobre um banco criado só com ``statements`` (sem create_all)"""
+    config = bench_config(f'sqlite:///{tmp_path / "migrated.db"}')
+    config.TESTING = True
+    config.JINJA_BYTECODE_CACHE_DIR = ''
+    config.SLOW_QUERY_LOG = str(tmp_path / 'slow_queries.log')
+    config.PASSWORD_HASH_SLOTS_DIR = str(tmp_path / 'hash_slots')
+    app = create_app(config)
+    with app.app_context():
+        with db.engine.begin() as connection:
+            for statement in statements:
+                connection.execute(text(statement))
+    return app
+
+
+def dispose(app):
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def schema(engine):
+    """Colunas de cada tabela e nomes dos índices (sem FTS e alembic_version)"""
+    inspector = inspect(engine)
+    tables = [name for name in inspector.get_table_names()
+              if '_fts' not in name and name != 'alembic_version']
+    return (
+        {name: sorted(column['name'] for column in inspector.get_columns(name)) for name in tables},
+        sorted(index['name'] for name in tables for index in inspector.get_indexes(name))
+    )
+
+
+@pytest.fixture
+def baseline_app(tmp_path):
+    """Banco com o esquema original e alguns dados"""
+    app = make_app(tmp_path, BASELINE_DDL)
+    yield app
+    dispose(app)
+
+
+@pytest.fixture
+def empty_app(tmp_path):
+    """Banco vazio: instalação nova só com as migrações"""
+    app = make_app(tmp_path, [])
+    yield app
+    dispose(app)
+
+
+def test_upgrade_empty_database_matches_create_all(empty_app, tmp_path):
+    reference = create_engine(f'sqlite:///{tmp_path / "create_all.db"}')
+    db.metadata.create_all(reference)
+    with empty_app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+        assert schema(db.engine) == schema(reference)
+    reference.dispose()
+
+
+def test_upgrade_creates_every_model_table(baseline_app):
+    with baseline_app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+        tables = set(inspect(db.engine).get_table_names())
+    
+    assert set(db.metadata.tables) <= tables
+
+
+def test_fts_migration_downgrades_and_reapplies(baseline_app):
+    fts_objects = "SELECT count(*) FROM sqlite_master WHERE name LIKE '%\\_fts%' ESCAPE '\\'"
+    with baseline_app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+        created = db.session.execute(text(fts_objects)).scalar()
+        downgrade(directory=MIGRATIONS_DIR, revision='1a2b3c4d5e01')
+        assert db.session.execute(text(fts_objects)).scalar() == 0
+        upgrade(directory=MIGRATIONS_DIR)
+        assert db.session.execute(text(fts_objects)).scalar() == created > 0
+        # Conteúdo já gravado foi reindexado
+        assert db.session.execute(text(
+            "SELECT count(*) FROM transactions_fts WHERE transactions_fts MATCH 'feira'"
+        )).scalar() == 1
+
+
+def test_upgrade_after_create_all(baseline_app):
+    """Bootstrap do run.py: create_all antes das migrações não as quebra"""
+    with baseline_app.app_context():
+        db.create_all()
+        upgrade(directory=MIGRATIONS_DIR)
+        spent = db.session.execute(text(
+            "SELECT sum(amount) FROM transactions WHERE transaction_type = 'DESPESA'"
+        )).scalar()
+        balance = db.session.execute(text('SELECT despesas FROM user_balances WHERE user_id = 1')).scalar()
+    
+    assert balance == spent
+
+
+def test_dashboards_work_after_upgrade(baseline_app):
+    with baseline_app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+    
+    client = baseline_app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+        session['_fresh'] = True
+    
+    for url in ('/dashboard', '/financial/'):
+        assert client.get(url).status_code == 200
@@ -0,0 +1,20 @@
+# tests/test_query_plans.py
+"""Consultas frequentes devem continuar usando seus índices (EXPLAIN QUERY PLAN)"""
+import pytest
+from app import db
+from app.query_plans import check_hot_queries
+
+
+def test_hot_queries_use_their_indexes(app, user_id):
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            pytest.skip('EXPLAIN QUERY PLAN disponível apenas para SQLite')
+        results = check_hot_queries()
+    
+    assert results
+    failures = [
+        f'{name} -> {index_name}: {" | ".join(plan)}'
+        for name, index_name, plan, ok in results
+        if not ok
+    ]
+    assert not failures, '\n'.join(failures)
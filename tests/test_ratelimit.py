@@ -0,0 +1,84 @@
+# tests/test_ratelimit.py
+"""Rate limit de login: janela deslizante, chaves por IP e IP real atrás do proxy"""
+import pytest
+from app.auth import ratelimit
+from app.auth.ratelimit import LoginRateLimiter, MemoryBackend
+
+PASSWORD = 'Bench123!'
+EMAIL = 'bench0@bench.local'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def limiter():
+    return LoginRateLimiter(email_limit=3, ip_limit=3, window=60, backend=MemoryBackend())
+
+
+def test_window_expires(limiter, clock):
+    for _ in range(3):
+        limiter.register_failure('a@example.com', '10.0.0.1')
+    assert limiter.check('a@example.com', '10.0.0.1') == 60
+    
+    clock.now += 30
+    assert limiter.check('a@example.com', '10.0.0.1') == 30
+    clock.now += 30
+    assert limiter.check('a@example.com', '10.0.0.1') is None
+
+
+def test_ip_keys_are_independent(limiter, clock):
+    for i in range(3):
+        limiter.register_failure(f'user{i}@example.com', '10.0.0.1')
+    
+    assert limiter.check('novo@example.com', '10.0.0.1') is not None
+    assert limiter.check('novo@example.com', '10.0.0.2') is None
+
+
+def test_success_does_not_reset_other_ip(limiter, clock):
+    for i in range(3):
+        limiter.register_failure(f'user{i}@example.com', '10.0.0.1')
+    
+    # Login correto de outro IP (e de um dos emails que falharam)
+    limiter.reset('user0@example.com')
+    assert limiter.check('user0@example.com', '10.0.0.2') is None
+    assert limiter.check('user0@example.com', '10.0.0.1') is not None
+
+
+@pytest.fixture
+def config_overrides():
+    return {
+        'LOGIN_RATE_LIMIT_ENABLED': True,
+        'LOGIN_RATE_LIMIT_EMAIL': 100,
+        'LOGIN_RATE_LIMIT_IP': 3,
+        'PROXY_FIX_X_FOR': 1,
+    }
+
+
+def login(client, email, password, client_ip):
+    return client.post('/auth/login', data={'email': email, 'password': password},
+                       headers={'X-Forwarded-For': client_ip})
+
+
+def test_login_limit_uses_forwarded_client_ip(app, user_id):
+    client = app.test_client()
+    for i in range(3):
+        assert login(client, f'nao-existe{i}@example.com', 'x', '203.0.113.7').status_code == 200
+    assert login(client, EMAIL, PASSWORD, '203.0.113.7').status_code == 429
+    
+    # Mesmo proxy (REMOTE_ADDR do teste), outro cliente: não bloqueado
+    response = login(client, EMAIL, PASSWORD, '198.51.100.4')
+    assert response.status_code == 302
+    assert login(app.test_client(), EMAIL, PASSWORD, '203.0.113.7').status_code == 429
@@ -0,0 +1,40 @@
+# tests/test_search.py
+"""Busca textual: filtro nas listagens e relevância na API"""
+import pytest
+from app import db
+from app.models import Category, TransactionType
+from app.financial.search import filter_categories_by_text, search_categories
+
+NAMES = ['Mercado', 'Mercado mercado mercado']
+
+
+@pytest.fixture
+def market_categories(app, user_id):
+    """Categoria 'Mercado' do seed e outra mais relevante para 'mercado' (bm25)"""
+    with app.app_context():
+        db.session.add(Category(name=NAMES[1], transaction_type=TransactionType.DESPESA, user_id=user_id))
+        db.session.commit()
+    return user_id
+
+
+def test_api_search_orders_categories_by_relevance(app, market_categories):
+    with app.app_context():
+        query = search_categories(Category.query.filter_by(user_id=market_categories), 'mercado')
+        assert [category.name for category in query] == NAMES[::-1]
+
+
+def test_category_filter_keeps_listing_order(app, market_categories):
+    with app.app_context():
+        query = filter_categories_by_text(Category.query.filter_by(user_id=market_categories), 'mercado')
+        assert query.statement._order_by_clauses == ()
+        assert [category.name for category in query.order_by(Category.name)] == NAMES
+
+
+def test_categories_page_sorts_by_name_when_searching(client, market_categories):
+    response = client.get('/financial/categories?search=mercado')
+    html = response.get_data(as_text=True)
+    
+    assert response.status_code == 200
+    positions = [html.find(f'<strong>{name}</strong>') for name in NAMES]
+    assert -1 not in positions
+    assert positions == sorted(positions)
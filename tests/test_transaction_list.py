@@ -0,0 +1,36 @@
+# tests/test_transaction_list.py
+"""Listagem de transações: o card "Total" conta as transações filtradas"""
+import re
+from app.models import Category, Transaction, TransactionType
+
+TOTAL_CARD = re.compile(r'>Total</div>\s*<div[^>]*>(\d+)</div>')
+
+
+def total_card(response):
+    return int(TOTAL_CARD.search(response.get_data(as_text=True)).group(1))
+
+
+def test_total_counts_all_transactions_without_filters(app, client, user_id):
+    with app.app_context():
+        expected = Transaction.query.filter_by(user_id=user_id).count()
+    assert total_card(client.get('/financial/transactions')) == expected
+
+
+def test_total_counts_filtered_by_type(app, client, user_id):
+    with app.app_context():
+        expected = Transaction.query.filter_by(
+            user_id=user_id, transaction_type=TransactionType.RECEITA
+        ).count()
+    assert total_card(client.get('/financial/transactions?type=receita')) == expected
+
+
+def test_total_counts_filtered_by_category(app, client, user_id):
+    with app.app_context():
+        category = Category.query.filter_by(user_id=user_id, transaction_type=TransactionType.DESPESA).first()
+        expected = Transaction.query.filter_by(user_id=user_id, category_id=category.id).count()
+    assert total_card(client.get(f'/financial/transactions?category={category.id}')) == expected
+
+
+def test_total_is_zero_when_filters_match_nothing(client):
+    response = client.get('/financial/transactions?date_from=2000-01-01&date_to=2000-12-31')
+    assert total_card(response) == 0
@@ -0,0 +1,73 @@
+# tests/test_transactions.py
+"""Edição de transações: mesmas validações da criação e totais consistentes"""
+import pytest
+from app import db
+from app.financial import routes
+from app.models import Transaction, TransactionType, UserBalance
+
+
+@pytest.fixture
+def expense(app, user_id):
+    with app.app_context():
+        transaction = Transaction.query.filter_by(
+            user_id=user_id, transaction_type=TransactionType.DESPESA
+        ).first()
+        return transaction.id, transaction.category_id
+
+
+def edit_form(category, **fields):
+    form = {
+        'description': 'Editada',
+        'amount': '12.34',
+        'transaction_type': 'despesa',
+        'category_id': str(category),
+        'transaction_date': '2025-03-10',
+        'notes': '',
+    }
+    form.update(fields)
+    return form
+
+
+@pytest.mark.parametrize('fields, message', [
+    ({'transaction_type': 'transferencia'}, 'Tipo de transação inválido!'),
+    ({'amount': 'NaN'}, 'Valor inválido!'),
+    ({'description': '  '}, 'Descrição é obrigatória!'),
+    ({'transaction_date': '10/03/2025'}, 'Data inválida!'),
+    ({'category_id': ''}, 'Categoria é obrigatória!'),
+])
+def test_edit_rejects_invalid_fields(app, client, expense, fields, message):
+    transaction_id, category_id = expense
+    url = f'/financial/transactions/{transaction_id}/edit'
+    
+    response = client.post(url, data=edit_form(category_id, **fields), follow_redirects=True)
+    assert response.status_code == 200
+    assert message in response.get_data(as_text=True)
+    with app.app_context():
+        assert db.session.get(Transaction, transaction_id).description != 'Editada'
+
+
+def test_edit_updates_transaction_and_ledger(app, client, expense):
+    transaction_id, category_id = expense
+    response = client.post(f'/financial/transactions/{transaction_id}/edit', data=edit_form(category_id))
+    assert response.status_code == 302
+    
+    with app.app_context():
+        assert db.session.get(Transaction, transaction_id).description == 'Editada'
+    result = app.test_cli_runner().invoke(args=['financial', 'verify-ledger'])
+    assert result.exit_code == 0, result.output
+
+
+def test_failed_revert_rolls_back_and_flashes(app, client, expense, monkeypatch):
+    def failing_revert(transaction):
+        # Parte do estorno já aplicada quando o erro acontece
+        UserBalance.apply(transaction.user_id, transaction.transaction_type, -transaction.amount, count=-1)
+        raise RuntimeError('falha no estorno')
+    
+    monkeypatch.setattr(routes, 'revert_transaction', failing_revert)
+    transaction_id, category_id = expense
+    response = client.post(f'/financial/transactions/{transaction_id}/edit', data=edit_form(category_id))
+    
+    assert response.status_code == 200
+    assert 'Erro ao atualizar transação' in response.get_data(as_text=True)
+    result = app.test_cli_runner().invoke(args=['financial', 'verify-ledger'])
+    assert result.exit_code == 0, result.output
@@ -0,0 +1,43 @@
+# tests/test_usernames.py
+"""Alocação de usernames: maior sufixo numérico calculado no banco"""
+import pytest
+from app import db
+from app.auth.usernames import add_with_unique_username, next_username
+from app.models import User
+
+
+def add_users(*usernames):
+    for i, username in enumerate(usernames):
+        db.session.add(User(email=f'{username}-{i}@example.com', first_name='Teste', username=username))
+    db.session.commit()
+
+
+@pytest.mark.parametrize('existing, expected', [
+    ((), 'joao'),
+    (('joao1', 'joao2'), 'joao'),
+    (('joao',), 'joao1'),
+    (('joao', 'joao2', 'joao10', 'joao9'), 'joao11'),
+    (('joao', 'joao007'), 'joao8'),
+    # Outros nomes com o mesmo prefixo não contam
+    (('joao', 'joao99x', 'joaozinho123', 'joao.silva', 'joa9', 'Joao50'), 'joao1'),
+])
+def test_next_username(app, existing, expected):
+    with app.app_context():
+        add_users(*existing)
+        assert next_username('joao') == expected
+
+
+def test_next_username_is_one_aggregate_query(app, count_queries):
+    with app.app_context():
+        add_users('maria', *[f'maria{i}' for i in range(1, 50)], 'mariana')
+        with count_queries() as queries:
+            assert next_username('maria') == 'maria50'
+    assert len(queries) == 1
+
+
+def test_add_with_unique_username(app):
+    with app.app_context():
+        add_users('ana', 'ana1')
+        user = add_with_unique_username(User(email='ana@example.com', first_name='Ana'), 'ana@example.com')
+        db.session.commit()
+        assert user.username == 'ana2'